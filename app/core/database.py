@@ -5,10 +5,27 @@ This module creates the SQLAlchemy engine, session factory (`SessionLocal`),
 and a declarative `Base` for models to inherit from. It also exposes a
 `get_db()` generator suitable for FastAPI's `Depends` to provide a session
 per-request and ensure it is closed afterwards.
+
+The API uses the async counterparts (`async_engine`, `AsyncSessionLocal`,
+`get_async_db`) backed by asyncpg, so DB round trips in request handlers
+never block the event loop. The sync engine remains for the ETL script,
+table creation and other batch code.
+
+Pool sizing comes from the DB_POOL_* settings. With DB_PGBOUNCER_MODE the
+engines use NullPool (PgBouncer does the pooling) and asyncpg's prepared
+statement caches are disabled, as transaction pooling cannot keep them.
+Both engines use instrumented pools; see `app.core.db_pool`.
 """
 
 from sqlalchemy import create_engine
+from sqlalchemy.engine import make_url
+from sqlalchemy.ext.asyncio import AsyncSession, create_async_engine
 from sqlalchemy.orm import sessionmaker, declarative_base
+from app.core.db_pool import (
+    InstrumentedAsyncAdaptedQueuePool,
+    InstrumentedNullPool,
+    InstrumentedQueuePool,
+)
 from app.settings import settings
 import logging
 
@@ -18,10 +35,59 @@ logger = logging.getLogger(__name__)
 # Read the database URL from settings (loaded from environment/.env)
 SQLALCHEMY_DATABASE_URL = settings.SQLALCHEMY_DATABASE_URL
 
+
+def pool_options(is_async: bool, name: str) -> dict:
+    """Engine keyword arguments for the configured pooling mode."""
+    options = {
+        "pool_pre_ping": settings.DB_POOL_PRE_PING,
+        "pool_recycle": settings.DB_POOL_RECYCLE_SECONDS,
+        # Also the key under which the pool's metrics are reported
+        "pool_logging_name": name,
+    }
+    if settings.DB_PGBOUNCER_MODE:
+        options["poolclass"] = InstrumentedNullPool
+        if is_async:
+            options["connect_args"] = {"statement_cache_size": 0, "prepared_statement_cache_size": 0}
+        return options
+    options.update({
+        "poolclass": InstrumentedAsyncAdaptedQueuePool if is_async else InstrumentedQueuePool,
+        "pool_size": settings.DB_POOL_SIZE,
+        "max_overflow": settings.DB_MAX_OVERFLOW,
+        "pool_timeout": settings.DB_POOL_TIMEOUT_SECONDS,
+    })
+    return options
+
+
 # Create the engine and a configured session factory. echo=False silences SQL logs.
-engine = create_engine(SQLALCHEMY_DATABASE_URL, echo=False)
+engine = create_engine(SQLALCHEMY_DATABASE_URL, echo=False, **pool_options(is_async=False, name="sync"))
 SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
 
+
+def to_async_url(url: str) -> str:
+    """Turn a sync Postgres URL (psycopg2 or driverless) into an asyncpg URL.
+
+    libpq's `sslmode` query parameter is renamed to asyncpg's `ssl`.
+    """
+    parsed = make_url(url)
+    if parsed.get_backend_name() in ("postgres", "postgresql"):
+        parsed = parsed.set(drivername="postgresql+asyncpg")
+        if "sslmode" in parsed.query:
+            query = dict(parsed.query)
+            query["ssl"] = query.pop("sslmode")
+            parsed = parsed.set(query=query)
+    return parsed.render_as_string(hide_password=False)
+
+
+# Async engine/session factory for request handlers. expire_on_commit=False
+# keeps attributes readable after commit without an implicit (sync) refresh.
+ASYNC_SQLALCHEMY_DATABASE_URL = settings.SQLALCHEMY_ASYNC_DATABASE_URL or to_async_url(SQLALCHEMY_DATABASE_URL)
+async_engine = create_async_engine(
+    ASYNC_SQLALCHEMY_DATABASE_URL, echo=False, **pool_options(is_async=True, name="async")
+)
+AsyncSessionLocal = sessionmaker(
+    bind=async_engine, class_=AsyncSession, autoflush=False, expire_on_commit=False
+)
+
 # Declarative base used by model classes (e.g. app.db.models.user.User)
 Base = declarative_base()
 
@@ -38,4 +104,15 @@ def get_db():
         yield db
     finally:
         db.close()
-        logger.debug("Closed DB session %s", db)
\ No newline at end of file
+        logger.debug("Closed DB session %s", db)
+
+
+async def get_async_db():
+    """Async version of `get_db` yielding an `AsyncSession`.
+
+    Use like: `session: AsyncSession = Depends(get_async_db)`.
+    """
+    async with AsyncSessionLocal() as db:
+        logger.debug("Opened new async DB session %s", db)
+        yield db
+    logger.debug("Closed async DB session %s", db)
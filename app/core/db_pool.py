@@ -0,0 +1,118 @@
+"""
+Connection pool classes that record checkout metrics.
+
+Each pool is a thin subclass of the SQLAlchemy pool it replaces and times
+every `connect()` (waiting for a free connection, opening a new one and
+the pre-ping). Metrics live in a module-level registry keyed by the
+pool's logging name, so they survive `engine.dispose()` recreating the
+pool. `pool_metrics()` returns a JSON-friendly snapshot used by the
+`/metrics/db` endpoint to size DB_POOL_SIZE / DB_MAX_OVERFLOW from data.
+"""
+
+from collections import deque
+from typing import Any, Dict
+import threading
+import time
+
+from sqlalchemy import exc
+from sqlalchemy.pool import AsyncAdaptedQueuePool, NullPool, QueuePool
+
+from app.util.stats import summarize_latencies
+
+# Checkout wait samples kept per pool for the percentile summary
+WAIT_SAMPLE_SIZE = 1000
+
+
+class PoolMetrics:
+    """Thread-safe counters for one named pool."""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._waits_ms: deque[float] = deque(maxlen=WAIT_SAMPLE_SIZE)
+        self.checkouts = 0
+        self.timeouts = 0
+        self.in_use = 0
+        self.peak_in_use = 0
+
+    def checked_out(self, wait_ms: float) -> None:
+        with self._lock:
+            self.checkouts += 1
+            self.in_use += 1
+            self.peak_in_use = max(self.peak_in_use, self.in_use)
+            self._waits_ms.append(wait_ms)
+
+    def checked_in(self) -> None:
+        with self._lock:
+            self.in_use = max(0, self.in_use - 1)
+
+    def timed_out(self) -> None:
+        with self._lock:
+            self.timeouts += 1
+
+    def snapshot(self) -> Dict[str, Any]:
+        with self._lock:
+            return {
+                "checkouts": self.checkouts,
+                "timeouts": self.timeouts,
+                "in_use": self.in_use,
+                "peak_in_use": self.peak_in_use,
+                "checkout_wait": summarize_latencies(self._waits_ms),
+            }
+
+
+_registry: Dict[str, PoolMetrics] = {}
+_registry_lock = threading.Lock()
+
+
+def metrics_for(name: str) -> PoolMetrics:
+    with _registry_lock:
+        return _registry.setdefault(name, PoolMetrics())
+
+
+class _InstrumentedPoolMixin:
+    """Times checkouts and tracks connections in use for any Pool subclass."""
+
+    @property
+    def metrics(self) -> PoolMetrics:
+        return metrics_for(self._orig_logging_name or "default")
+
+    def connect(self):
+        started = time.perf_counter()
+        try:
+            conn = super().connect()
+        except exc.TimeoutError:
+            self.metrics.timed_out()
+            raise
+        self.metrics.checked_out((time.perf_counter() - started) * 1000)
+        return conn
+
+    def _do_return_conn(self, conn):
+        self.metrics.checked_in()
+        return super()._do_return_conn(conn)
+
+
+class InstrumentedQueuePool(_InstrumentedPoolMixin, QueuePool):
+    pass
+
+
+class InstrumentedAsyncAdaptedQueuePool(_InstrumentedPoolMixin, AsyncAdaptedQueuePool):
+    pass
+
+
+class InstrumentedNullPool(_InstrumentedPoolMixin, NullPool):
+    """No pooling (PgBouncer mode); "checkout wait" is the connect time."""
+
+
+def pool_metrics(engine) -> Dict[str, Any]:
+    """Snapshot of an engine's pool configuration, usage and wait times."""
+    pool = engine.pool
+    snapshot: Dict[str, Any] = {"pool": type(pool).__name__, "status": pool.status()}
+    if isinstance(pool, QueuePool):
+        snapshot.update({
+            "size": pool.size(),
+            "checked_out": pool.checkedout(),
+            "overflow": pool.overflow(),
+        })
+    if isinstance(pool, _InstrumentedPoolMixin):
+        snapshot.update(pool.metrics.snapshot())
+    return snapshot
@@ -5,20 +5,144 @@ This client uses Pydantic schemas for data access, ensuring that only the
 expected fields from the financial data are used and are strongly typed.
 """
 
-from typing import Dict, Any, Union
+from typing import Dict, Any, Iterable, List, Optional, Tuple, Union
+import json
 import logging # New import for logging
 from pydantic import EmailStr
 from app.settings import settings
 from app.core.integrations.finnhub_schema import StockQuoteOutput, CompanyProfileOutput 
+from app.util.indicators import TechnicalIndicators
 import boto3
+from botocore.exceptions import ClientError
 
 
 # Initialize logger for this module
 logger = logging.getLogger(__name__)
 
 # Define a type alias for the complex dictionary structure for clarity
-# This structure maps a ticker to a dictionary containing the two Pydantic models (which can be None if fetching failed)
-FinancialData = Dict[str, Dict[str, Union[StockQuoteOutput, CompanyProfileOutput, None]]]
+# This structure maps a ticker to a dictionary containing the Pydantic models (which can be None if fetching failed)
+FinancialData = Dict[str, Dict[str, Union[StockQuoteOutput, CompanyProfileOutput, TechnicalIndicators, None]]]
+
+STOCK_UPDATE_SUBJECT = "Your Daily Financial Data Update"
+GREETING_TEMPLATE = "Hello {first_name},\n\nHere is your financial data update for your subscribed tickers:\n\n"
+SIGN_OFF = "To manage your subscriptions, please log into the app.\n\nBest regards,\nThe Financial Pipeline Team"
+PRICE_ALERT_SUBJECT = "Your Price Alerts Were Triggered"
+ALERT_GREETING_TEMPLATE = "Hello {first_name},\n\nThe following price alerts were triggered:\n\n"
+
+
+def render_ticker_fragment(ticker: str, data: Dict[str, Any]) -> str:
+    """Render the block of the email body describing a single ticker."""
+    # Data values are Pydantic models (or None)
+    company_profile: CompanyProfileOutput | None = data.get("profile")
+    stock_quote: StockQuoteOutput | None = data.get("quote")
+
+    # Use direct attribute access for Pydantic models, falling back gracefully
+
+    # --- Company Profile Data ---
+    name = company_profile.name if company_profile else "N/A"
+    exchange = company_profile.exchange if company_profile else "N/A"
+    industry = company_profile.finnhubIndustry if company_profile else "N/A"
+    web_url = company_profile.weburl if company_profile else "#"
+
+    # --- Stock Quote Data ---
+    current_price = stock_quote.current_price if stock_quote else "N/A"
+    high = stock_quote.high_price if stock_quote else "N/A"
+    low = stock_quote.low_price if stock_quote else "N/A"
+
+    return (
+        f"--- {ticker} ({name}) ---\n"
+        f"Current Price: {current_price}\n"
+        f"Daily High: {high}\n"
+        f"Daily Low: {low}\n"
+        f"{render_indicator_lines(data.get('indicators'))}"
+        f"Exchange: {exchange}\n"
+        f"Industry: {industry}\n"
+        f"Website: {web_url}\n"
+        "--------------------------\n\n"
+    )
+
+
+def render_indicator_lines(indicators: Optional[TechnicalIndicators]) -> str:
+    """Indicator lines for a ticker fragment (empty when none were computed)."""
+    if indicators is None:
+        return ""
+
+    def fmt(value: Optional[float], suffix: str = "") -> str:
+        return f"{value:.2f}{suffix}" if value is not None else "N/A"
+
+    volatility = indicators.volatility * 100 if indicators.volatility is not None else None
+    return (
+        f"Daily Change: {fmt(indicators.daily_change_pct, '%')}\n"
+        f"SMA ({indicators.sma_window}d): {fmt(indicators.sma)}\n"
+        f"RSI ({indicators.rsi_window}d): {fmt(indicators.rsi)}\n"
+        f"Volatility ({indicators.volatility_window}d, annualized): {fmt(volatility, '%')}\n"
+    )
+
+
+def compose_message(first_name: str, ticker_section: str) -> str:
+    """Wrap a pre-rendered ticker section with the per-user greeting and sign-off."""
+    return "".join((GREETING_TEMPLATE.format(first_name=first_name), ticker_section, SIGN_OFF))
+
+
+def render_alert_line(ticker: str, kind: str, threshold: float, price: float) -> str:
+    """One line of an alert email, e.g. "AAPL rose above 200.00 (now 201.50)"."""
+    if kind == "above":
+        condition = f"rose above {threshold:.2f}"
+    elif kind == "below":
+        condition = f"fell below {threshold:.2f}"
+    else:
+        condition = f"moved {threshold:g}% or more from the previous close"
+    return f"- {ticker} {condition} (now {price:.2f})\n"
+
+
+def compose_alert_message(first_name: str, alert_lines: Iterable[str]) -> str:
+    """Body of a price alert email; alerts fire once and must be re-created in the app."""
+    return "".join((
+        ALERT_GREETING_TEMPLATE.format(first_name=first_name),
+        *alert_lines,
+        "\nEach alert fires once; create a new one in the app to keep watching.\n\n",
+        SIGN_OFF,
+    ))
+
+
+class StockUpdateRenderer:
+    """
+    Renders email bodies for one dispatch run.
+
+    Many users subscribe to exactly the same tickers, so bodies are built
+    from two caches: one rendered fragment per ticker, and one joined
+    ticker section per distinct portfolio (the sorted tuple of tickers
+    with data). Only the greeting is personalised per user.
+    """
+
+    def __init__(self, stock_data: FinancialData):
+        self._stock_data = stock_data
+        self._fragments: Dict[str, str] = {}
+        self._sections: Dict[Tuple[str, ...], str] = {}
+
+    def portfolio_key(self, tickers: Iterable[str]) -> Tuple[str, ...]:
+        """Normalize a user's tickers to the sorted tuple that has data this run."""
+        return tuple(sorted({t for t in tickers if t in self._stock_data}))
+
+    def ticker_section(self, portfolio: Tuple[str, ...]) -> str:
+        section = self._sections.get(portfolio)
+        if section is None:
+            parts = []
+            for ticker in portfolio:
+                fragment = self._fragments.get(ticker)
+                if fragment is None:
+                    fragment = self._fragments[ticker] = render_ticker_fragment(ticker, self._stock_data[ticker])
+                parts.append(fragment)
+            section = self._sections[portfolio] = "".join(parts)
+        return section
+
+    def render(self, first_name: str, portfolio: Tuple[str, ...]) -> str:
+        return compose_message(first_name, self.ticker_section(portfolio))
+
+    @property
+    def distinct_portfolios(self) -> int:
+        return len(self._sections)
+
 
 class EmailClient:
     def __init__(self):
@@ -32,56 +156,78 @@ class EmailClient:
 
     def _format_message(self, first_name: str, stock_data: FinancialData) -> str:
         """Helper to format the email body content with stock and company info."""
-        message = f"Hello {first_name},\n\nHere is your financial data update for your subscribed tickers:\n\n"
-        
-        for ticker, data in stock_data.items():
-            # Data values are Pydantic models (or None)
-            company_profile: CompanyProfileOutput | None = data.get("profile")
-            stock_quote: StockQuoteOutput | None = data.get("quote")
-            
-            # Use direct attribute access for Pydantic models, falling back gracefully
-            
-            # --- Company Profile Data ---
-            name = company_profile.name if company_profile else "N/A"
-            exchange = company_profile.exchange if company_profile else "N/A"
-            industry = company_profile.finnhubIndustry if company_profile else "N/A"
-            web_url = company_profile.weburl if company_profile else "#"
-
-            # --- Stock Quote Data ---
-            current_price = stock_quote.current_price if stock_quote else "N/A"
-            high = stock_quote.high_price if stock_quote else "N/A"
-            low = stock_quote.low_price if stock_quote else "N/A"
-            
-            message += f"--- {ticker} ({name}) ---\n"
-            message += f"Current Price: {current_price}\n"
-            message += f"Daily High: {high}\n"
-            message += f"Daily Low: {low}\n"
-            message += f"Exchange: {exchange}\n"
-            message += f"Industry: {industry}\n"
-            message += f"Website: {web_url}\n"
-            message += "--------------------------\n\n"
-
-        message += "To manage your subscriptions, please log into the app.\n\nBest regards,\nThe Financial Pipeline Team"
-        return message
+        section = "".join(render_ticker_fragment(ticker, data) for ticker, data in stock_data.items())
+        return compose_message(first_name, section)
+
+    def send_email(self, recipient_email: EmailStr, subject: str, body: str) -> str:
+        """Send a plain-text email through SES and return its Message ID.
+
+        Errors (including SES throttling) propagate so callers such as
+        EmailSendStage can decide whether to retry.
+        """
+        response = self.ses_client.send_email(
+            Source=self.sender_email,
+            Destination={'ToAddresses': [recipient_email]},
+            Message={
+                'Subject': {'Data': subject},
+                'Body': {'Text': {'Data': body}}
+            }
+        )
+        logger.info("SES email dispatched. Message ID: %s", response['MessageId'])
+        return response['MessageId']
 
     def send_stock_update(self, recipient_email: EmailStr, first_name: str, user_subscribed_data: FinancialData) -> bool:
         """
-        MOCK: Simulates sending the email using logging instead of print.
+        Format and send one user's update. Returns False instead of raising.
         """
-        subject = "Your Daily Financial Data Update"
         body = self._format_message(first_name, user_subscribed_data)
 
         try:
-            response = self.ses_client.send_email(
-                Source=self.sender_email,
-                Destination={'ToAddresses': [recipient_email]},
-                Message={
-                    'Subject': {'Data': subject},
-                    'Body': {'Text': {'Data': body}}
-                }
-            )
-            logger.info("SES email dispatched. Message ID: %s", response['MessageId'])
+            self.send_email(recipient_email, STOCK_UPDATE_SUBJECT, body)
             return True
         except Exception as e:
             logger.error("SES email dispatch failed for %s: %s", recipient_email, e)
             return False
+
+    def register_stock_update_template(self, template_name: str) -> None:
+        """Create (or update) the SES template used by bulk sending.
+
+        The template mirrors compose_message: only `first_name` and the
+        pre-rendered `ticker_section` vary per recipient.
+        """
+        template = {
+            'TemplateName': template_name,
+            'SubjectPart': STOCK_UPDATE_SUBJECT,
+            # Plain text: triple braces stop SES's Handlebars engine from
+            # HTML-escaping the values (a name like "O'Brien & Co" stays intact)
+            'TextPart': compose_message("{{{first_name}}}", "{{{ticker_section}}}"),
+        }
+        try:
+            self.ses_client.create_template(Template=template)
+            logger.info("Registered SES template %s", template_name)
+        except ClientError as e:
+            if e.response.get('Error', {}).get('Code') != 'AlreadyExists':
+                raise
+            self.ses_client.update_template(Template=template)
+            logger.info("Updated SES template %s", template_name)
+
+    def send_bulk_stock_updates(self, template_name: str, recipients: List[Tuple[str, Dict[str, str]]]) -> List[Dict[str, Any]]:
+        """Send one templated email per (recipient_email, template_data) pair.
+
+        Up to 50 recipients per call (SES limit). Returns SES's per-destination
+        status entries (`Status`, `MessageId`, `Error`) in recipient order.
+        """
+        response = self.ses_client.send_bulk_templated_email(
+            Source=self.sender_email,
+            Template=template_name,
+            DefaultTemplateData=json.dumps({"first_name": "Valued Customer", "ticker_section": ""}),
+            Destinations=[
+                {
+                    'Destination': {'ToAddresses': [recipient_email]},
+                    'ReplacementTemplateData': json.dumps(template_data),
+                }
+                for recipient_email, template_data in recipients
+            ],
+        )
+        logger.info("SES bulk templated email dispatched to %s recipients", len(recipients))
+        return response['Status']
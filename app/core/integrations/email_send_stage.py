@@ -0,0 +1,361 @@
+"""
+Concurrent, SES-rate-aware send stage for the daily dispatch.
+
+boto3's `send_email` is blocking, so sending one user at a time on the
+event loop serializes thousands of network round trips. EmailSendStage
+runs sends on a bounded thread pool instead:
+
+- at most `max_workers` SES calls are in flight at once,
+- a token bucket keeps the overall rate under SES's max send rate,
+- throttling errors are retried with exponential backoff,
+- per-call latency is recorded and summarized as percentiles.
+
+In "bulk" mode (EMAIL_SEND_MODE=bulk) the stage registers an SES template
+once per run and packs up to 50 recipients, each with their own
+replacement data, into every `send_bulk_templated_email` call. Results are
+still reported per recipient.
+
+Jobs are consumed lazily from any iterable or async iterable (e.g. a
+generator over a streaming user query) so the stage never materializes
+the whole run.
+"""
+
+from collections.abc import AsyncIterable
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass, field
+from itertools import islice
+from typing import Any, AsyncIterator, Awaitable, Callable, Dict, Iterable, List, Optional, Union
+import asyncio
+import inspect
+import logging
+import random
+import time
+
+from botocore.exceptions import ClientError
+
+from app.core.integrations.email_client import (
+    EmailClient,
+    FinancialData,
+    STOCK_UPDATE_SUBJECT,
+    compose_message,
+    render_ticker_fragment,
+)
+from app.settings import settings
+from app.util.rate_limit import TokenBucket
+from app.util.stats import summarize_latencies
+
+logger = logging.getLogger(__name__)
+
+SINGLE = "single"
+BULK = "bulk"
+# SES accepts at most 50 destinations per send_bulk_templated_email call
+BULK_BATCH_SIZE = 50
+
+# SES error codes that mean "slow down", not "this message is bad"
+THROTTLING_ERROR_CODES = frozenset({"Throttling", "ThrottlingException", "TooManyRequestsException"})
+# Per-destination bulk statuses worth another attempt
+RETRYABLE_BULK_STATUSES = frozenset({"AccountThrottled", "TransientFailure"})
+
+
+async def _to_completion(awaitable: Awaitable[Any]) -> Any:
+    """Await `awaitable` to the end even if the current task is cancelled meanwhile.
+
+    The cancellation is held back rather than dropped: the task stays marked
+    as cancelling, and `_raise_if_cancelled` re-raises it at the next point
+    where stopping loses nothing.
+    """
+    future = asyncio.ensure_future(awaitable)
+    try:
+        return await asyncio.shield(future)
+    except asyncio.CancelledError:
+        await asyncio.wait({future})
+        return future.result()
+
+
+def _raise_if_cancelled() -> None:
+    task = asyncio.current_task()
+    if task is not None and task.cancelling():
+        raise asyncio.CancelledError
+
+
+def is_throttling_error(exc: BaseException) -> bool:
+    if not isinstance(exc, ClientError):
+        return False
+    return exc.response.get("Error", {}).get("Code") in THROTTLING_ERROR_CODES
+
+
+async def _batched(jobs: Union[Iterable["SendJob"], AsyncIterable["SendJob"]], size: int) -> AsyncIterator[List["SendJob"]]:
+    if not isinstance(jobs, AsyncIterable):
+        iterator = iter(jobs)
+        while batch := list(islice(iterator, size)):
+            yield batch
+        return
+    batch = []
+    async for job in jobs:
+        batch.append(job)
+        if len(batch) == size:
+            yield batch
+            batch = []
+    if batch:
+        yield batch
+
+
+@dataclass
+class SendJob:
+    """One email to send.
+
+    Provide either a full `body`, a pre-rendered `ticker_section` (wrapped
+    with the greeting for `first_name`), or the raw `stock_data`. `subject`
+    applies to single sends; bulk sends use the registered template's.
+    """
+    user_id: Optional[int]
+    recipient_email: str
+    first_name: str
+    stock_data: FinancialData = field(default_factory=dict)
+    body: Optional[str] = None
+    ticker_section: Optional[str] = None
+    subject: str = STOCK_UPDATE_SUBJECT
+
+    def section(self) -> str:
+        if self.ticker_section is None:
+            self.ticker_section = "".join(render_ticker_fragment(t, d) for t, d in self.stock_data.items())
+        return self.ticker_section
+
+    def full_body(self) -> str:
+        return self.body if self.body is not None else compose_message(self.first_name, self.section())
+
+
+@dataclass
+class SendResult:
+    job: SendJob
+    message_id: Optional[str] = None
+    error: Optional[str] = None
+    attempts: int = 0
+    latency_ms: float = 0.0
+
+    @property
+    def ok(self) -> bool:
+        return self.message_id is not None
+
+
+class EmailSendStage:
+    def __init__(
+        self,
+        email_client: EmailClient,
+        max_workers: Optional[int] = None,
+        max_send_rate: Optional[float] = None,
+        max_throttle_retries: Optional[int] = None,
+        base_backoff_seconds: float = 0.5,
+        mode: Optional[str] = None,
+        template_name: Optional[str] = None,
+    ):
+        self._email_client = email_client
+        self._max_workers = max_workers or settings.EMAIL_SEND_WORKERS
+        rate = max_send_rate or settings.SES_MAX_SEND_RATE
+        # One second of burst, matching how SES enforces its per-second rate
+        self._bucket = TokenBucket(rate, max(1.0, rate))
+        self._max_throttle_retries = (
+            settings.SES_MAX_THROTTLE_RETRIES if max_throttle_retries is None else max_throttle_retries
+        )
+        self._base_backoff = base_backoff_seconds
+        self.mode = mode or settings.EMAIL_SEND_MODE
+        self._template_name = template_name or settings.SES_TEMPLATE_NAME
+        self._executor = ThreadPoolExecutor(max_workers=self._max_workers, thread_name_prefix="ses-send")
+        self._latencies_ms: list[float] = []
+        self.api_calls = 0
+        self.sent = 0
+        self.failed = 0
+        self.throttled = 0
+
+    async def _call(self, func, *args):
+        """Run one blocking SES send on the pool. Returns (result, latency_ms)."""
+        loop = asyncio.get_running_loop()
+        started = time.perf_counter()
+        self.api_calls += 1
+        try:
+            # Once a request is with SES its outcome must reach the caller, or
+            # a resumed dispatch would send it again: cancelling the run waits
+            # for the answer instead of abandoning the thread
+            value = await _to_completion(loop.run_in_executor(self._executor, func, *args))
+        finally:
+            latency_ms = (time.perf_counter() - started) * 1000
+            self._latencies_ms.append(latency_ms)
+        return value, latency_ms
+
+    async def _backoff(self, attempt: int) -> None:
+        self.throttled += 1
+        await asyncio.sleep(self._base_backoff * (2 ** (attempt - 1)) * random.uniform(1.0, 1.5))
+
+    async def _send_one(self, job: SendJob) -> List[SendResult]:
+        result = SendResult(job=job)
+        while True:
+            await self._bucket.acquire()
+            result.attempts += 1
+            try:
+                result.message_id, result.latency_ms = await self._call(
+                    self._email_client.send_email, job.recipient_email, job.subject, job.full_body()
+                )
+                self.sent += 1
+                return [result]
+            except Exception as e:
+                if is_throttling_error(e) and result.attempts <= self._max_throttle_retries:
+                    _raise_if_cancelled()
+                    logger.warning("SES throttled send to %s; retrying", job.recipient_email)
+                    await self._backoff(result.attempts)
+                    continue
+                logger.error("SES email dispatch failed for %s: %s", job.recipient_email, e)
+                result.error = str(e)
+                self.failed += 1
+                return [result]
+
+    async def _send_batch(self, jobs: List[SendJob]) -> List[SendResult]:
+        results = [SendResult(job=job) for job in jobs]
+        try:
+            await self._send_batch_attempts(results)
+        except asyncio.CancelledError:
+            # Cancelled between attempts: the recipients SES already answered
+            # for are still returned, and the worker re-raises after reporting
+            return [r for r in results if r.ok or r.error is not None]
+        return results
+
+    async def _send_batch_attempts(self, results: List[SendResult]) -> None:
+        remaining = results
+        attempt = 0
+        while remaining:
+            attempt += 1
+            # SES's max send rate counts recipients, not API calls
+            for _ in remaining:
+                await self._bucket.acquire()
+            recipients = [
+                (r.job.recipient_email, {"first_name": r.job.first_name, "ticker_section": r.job.section()})
+                for r in remaining
+            ]
+            latency_ms = 0.0
+            try:
+                statuses, latency_ms = await self._call(
+                    self._email_client.send_bulk_stock_updates, self._template_name, recipients
+                )
+            except Exception as e:
+                if is_throttling_error(e) and attempt <= self._max_throttle_retries:
+                    _raise_if_cancelled()
+                    logger.warning("SES throttled bulk send of %s recipients; retrying", len(remaining))
+                    await self._backoff(attempt)
+                    continue
+                logger.error("SES bulk dispatch failed for %s recipients: %s", len(remaining), e)
+                statuses = [{"Status": "Failed", "Error": str(e)}] * len(remaining)
+
+            retry = []
+            for result, status in zip(remaining, statuses):
+                result.attempts = attempt
+                result.latency_ms = latency_ms
+                if status.get("MessageId") and status.get("Status", "Success") == "Success":
+                    result.message_id = status.get("MessageId")
+                    self.sent += 1
+                elif status.get("Status") in RETRYABLE_BULK_STATUSES and attempt <= self._max_throttle_retries:
+                    retry.append(result)
+                else:
+                    result.error = status.get("Error") or status.get("Status")
+                    logger.error("SES bulk dispatch failed for %s: %s", result.job.recipient_email, result.error)
+                    self.failed += 1
+            if retry:
+                _raise_if_cancelled()
+                await self._backoff(attempt)
+            remaining = retry
+
+    async def _prepare(self) -> None:
+        if self.mode != BULK:
+            return
+        loop = asyncio.get_running_loop()
+        try:
+            await loop.run_in_executor(self._executor, self._email_client.register_stock_update_template, self._template_name)
+        except Exception as e:
+            logger.error("Could not register SES template %s, falling back to single sends: %s", self._template_name, e)
+            self.mode = SINGLE
+
+    async def run(
+        self,
+        jobs: Union[Iterable[SendJob], AsyncIterable[SendJob]],
+        on_result: Optional[Callable[[SendResult], Optional[Awaitable[None]]]] = None,
+    ) -> Dict[str, Any]:
+        """Send every job, calling `on_result` as each recipient finishes.
+
+        `on_result` may be a coroutine function; its worker awaits it before
+        taking the next jobs. Returns the stage stats (see `stats()`).
+        """
+        await self._prepare()
+        if self.mode == BULK:
+            units, handler = _batched(jobs, BULK_BATCH_SIZE), self._send_batch
+        else:
+            units, handler = _batched(jobs, 1), lambda unit: self._send_one(unit[0])
+
+        slots = asyncio.Semaphore(self._max_workers)
+        pending: set[asyncio.Task] = set()
+        failed: List[asyncio.Task] = []
+
+        def reap(task: asyncio.Task) -> None:
+            # Drop workers as they finish so a long run holds only the in-flight
+            # ones; a failed worker is kept so its exception is raised below
+            if not task.cancelled() and task.exception() is not None:
+                failed.append(task)
+            else:
+                pending.discard(task)
+
+        async def report(results: List[SendResult]) -> None:
+            for result in results:
+                outcome = on_result(result)
+                if inspect.isawaitable(outcome):
+                    await outcome
+
+        async def worker(unit: List[SendJob]) -> None:
+            try:
+                results = await handler(unit)
+                if on_result is not None:
+                    await _to_completion(report(results))
+                # A cancellation held back while SES answered takes effect now
+                _raise_if_cancelled()
+            finally:
+                slots.release()
+
+        try:
+            async for unit in units:
+                # Backpressure: only pull the next jobs once a worker slot is free
+                await slots.acquire()
+                if failed:
+                    slots.release()
+                    break
+                task = asyncio.create_task(worker(unit))
+                pending.add(task)
+                task.add_done_callback(reap)
+
+            # Every worker's outcome is collected: an error that escaped a send
+            # (e.g. from `on_result`) fails the run instead of being dropped
+            results = await asyncio.gather(*pending, return_exceptions=True)
+        finally:
+            # On an error from the jobs or a cancellation, stop the workers
+            # before it propagates; sends already with SES are still reported
+            running = [task for task in pending if not task.done()]
+            for task in running:
+                if not task.cancelling():
+                    task.cancel()
+            if running:
+                await asyncio.gather(*running, return_exceptions=True)
+            await units.aclose()
+        errors = [r for r in results if isinstance(r, BaseException)]
+        if errors:
+            logger.error("%s email send workers failed; first error: %r", len(errors), errors[0])
+            raise errors[0]
+        return self.stats()
+
+    async def aclose(self) -> None:
+        """Shut the send threads down off the event loop (after `run()`, which drains its workers)."""
+        await asyncio.to_thread(self._executor.shutdown, True)
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            "mode": self.mode,
+            "api_calls": self.api_calls,
+            "sent": self.sent,
+            "failed": self.failed,
+            "throttled_retries": self.throttled,
+            "latency": summarize_latencies(self._latencies_ms),
+        }
@@ -0,0 +1,98 @@
+"""
+Response cache used by FinnhubClient.
+
+Each endpoint gets its own `CachePolicy` (TTL + max size) in a bounded
+in-memory LRU. Only quotes are cached by default: company profiles are
+stored in the `company_profiles` table (see CompanyProfileRepository),
+which is the single source of truth for how fresh a profile is.
+"""
+
+from dataclasses import dataclass
+from typing import Any, Callable, Dict
+import logging
+import time
+
+from app.settings import settings
+from app.util.ttl_cache import MemoryCacheBackend
+
+logger = logging.getLogger(__name__)
+
+# Endpoint names used as cache namespaces by FinnhubClient
+QUOTE = "quote"
+
+
+@dataclass(frozen=True)
+class CachePolicy:
+    """Per-endpoint caching rules."""
+    ttl_seconds: float
+    max_entries: int
+
+
+class FinnhubCache:
+    """Per-endpoint TTL/LRU cache.
+
+    Payloads are the raw JSON dicts returned by Finnhub so they can be
+    re-validated into Pydantic models.
+    """
+
+    def __init__(
+        self,
+        policies: Dict[str, CachePolicy],
+        clock: Callable[[], float] = time.time,
+    ):
+        self._policies = policies
+        self._clock = clock
+        self._memory = {
+            endpoint: MemoryCacheBackend(policy.max_entries, clock=clock)
+            for endpoint, policy in policies.items()
+        }
+        self._hits = {endpoint: 0 for endpoint in policies}
+        self._misses = {endpoint: 0 for endpoint in policies}
+
+    @classmethod
+    def from_settings(cls) -> "FinnhubCache":
+        policies = {
+            QUOTE: CachePolicy(
+                ttl_seconds=settings.FINNHUB_QUOTE_CACHE_TTL_SECONDS,
+                max_entries=settings.FINNHUB_CACHE_MAX_ENTRIES,
+            ),
+        }
+        return cls(policies)
+
+    @staticmethod
+    def _key(endpoint: str, symbol: str) -> str:
+        return f"{endpoint}:{symbol.upper()}"
+
+    def get(self, endpoint: str, symbol: str) -> Any | None:
+        memory = self._memory.get(endpoint)
+        if memory is None:
+            return None
+        payload = memory.get(self._key(endpoint, symbol))
+        if payload is None:
+            self._misses[endpoint] += 1
+        else:
+            self._hits[endpoint] += 1
+        return payload
+
+    def set(self, endpoint: str, symbol: str, payload: Any) -> None:
+        policy = self._policies.get(endpoint)
+        if policy is None or policy.ttl_seconds <= 0:
+            return
+        key = self._key(endpoint, symbol)
+        expires_at = self._clock() + policy.ttl_seconds
+        self._memory[endpoint].set(key, payload, expires_at)
+
+    def invalidate(self, endpoint: str, symbol: str) -> None:
+        memory = self._memory.get(endpoint)
+        if memory is not None:
+            memory.delete(self._key(endpoint, symbol))
+
+    def stats(self) -> Dict[str, Dict[str, int]]:
+        return {
+            endpoint: {
+                "hits": self._hits[endpoint],
+                "misses": self._misses[endpoint],
+                "size": len(self._memory[endpoint]),
+            }
+            for endpoint in self._policies
+        }
@@ -1,52 +1,209 @@
 """
 Client for interacting with the external Finnhub API.
 Wraps the synchronous Finnhub library to make it safely callable within 
-FastAPI's asynchronous context using asyncio.to_thread.
+FastAPI's asynchronous context using asyncio.to_thread, or talks to the
+REST API natively async (see finnhub_transport, FINNHUB_TRANSPORT).
 """
 
-import finnhub
 from app.settings import settings
 from fastapi import HTTPException
 import asyncio
-from typing import Any, Optional, Dict
-from app.core.integrations.finnhub_schema import StockQuoteOutput, CompanyProfileOutput
+import httpx
+import random
+import requests
+import time
+from typing import Any, Awaitable, Callable, List, Optional, Dict, TypeVar
+from app.core.integrations.finnhub_schema import CandleOutput, StockQuoteOutput, CompanyProfileOutput, StockSymbolOutput
+from app.core.integrations.finnhub_cache import FinnhubCache, QUOTE
+from app.core.integrations.finnhub_transport import transport_from_settings
+from app.util.rate_limit import TokenBucket
 import logging
 
 logger = logging.getLogger(__name__)
 
+T = TypeVar("T")
+
+
+def upstream_status_code(exc: BaseException) -> Optional[int]:
+    """Best-effort HTTP status of a failed upstream call (None if unknown)."""
+    status_code = getattr(exc, "status_code", None)
+    if status_code is None:
+        response = getattr(exc, "response", None)
+        status_code = getattr(response, "status_code", None)
+    return status_code if isinstance(status_code, int) else None
+
+
+# Statuses FinnhubClient raises for failures worth retrying later
+TRANSIENT_STATUS_CODES = frozenset({429, 503, 504})
+
+
+def error_status_code(exc: BaseException) -> int:
+    """Map an upstream failure to the HTTP status FinnhubClient raises.
+
+    - 429 stays 429 (rate limited), upstream 5xx and connection errors
+      become 503, timeouts become 504 -- all transient.
+    - Any other upstream 4xx becomes 502 and unknown errors 500 (permanent).
+    """
+    if isinstance(exc, (asyncio.TimeoutError, requests.Timeout, httpx.TimeoutException)):
+        return 504
+    if isinstance(exc, (requests.ConnectionError, httpx.TransportError)):
+        return 503
+    status_code = upstream_status_code(exc)
+    if status_code is None:
+        return 500
+    if status_code == 429:
+        return 429
+    return 503 if status_code >= 500 else 502
+
+
+def is_transient_error(exc: BaseException) -> bool:
+    """True if `exc` (usually an HTTPException from FinnhubClient) may succeed on retry."""
+    return getattr(exc, "status_code", None) in TRANSIENT_STATUS_CODES
+
+
+class FetchScheduler:
+    """
+    Rate-limited, bounded-concurrency runner for upstream Finnhub calls.
+
+    - Two token buckets enforce the per-second and per-minute quotas.
+    - A semaphore caps the number of requests in flight.
+    - A 429 response halves the effective rate, pauses every caller for an
+      exponentially growing (jittered) window and retries the call; each
+      success recovers a little of the rate (AIMD), so a full run settles
+      just under whatever the quota actually allows.
+    """
+
+    MIN_RATE_SCALE = 0.1
+    MAX_BACKOFF_SECONDS = 60.0
+
+    def __init__(
+        self,
+        calls_per_second: float,
+        calls_per_minute: float,
+        max_in_flight: int,
+        max_429_retries: int = 5,
+        base_backoff_seconds: float = 1.0,
+        clock: Callable[[], float] = time.monotonic,
+    ):
+        self._clock = clock
+        self._buckets = [
+            TokenBucket(calls_per_second, calls_per_second, clock=clock),
+            TokenBucket(calls_per_minute / 60.0, calls_per_minute, clock=clock),
+        ]
+        self._semaphore = asyncio.Semaphore(max_in_flight)
+        self._max_429_retries = max_429_retries
+        self._base_backoff = base_backoff_seconds
+        self._rate_scale = 1.0
+        self._paused_until = 0.0
+        self._consecutive_429 = 0
+        self.calls = 0
+        self.throttled = 0
+        self.rejected = 0
+
+    @classmethod
+    def from_settings(cls) -> "FetchScheduler":
+        return cls(
+            calls_per_second=settings.FINNHUB_CALLS_PER_SECOND,
+            calls_per_minute=settings.FINNHUB_CALLS_PER_MINUTE,
+            max_in_flight=settings.FINNHUB_MAX_IN_FLIGHT,
+            max_429_retries=settings.FINNHUB_MAX_429_RETRIES,
+        )
+
+    async def _acquire_token(self) -> None:
+        waited = False
+        while True:
+            delay = max(
+                self._paused_until - self._clock(),
+                *(bucket.wait_time(self._rate_scale) for bucket in self._buckets),
+            )
+            if delay <= 0:
+                # No await between the check and consume, so this is atomic on the loop
+                for bucket in self._buckets:
+                    bucket.consume()
+                if waited:
+                    self.throttled += 1
+                return
+            waited = True
+            await asyncio.sleep(delay)
+
+    def _on_rejected(self, exc: BaseException) -> float:
+        self.rejected += 1
+        self._consecutive_429 += 1
+        if self._clock() >= self._paused_until:
+            # Only the first 429 of a burst shrinks the rate; concurrent ones share the pause
+            self._rate_scale = max(self.MIN_RATE_SCALE, self._rate_scale / 2)
+        retry_after = getattr(getattr(exc, "response", None), "headers", {}) or {}
+        try:
+            delay = float(retry_after.get("Retry-After"))
+        except (TypeError, ValueError):
+            delay = self._base_backoff * (2 ** (self._consecutive_429 - 1))
+        delay = min(self.MAX_BACKOFF_SECONDS, delay) * random.uniform(1.0, 1.5)
+        self._paused_until = max(self._paused_until, self._clock() + delay)
+        return delay
+
+    def _on_success(self) -> None:
+        self._consecutive_429 = 0
+        self._rate_scale = min(1.0, self._rate_scale + 0.05)
+
+    async def submit(self, call: Callable[[], Awaitable[T]]) -> T:
+        """Run `call()` once a token and an in-flight slot are available.
+
+        429 responses are retried up to `max_429_retries` times; any other
+        error propagates to the caller unchanged.
+        """
+        attempt = 0
+        async with self._semaphore:
+            while True:
+                await self._acquire_token()
+                self.calls += 1
+                try:
+                    result = await call()
+                except Exception as e:
+                    if upstream_status_code(e) != 429 or attempt >= self._max_429_retries:
+                        raise
+                    attempt += 1
+                    delay = self._on_rejected(e)
+                    logger.warning("Finnhub rate limit hit (429); backing off %.2fs (retry %s)", delay, attempt)
+                    continue
+                self._on_success()
+                return result
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            "calls": self.calls,
+            "throttled": self.throttled,
+            "rejected": self.rejected,
+            "rate_scale": round(self._rate_scale, 2),
+        }
+
+
 class FinnhubClient:
     """
-    Thin wrapper around the synchronous finnhub.Client.
+    Thin async wrapper around the Finnhub API.
 
     Purpose:
-    - Instantiate the finnhub client correctly with the API key.
+    - Instantiate the configured transport correctly with the API key.
     - Expose async methods (get_stock_quote, get_company_profile) that
-      run the blocking finnhub calls off the event loop so they don't
-      block other async tasks.
+      never block the event loop, whichever transport is in use.
+    - Serve repeat quote lookups from a per-endpoint TTL cache (see finnhub_cache).
+    - Route every upstream call through a FetchScheduler so bursts stay
+      inside Finnhub's rate limits.
     """
         
-    def __init__(self):
-        api_key = settings.FINNHUB_API_KEY
-        logger.info("Initializing Finnhub client")
-        self.client = finnhub.Client(api_key=api_key)
-    
-    async def run_sync_call(self, func, *args, **kwargs):
-        """
-        Run a synchronous function in a separate thread and await its result.
-
-        Why:
-        - finnhub.Client methods are blocking (perform network I/O).
-        - In an async FastAPI endpoint, calling a blocking function directly
-          would block the event loop and halt concurrency.
-        - asyncio.to_thread schedules the blocking call on a thread from the
-          default thread pool and returns a coroutine you can await.
-
-        How it works (high level):
-        - asyncio.to_thread(func, *args, **kwargs) submits func to a thread
-          and returns a coroutine. Awaiting that coroutine yields the return
-          value of func once it finishes.
-        """
-        return await asyncio.to_thread(func, *args, **kwargs)
+    def __init__(
+        self,
+        cache: Optional[FinnhubCache] = None,
+        scheduler: Optional[FetchScheduler] = None,
+        transport=None,
+    ):
+        self.transport = transport if transport is not None else transport_from_settings()
+        logger.info("Initializing Finnhub client (transport=%s)", type(self.transport).__name__)
+        self.cache = cache if cache is not None else FinnhubCache.from_settings()
+        self.scheduler = scheduler if scheduler is not None else FetchScheduler.from_settings()
+
+    async def aclose(self) -> None:
+        """Release the transport's connections. Call once the run is done."""
+        await self.transport.aclose()
 
     async def get_stock_quote(self, symbol: str) -> StockQuoteOutput | None:
         """
@@ -54,22 +211,28 @@ class FinnhubClient:
             c: Current price, d: Change, dp: Percent change, h: High price of the day, l: Low price of the day, o: Open price of the day, pc: Previous close price, pc: Previous close price
         """
         try:
-            # call the blocking library off the event loop
-            logger.debug("Fetching stock quote for %s", symbol.upper())
-            quote = await self.run_sync_call(self.client.quote, symbol.upper())
-            if not quote or quote.get('c') == 0:
-                raise HTTPException(status_code=404, detail=f"Quote for symbol '{symbol}' not found.")
+            quote = self.cache.get(QUOTE, symbol)
+            cached = quote is not None
+            if not cached:
+                logger.debug("Fetching stock quote for %s", symbol.upper())
+                quote = await self.scheduler.submit(lambda: self.transport.quote(symbol.upper()))
+                if not quote or quote.get('c') == 0:
+                    raise HTTPException(status_code=404, detail=f"Quote for symbol '{symbol}' not found.")
             # Convert to a Pydantic model for structured typing and validation.
             # Using model_validate for Pydantic v2 compatibility.
             try:
-                return StockQuoteOutput.model_validate(quote)
+                result = StockQuoteOutput.model_validate(quote)
             except Exception as e:
                 raise HTTPException(status_code=500, detail=f"Coult not validate Pydantic StockQuote Schema: {e}")
+            # Only cache fresh payloads that validated, so bad data is refetched next time
+            if not cached:
+                self.cache.set(QUOTE, symbol, quote)
+            return result
         except HTTPException:
             raise
         except Exception as e:
             logger.exception("Finnhub quote fetch failed for %s: %s", symbol, e)
-            raise HTTPException(status_code=500, detail=f"Finnhub quote fetch failed: {e}")
+            raise HTTPException(status_code=error_status_code(e), detail=f"Finnhub quote fetch failed: {e}")
 
 
     async def get_company_profile(self, symbol: str) -> CompanyProfileOutput | None:
@@ -87,11 +250,14 @@ class FinnhubClient:
             shareOutstanding: Number of oustanding shares.
             ticker: Company symbol/ticker as used on the listed exchange.
             weburl: Company website.
+
+        Not cached: the dispatch keeps profiles in the `company_profiles`
+        table and only calls this for missing or stale ones.
         """
 
         try:
             logger.debug("Fetching company profile for %s", symbol.upper())
-            profile = await self.run_sync_call(self.client.company_profile2, symbol=symbol.upper())
+            profile = await self.scheduler.submit(lambda: self.transport.company_profile(symbol.upper()))
             if not profile or profile.get('name') is None:
                 raise HTTPException(status_code=404, detail=f"Profile for symbol '{symbol}' not found.")
             try:
@@ -102,7 +268,60 @@ class FinnhubClient:
             raise
         except Exception as e:
             logger.exception("Finnhub profile fetch failed for %s: %s", symbol, e)
-            raise HTTPException(status_code=500, detail=f"Finnhub profile fetch failed: {e}")
+            raise HTTPException(status_code=error_status_code(e), detail=f"Finnhub profile fetch failed: {e}")
+
 
+    async def get_daily_candles(self, symbol: str, days: int) -> CandleOutput:
+        """
+        Daily candles covering the last `days` calendar days (oldest first).
+
+        Not cached: the series changes every trading day and is only pulled
+        once per dispatch run.
+
+        Response Attributes:
+            c: List of close prices, t: List of UNIX timestamps, s: Status ("ok" or "no_data").
+        """
+        try:
+            to_ts = int(time.time())
+            from_ts = to_ts - days * 86400
+            logger.debug("Fetching daily candles for %s", symbol.upper())
+            candles = await self.scheduler.submit(
+                lambda: self.transport.candles(symbol.upper(), "D", from_ts, to_ts)
+            )
+            if not candles or candles.get('s') != 'ok':
+                raise HTTPException(status_code=404, detail=f"Candles for symbol '{symbol}' not found.")
+            try:
+                return CandleOutput.model_validate(candles)
+            except Exception as e:
+                raise HTTPException(status_code=500, detail=f"Could not validate Pydantic Candle Schema: {e}")
+        except HTTPException:
+            raise
+        except Exception as e:
+            if upstream_status_code(e) == 403:
+                # The plan does not include candles; callers stop asking for the run
+                raise HTTPException(status_code=403, detail=f"Finnhub candles are not available on this plan: {e}")
+            logger.exception("Finnhub candle fetch failed for %s: %s", symbol, e)
+            raise HTTPException(status_code=error_status_code(e), detail=f"Finnhub candle fetch failed: {e}")
 
+    async def get_stock_symbols(self, exchange: str) -> List[StockSymbolOutput]:
+        """
+        Every symbol listed on `exchange` (e.g. "US"); tens of thousands of entries.
 
+        Response Attributes:
+            symbol: Symbol as used by the other endpoints, description: Company name,
+            displaySymbol: Display symbol, type: Security type.
+        """
+        try:
+            logger.debug("Fetching symbol list for exchange %s", exchange)
+            symbols = await self.scheduler.submit(lambda: self.transport.stock_symbols(exchange))
+            if not symbols:
+                raise HTTPException(status_code=404, detail=f"No symbols found for exchange '{exchange}'.")
+            try:
+                return [StockSymbolOutput.model_validate(entry) for entry in symbols]
+            except Exception as e:
+                raise HTTPException(status_code=500, detail=f"Could not validate Pydantic StockSymbol Schema: {e}")
+        except HTTPException:
+            raise
+        except Exception as e:
+            logger.exception("Finnhub symbol fetch failed for %s: %s", exchange, e)
+            raise HTTPException(status_code=error_status_code(e), detail=f"Finnhub symbol fetch failed: {e}")
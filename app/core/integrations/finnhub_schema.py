@@ -1,5 +1,5 @@
 from pydantic import BaseModel, Field
-from typing import Optional
+from typing import List, Optional
 
 class StockQuoteOutput(BaseModel):
     """
@@ -37,3 +37,28 @@ class CompanyProfileOutput(BaseModel):
     shareOutstanding: Optional[float] = None
     ticker: str
     weburl: Optional[str] = None
+
+
+class CandleOutput(BaseModel):
+    """
+    Represents the daily candles returned by Finnhub's /stock/candle endpoint
+    (only the fields the indicators need).
+    """
+    close: List[float] = Field(default_factory=list, alias='c')
+
+    timestamp: List[int] = Field(default_factory=list, alias='t')
+
+    status: str = Field(..., alias='s')
+
+    class ConfigDict:
+        populate_by_name = True
+
+
+class StockSymbolOutput(BaseModel):
+    """
+    Represents one entry of Finnhub's /stock/symbol listing for an exchange.
+    """
+    symbol: str
+    description: str = ""
+    displaySymbol: Optional[str] = None
+    type: Optional[str] = None
@@ -0,0 +1,119 @@
+"""
+Transports used by FinnhubClient to reach the Finnhub REST API.
+
+- ThreadTransport: the original approach. Runs the blocking
+  `finnhub.Client` on the default thread pool via asyncio.to_thread.
+- AsyncHttpTransport: calls `/quote`, `/stock/profile2`, `/stock/candle`
+  and `/stock/symbol` directly with a natively async httpx client. One pooled keep-alive
+  connection set is shared by every request until `aclose()` is called,
+  so a dispatch run pays the TLS handshake a handful of times instead of
+  once per ticker.
+
+Both return the raw JSON dict and let upstream errors propagate; callers
+(FetchScheduler, FinnhubClient) read the HTTP status off the exception.
+Select one with the FINNHUB_TRANSPORT setting ("thread" or "async").
+"""
+
+from typing import Any, Dict, List, Optional
+import asyncio
+import logging
+
+import finnhub
+import httpx
+
+from app.settings import settings
+
+logger = logging.getLogger(__name__)
+
+
+class ThreadTransport:
+    """Adapter over the synchronous finnhub.Client."""
+
+    def __init__(self, client: Optional[finnhub.Client] = None):
+        self.client = client or finnhub.Client(api_key=settings.FINNHUB_API_KEY)
+
+    async def quote(self, symbol: str) -> Dict[str, Any]:
+        return await asyncio.to_thread(self.client.quote, symbol)
+
+    async def company_profile(self, symbol: str) -> Dict[str, Any]:
+        return await asyncio.to_thread(self.client.company_profile2, symbol=symbol)
+
+    async def candles(self, symbol: str, resolution: str, from_ts: int, to_ts: int) -> Dict[str, Any]:
+        return await asyncio.to_thread(self.client.stock_candles, symbol, resolution, from_ts, to_ts)
+
+    async def stock_symbols(self, exchange: str) -> List[Dict[str, Any]]:
+        return await asyncio.to_thread(self.client.stock_symbols, exchange)
+
+    async def aclose(self) -> None:
+        # requests.Session is closed on a worker thread to avoid blocking the loop
+        await asyncio.to_thread(self.client.close)
+
+
+class AsyncHttpTransport:
+    """Native async transport with a shared keep-alive connection pool."""
+
+    API_URL = "https://api.finnhub.io/api/v1"
+
+    def __init__(
+        self,
+        api_key: Optional[str] = None,
+        max_connections: Optional[int] = None,
+        timeout_seconds: Optional[float] = None,
+        http_transport: Optional[httpx.AsyncBaseTransport] = None,
+    ):
+        self._api_key = api_key or settings.FINNHUB_API_KEY
+        self._max_connections = max_connections or settings.FINNHUB_HTTP_MAX_CONNECTIONS
+        self._timeout = timeout_seconds or settings.FINNHUB_HTTP_TIMEOUT_SECONDS
+        # Injectable so tests can use httpx.MockTransport instead of the network
+        self._http_transport = http_transport
+        self._client: Optional[httpx.AsyncClient] = None
+
+    def _get_client(self) -> httpx.AsyncClient:
+        # Created lazily so the pool binds to the event loop that actually uses it
+        if self._client is None:
+            self._client = httpx.AsyncClient(
+                base_url=self.API_URL,
+                headers={"Accept": "application/json", "X-Finnhub-Token": self._api_key},
+                limits=httpx.Limits(
+                    max_connections=self._max_connections,
+                    max_keepalive_connections=self._max_connections,
+                ),
+                timeout=self._timeout,
+                transport=self._http_transport,
+            )
+            logger.info("Opened Finnhub HTTP connection pool (max_connections=%s)", self._max_connections)
+        return self._client
+
+    async def _get_json(self, path: str, **params: Any) -> Dict[str, Any]:
+        response = await self._get_client().get(path, params=params)
+        # HTTPStatusError carries the response, so status/Retry-After stay readable
+        response.raise_for_status()
+        return response.json()
+
+    async def quote(self, symbol: str) -> Dict[str, Any]:
+        return await self._get_json("/quote", symbol=symbol)
+
+    async def company_profile(self, symbol: str) -> Dict[str, Any]:
+        return await self._get_json("/stock/profile2", symbol=symbol)
+
+    async def candles(self, symbol: str, resolution: str, from_ts: int, to_ts: int) -> Dict[str, Any]:
+        # "from" is a Python keyword, hence the dict splat
+        return await self._get_json("/stock/candle", symbol=symbol, resolution=resolution, **{"from": from_ts, "to": to_ts})
+
+    async def stock_symbols(self, exchange: str) -> List[Dict[str, Any]]:
+        return await self._get_json("/stock/symbol", exchange=exchange)
+
+    async def aclose(self) -> None:
+        if self._client is not None:
+            await self._client.aclose()
+            self._client = None
+            logger.info("Closed Finnhub HTTP connection pool")
+
+
+def transport_from_settings():
+    """Build the transport named by FINNHUB_TRANSPORT."""
+    if settings.FINNHUB_TRANSPORT == "async":
+        return AsyncHttpTransport()
+    if settings.FINNHUB_TRANSPORT != "thread":
+        logger.warning("Unknown FINNHUB_TRANSPORT=%r; falling back to 'thread'", settings.FINNHUB_TRANSPORT)
+    return ThreadTransport()
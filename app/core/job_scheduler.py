@@ -0,0 +1,173 @@
+"""
+In-process asyncio scheduler for the resident dispatch.
+
+Each `Job` runs on its own cadence -- every N seconds, or daily at a UTC
+time -- on a fixed grid of "slots" (multiples of the interval since the
+epoch, or the daily time), so a restart keeps the same schedule:
+
+- jitter: each run starts a random 0..`jitter_seconds` after its slot, so
+  several processes (or jobs) do not hit Finnhub/SES in lockstep,
+- no overlap: if a job is still running when its next slot comes up, that
+  slot is skipped rather than started alongside it,
+- catch-up: a slot that was missed (process down, host suspended, event
+  loop blocked) still runs once if it is at most `catch_up` late; several
+  missed slots are coalesced into that one run. On startup the latest slot
+  counts as missed, so e.g. a digest due an hour ago runs immediately.
+
+Jobs receive their slot time (UTC), which the daily digest uses as its run
+date so a catch-up after midnight still resumes the right day's ledger.
+"""
+
+from dataclasses import dataclass
+from datetime import datetime, time as dtime, timedelta, timezone
+from typing import Any, Awaitable, Callable, Dict, List, Optional
+import asyncio
+import logging
+import random
+import time
+
+logger = logging.getLogger(__name__)
+
+DAY_SECONDS = 24 * 60 * 60
+# A slot this late is still "on time" for jobs without a catch-up window
+LATE_GRACE_SECONDS = 5.0
+# Re-read the wall clock at least this often: asyncio.sleep runs on the
+# monotonic clock, which does not advance while the host is suspended
+MAX_SLEEP_SECONDS = 60.0
+
+
+@dataclass
+class Job:
+    """A coroutine function run on a cadence: set exactly one of `every` / `daily_at` (UTC)."""
+    name: str
+    run: Callable[[datetime], Awaitable[Any]]
+    every: Optional[timedelta] = None
+    daily_at: Optional[dtime] = None
+    jitter_seconds: float = 0.0
+    catch_up: timedelta = timedelta(0)
+
+    def __post_init__(self):
+        if (self.every is None) == (self.daily_at is None):
+            raise ValueError(f"Job {self.name!r} needs exactly one of `every` or `daily_at`")
+
+    @property
+    def period_seconds(self) -> float:
+        return self.every.total_seconds() if self.every is not None else DAY_SECONDS
+
+    def previous_slot(self, now: float) -> float:
+        """The latest slot at or before `now` (epoch seconds)."""
+        if self.every is not None:
+            return now - now % self.period_seconds
+        offset = self.daily_at.hour * 3600 + self.daily_at.minute * 60 + self.daily_at.second
+        slot = now - now % DAY_SECONDS + offset
+        return slot if slot <= now else slot - DAY_SECONDS
+
+    def next_slot(self, now: float) -> float:
+        """The first slot after `now`."""
+        return self.previous_slot(now) + self.period_seconds
+
+
+class _JobState:
+    def __init__(self, job: Job):
+        self.job = job
+        self.slot = 0.0
+        self.due = 0.0
+        self.task: Optional[asyncio.Task] = None
+        self.runs = 0
+        self.failures = 0
+        self.skipped_overlap = 0
+        self.missed = 0
+        self.last_duration_ms: Optional[float] = None
+
+
+class JobScheduler:
+    def __init__(
+        self,
+        jobs: List[Job],
+        clock: Callable[[], float] = time.time,
+        sleep: Callable[[float], Awaitable[None]] = asyncio.sleep,
+        rng: Optional[random.Random] = None,
+    ):
+        self._states = [_JobState(job) for job in jobs]
+        self._clock = clock
+        self._sleep = sleep
+        self._rng = rng or random.Random()
+
+    def _schedule(self, state: _JobState, slot: float) -> None:
+        state.slot = slot
+        state.due = slot + self._rng.uniform(0, state.job.jitter_seconds)
+
+    def _fire(self, state: _JobState, now: float) -> None:
+        job = state.job
+        lateness = now - state.due
+        if state.task is not None and not state.task.done():
+            state.skipped_overlap += 1
+            logger.warning("Job %s is still running; skipping its %s slot", job.name, _utc(state.slot))
+        elif lateness > max(job.catch_up.total_seconds(), LATE_GRACE_SECONDS):
+            state.missed += 1
+            logger.warning("Job %s missed its %s slot by %.0fs; not catching up", job.name, _utc(state.slot), lateness)
+        else:
+            state.task = asyncio.create_task(self._run_job(state, state.slot), name=f"job:{job.name}")
+        # However many slots went by, the next run is the first slot after now
+        self._schedule(state, job.next_slot(now))
+
+    async def _run_job(self, state: _JobState, slot: float) -> None:
+        started = time.perf_counter()
+        state.runs += 1
+        logger.info("Starting job %s for slot %s", state.job.name, _utc(slot))
+        try:
+            await state.job.run(_utc(slot))
+        except Exception:
+            state.failures += 1
+            logger.exception("Job %s failed", state.job.name)
+        finally:
+            state.last_duration_ms = (time.perf_counter() - started) * 1000
+            logger.info("Finished job %s in %.0fms", state.job.name, state.last_duration_ms)
+
+    async def run(self) -> None:
+        """Run jobs until cancelled."""
+        now = self._clock()
+        for state in self._states:
+            job = state.job
+            previous = job.previous_slot(now)
+            # The latest slot is caught up on startup when it is recent enough
+            catch_up = job.catch_up.total_seconds() > 0 and now - previous <= job.catch_up.total_seconds()
+            self._schedule(state, previous if catch_up else job.next_slot(now))
+            logger.info("Scheduled job %s; first slot %s", job.name, _utc(state.slot))
+
+        while True:
+            state = min(self._states, key=lambda s: s.due)
+            delay = state.due - self._clock()
+            if delay > 0:
+                await self._sleep(min(delay, MAX_SLEEP_SECONDS))
+                continue
+            self._fire(state, self._clock())
+
+    async def aclose(self, timeout: Optional[float] = None) -> None:
+        """Wait up to `timeout` for running jobs to finish, then cancel the rest."""
+        running = [s.task for s in self._states if s.task is not None and not s.task.done()]
+        if not running:
+            return
+        _, pending = await asyncio.wait(running, timeout=timeout)
+        for task in pending:
+            task.cancel()
+        if pending:
+            await asyncio.gather(*pending, return_exceptions=True)
+
+    def stats(self) -> Dict[str, Dict[str, Any]]:
+        return {
+            s.job.name: {
+                "runs": s.runs,
+                "failures": s.failures,
+                "skipped_overlap": s.skipped_overlap,
+                "missed": s.missed,
+                "running": s.task is not None and not s.task.done(),
+                "next_slot": _utc(s.slot).isoformat(),
+                "last_duration_ms": s.last_duration_ms,
+            }
+            for s in self._states
+        }
+
+
+def _utc(epoch_seconds: float) -> datetime:
+    return datetime.fromtimestamp(epoch_seconds, tz=timezone.utc)
@@ -0,0 +1,242 @@
+"""
+Columnar on-disk history of daily quotes, read through NumPy memmaps.
+
+Layout, one directory per trading date:
+
+    QUOTE_HISTORY_DIR/
+        symbols.npy             append-only symbol table; a ticker's id is its index
+        date=2024-05-01/
+            ticker_id.npy       int32 symbol ids
+            current_price.npy   float64, aligned with ticker_id.npy
+            open_price.npy
+            high_price.npy
+            low_price.npy
+            previous_close.npy
+            timestamp.npy       int64 quote timestamps (UNIX seconds)
+
+Each column is a plain `.npy` file, so readers open it with
+`np.load(mmap_mode="r")`: nothing is copied until a value is indexed, and
+the OS page cache keeps hot partitions in memory across reads. Storing
+integer ids instead of symbols turns each partition lookup into one
+integer scatter/gather, and opened partitions are cached per store
+instance, so a year of history for thousands of tickers is a few hundred
+`stat` calls plus fancy indexing rather than a Postgres scan.
+
+Writes replace a whole partition: columns are written to a temp directory
+that is then swapped in by rename, so readers never see a half-written
+day. Re-appending a date merges with what is already there (newest value
+wins per ticker). The store assumes a single writer, i.e. the dispatch run.
+"""
+
+from dataclasses import dataclass
+from datetime import date
+from typing import Any, Dict, Iterable, List, Optional, Tuple
+import logging
+import os
+import shutil
+import uuid
+
+import numpy as np
+
+from app.settings import settings
+
+logger = logging.getLogger(__name__)
+
+PRICE_COLUMNS = ("current_price", "open_price", "high_price", "low_price", "previous_close")
+TIMESTAMP_COLUMN = "timestamp"
+COLUMNS = PRICE_COLUMNS + (TIMESTAMP_COLUMN,)
+TICKER_DTYPE = "U16"
+SYMBOLS_FILE = "symbols.npy"
+PARTITION_PREFIX = "date="
+
+
+class _Partition:
+    """One day's files; columns are mapped on first use."""
+
+    def __init__(self, path: str):
+        self.path = path
+        ticker_ids = np.load(os.path.join(path, "ticker_id.npy"))
+        # Dense id -> row map (-1 = absent); the extra trailing slot answers "unknown ticker"
+        self.rows = np.full(int(ticker_ids.max(initial=-1)) + 2, -1, dtype=np.int64)
+        self.rows[ticker_ids] = np.arange(len(ticker_ids))
+        self._columns: Dict[str, np.ndarray] = {}
+
+    def column(self, name: str) -> np.ndarray:
+        column = self._columns.get(name)
+        if column is None:
+            # A plain ndarray view over the map skips np.memmap's per-index overhead
+            column = self._columns[name] = np.asarray(
+                np.load(os.path.join(self.path, f"{name}.npy"), mmap_mode="r")
+            )
+        return column
+
+
+@dataclass
+class QuoteHistory:
+    """Quote history for `tickers` x `dates` (rows x columns).
+
+    Prices are NaN and timestamps 0 where a ticker has no quote that day.
+    """
+    tickers: List[str]
+    dates: np.ndarray
+    columns: Dict[str, np.ndarray]
+
+    def __getitem__(self, column: str) -> np.ndarray:
+        return self.columns[column]
+
+
+class QuoteHistoryStore:
+    def __init__(self, root: Optional[str] = None):
+        self.root = root or settings.QUOTE_HISTORY_DIR
+        # partition path -> (directory inode, partition)
+        self._open: Dict[str, Tuple[int, _Partition]] = {}
+        self._symbols_inode: Optional[int] = None
+        self._symbol_ids: Dict[str, int] = {}
+
+    def _path(self, day: date) -> str:
+        return os.path.join(self.root, f"{PARTITION_PREFIX}{day.isoformat()}")
+
+    def _symbols(self) -> Dict[str, int]:
+        """Ticker -> id, reloaded only when the symbol table file changes."""
+        path = os.path.join(self.root, SYMBOLS_FILE)
+        try:
+            inode = os.stat(path).st_ino
+        except FileNotFoundError:
+            return {}
+        if inode != self._symbols_inode:
+            symbols = np.load(path).tolist()
+            self._symbol_ids = {ticker: i for i, ticker in enumerate(symbols)}
+            self._symbols_inode = inode
+        return self._symbol_ids
+
+    def _assign_ids(self, tickers: Iterable[str]) -> Dict[str, int]:
+        ids = dict(self._symbols())
+        new = [t for t in tickers if t not in ids]
+        if new:
+            for ticker in new:
+                ids[ticker] = len(ids)
+            tmp = os.path.join(self.root, f".tmp-{uuid.uuid4().hex}.npy")
+            np.save(tmp, np.array(list(ids), dtype=TICKER_DTYPE))
+            os.replace(tmp, os.path.join(self.root, SYMBOLS_FILE))
+        return ids
+
+    def dates(self) -> List[date]:
+        """Dates with a partition on disk, oldest first."""
+        if not os.path.isdir(self.root):
+            return []
+        return sorted(
+            date.fromisoformat(name[len(PARTITION_PREFIX):])
+            for name in os.listdir(self.root)
+            if name.startswith(PARTITION_PREFIX)
+        )
+
+    def _load(self, day: date) -> Optional[_Partition]:
+        path = self._path(day)
+        try:
+            inode = os.stat(path).st_ino
+        except FileNotFoundError:
+            return None
+        cached = self._open.get(path)
+        # A rewrite swaps in a new directory, so a changed inode means stale maps
+        if cached is not None and cached[0] == inode:
+            return cached[1]
+        partition = _Partition(path)
+        self._open[path] = (inode, partition)
+        return partition
+
+    def append(self, day: date, stock_data: Dict[str, Dict[str, Any]]) -> int:
+        """Write the quotes in `stock_data` ({ticker: {"quote": ...}}) as the partition for `day`.
+
+        Tickers without a quote are skipped. Returns the rows in the partition.
+        """
+        rows = {
+            ticker.upper(): data["quote"]
+            for ticker, data in stock_data.items()
+            if data.get("quote") is not None
+        }
+        if not rows:
+            return 0
+
+        os.makedirs(self.root, exist_ok=True)
+        ids = self._assign_ids(rows)
+
+        merged: Dict[int, Tuple[float, ...]] = {}
+        existing = self._load(day)
+        if existing is not None:
+            old_columns = [existing.column(name) for name in COLUMNS]
+            for ticker_id in np.flatnonzero(existing.rows >= 0).tolist():
+                row = existing.rows[ticker_id]
+                merged[ticker_id] = tuple(column[row].item() for column in old_columns)
+        for ticker, quote in rows.items():
+            merged[ids[ticker]] = tuple(getattr(quote, name) for name in COLUMNS)
+
+        values = list(merged.values())
+        columns = {
+            name: np.array([v[i] for v in values], dtype=np.int64 if name == TIMESTAMP_COLUMN else np.float64)
+            for i, name in enumerate(COLUMNS)
+        }
+
+        final = self._path(day)
+        tmp = os.path.join(self.root, f".tmp-{uuid.uuid4().hex}")
+        os.makedirs(tmp)
+        try:
+            np.save(os.path.join(tmp, "ticker_id.npy"), np.array(list(merged), dtype=np.int32))
+            for name, column in columns.items():
+                np.save(os.path.join(tmp, f"{name}.npy"), column)
+            if os.path.exists(final):
+                # Readers holding the old maps keep working; the files go once they close
+                stale = os.path.join(self.root, f".stale-{uuid.uuid4().hex}")
+                os.rename(final, stale)
+                os.rename(tmp, final)
+                shutil.rmtree(stale, ignore_errors=True)
+            else:
+                os.rename(tmp, final)
+        except Exception:
+            shutil.rmtree(tmp, ignore_errors=True)
+            raise
+        self._open.pop(final, None)
+        logger.info("Wrote quote history partition %s (%s tickers)", day, len(merged))
+        return len(merged)
+
+    def read(
+        self,
+        tickers: Iterable[str],
+        start: Optional[date] = None,
+        end: Optional[date] = None,
+        columns: Iterable[str] = COLUMNS,
+    ) -> QuoteHistory:
+        """History for `tickers` between `start` and `end` (inclusive), one column per date."""
+        tickers = [t.upper() for t in tickers]
+        columns = list(columns)
+        days = [d for d in self.dates() if (start is None or d >= start) and (end is None or d <= end)]
+        symbol_ids = self._symbols()
+        # Unknown tickers get id -1, which indexes each partition's "unknown" slot
+        wanted = np.array([symbol_ids.get(t, -1) for t in tickers], dtype=np.int64)
+        # Filled date-major so each partition writes one contiguous row
+        out = {
+            name: (
+                np.zeros((len(days), len(tickers)), dtype=np.int64)
+                if name == TIMESTAMP_COLUMN
+                else np.full((len(days), len(tickers)), np.nan)
+            )
+            for name in columns
+        }
+        for j, day in enumerate(days):
+            partition = self._load(day)
+            if partition is None or not len(wanted):
+                continue
+            id_rows = partition.rows
+            # Ids added after this partition was written are past the end of its map
+            rows = np.where(wanted < len(id_rows) - 1, id_rows[np.minimum(wanted, len(id_rows) - 1)], -1)
+            found = rows >= 0
+            if found.all():
+                for name in columns:
+                    np.take(partition.column(name), rows, out=out[name][j])
+            else:
+                for name in columns:
+                    out[name][j, found] = partition.column(name)[rows[found]]
+        return QuoteHistory(
+            tickers=tickers,
+            dates=np.array(days, dtype="datetime64[D]"),
+            columns={name: values.T for name, values in out.items()},
+        )
@@ -0,0 +1,80 @@
+"""
+In-process caches that let `get_current_user` skip the DB.
+
+- users: `UserOutput` by user id, bounded LRU with a short TTL.
+- tokens: user id by SHA-256 of a verified JWT, kept until the token's
+  `exp`, so repeat requests skip signature verification too.
+
+Entries for a user are dropped whenever the User row is updated or deleted
+through the ORM in this process (mapper events). Other worker processes
+only see such changes once the TTL expires, so keep it short.
+"""
+
+from typing import Callable, Optional
+import hashlib
+import logging
+import time
+
+from sqlalchemy import event
+
+from app.db.models.user import User
+from app.db.schemas.user_schema import UserOutput
+from app.settings import settings
+from app.util.ttl_cache import MemoryCacheBackend
+
+logger = logging.getLogger(__name__)
+
+
+class AuthCache:
+    def __init__(self, user_ttl_seconds: float, max_entries: int, clock: Callable[[], float] = time.time):
+        self._user_ttl = user_ttl_seconds
+        self._clock = clock
+        self._users = MemoryCacheBackend(max_entries, clock=clock)
+        self._tokens = MemoryCacheBackend(max_entries, clock=clock)
+        self.hits = 0
+        self.misses = 0
+
+    @classmethod
+    def from_settings(cls) -> "AuthCache":
+        return cls(settings.AUTH_USER_CACHE_TTL_SECONDS, settings.AUTH_CACHE_MAX_ENTRIES)
+
+    @staticmethod
+    def _token_key(token: str) -> str:
+        # Never keep raw bearer tokens in memory longer than the request
+        return hashlib.sha256(token.encode("utf-8")).hexdigest()
+
+    def get_token_user_id(self, token: str) -> Optional[int]:
+        return self._tokens.get(self._token_key(token))
+
+    def remember_token(self, token: str, user_id: int, exp: float) -> None:
+        if exp > self._clock():
+            self._tokens.set(self._token_key(token), user_id, expires_at=exp)
+
+    def get_user(self, user_id: int) -> Optional[UserOutput]:
+        user = self._users.get(str(user_id))
+        if user is None:
+            self.misses += 1
+        else:
+            self.hits += 1
+        return user
+
+    def set_user(self, user: UserOutput) -> None:
+        if self._user_ttl > 0:
+            self._users.set(str(user.id), user, expires_at=self._clock() + self._user_ttl)
+
+    def invalidate_user(self, user_id: int) -> None:
+        self._users.delete(str(user_id))
+        logger.debug("Invalidated cached user_id=%s", user_id)
+
+    def clear(self) -> None:
+        self._users.clear()
+        self._tokens.clear()
+
+
+auth_cache = AuthCache.from_settings()
+
+
+@event.listens_for(User, "after_update")
+@event.listens_for(User, "after_delete")
+def _invalidate_on_change(mapper, connection, target: User) -> None:
+    auth_cache.invalidate_user(target.id)
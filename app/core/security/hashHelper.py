@@ -4,14 +4,57 @@ Simple wrapper around bcrypt for hashing and verifying passwords.
 Keeping this logic in a helper centralizes hashing algorithm choices and
 makes it easy to replace or tweak the hashing policy (e.g. increasing
 work factor) in one place.
+
+The async variants used by request handlers run bcrypt on a dedicated
+thread pool (bcrypt releases the GIL while hashing), so a login burst no
+longer stalls the event loop. At most BCRYPT_WORKERS hashes run at once
+and at most BCRYPT_MAX_QUEUE may be outstanding; beyond that the call
+fails fast with `HashQueueFull` instead of queueing without bound.
 """
 
 from bcrypt import checkpw, gensalt, hashpw
+from concurrent.futures import ThreadPoolExecutor
+from typing import Optional
+import asyncio
 import logging
+import threading
+
+from app.settings import settings
 
 logger = logging.getLogger(__name__)
 
 
+class HashQueueFull(Exception):
+    """Raised when too many bcrypt operations are already outstanding."""
+
+
+class _BoundedHashExecutor:
+    def __init__(self, max_workers: int, max_queue: int):
+        self.max_workers = max_workers
+        self.max_queue = max_queue
+        self._executor: Optional[ThreadPoolExecutor] = None
+        self._lock = threading.Lock()
+        self.outstanding = 0
+        self.rejected = 0
+
+    async def run(self, func, *args):
+        with self._lock:
+            if self.outstanding >= self.max_queue:
+                self.rejected += 1
+                raise HashQueueFull(f"{self.outstanding} password hash operations already pending")
+            self.outstanding += 1
+            if self._executor is None:
+                self._executor = ThreadPoolExecutor(max_workers=self.max_workers, thread_name_prefix="bcrypt")
+        try:
+            return await asyncio.get_running_loop().run_in_executor(self._executor, func, *args)
+        finally:
+            with self._lock:
+                self.outstanding -= 1
+
+
+_hash_executor = _BoundedHashExecutor(settings.BCRYPT_WORKERS, settings.BCRYPT_MAX_QUEUE)
+
+
 class HashHelper(object):
     """Helpers for password hashing and verification.
 
@@ -32,4 +75,14 @@ class HashHelper(object):
         # checkpw expects both args as bytes
         ok = checkpw(plain_password.encode('utf-8'), hashed_password.encode('utf-8'))
         logger.debug("Password verification result: %s", ok)
-        return ok
\ No newline at end of file
+        return ok
+
+    @staticmethod
+    async def get_password_hash_async(password: str) -> str:
+        """`get_password_hash` on the bcrypt pool. Raises HashQueueFull when saturated."""
+        return await _hash_executor.run(HashHelper.get_password_hash, password)
+
+    @staticmethod
+    async def verify_password_async(plain_password: str, hashed_password: str) -> bool:
+        """`verify_password` on the bcrypt pool. Raises HashQueueFull when saturated."""
+        return await _hash_executor.run(HashHelper.verify_password, plain_password, hashed_password)
@@ -0,0 +1,30 @@
+"""
+SQLAlchemy model for stored company profiles.
+
+Profiles (/stock/profile2) almost never change, so the dispatch keeps one
+row per ticker and only goes back to Finnhub once `fetched_at` is older
+than the refresh age (see EmailService and COMPANY_PROFILE_MAX_AGE_DAYS).
+"""
+
+from app.core.database import Base
+from app.util.timestamps import utcnow
+from sqlalchemy import Column, DateTime, Float, String
+
+
+class CompanyProfile(Base):
+    __tablename__ = "company_profiles"
+
+    ticker = Column(String(10), primary_key=True)
+    name = Column(String(200), nullable=False)
+    country = Column(String(50), nullable=False)
+    currency = Column(String(10), nullable=False)
+    exchange = Column(String(100), nullable=False)
+    industry = Column(String(100))
+    ipo = Column(String(20))
+    logo = Column(String(500))
+    market_capitalization = Column(Float)
+    phone = Column(String(50))
+    share_outstanding = Column(Float)
+    weburl = Column(String(500))
+    # Naive UTC time of the last successful fetch from Finnhub
+    fetched_at = Column(DateTime, default=utcnow, nullable=False, index=True)
@@ -0,0 +1,35 @@
+"""
+SQLAlchemy models that make the daily dispatch resumable.
+
+- DispatchLedgerEntry: one row per (run_date, user_id) holding the send
+  status and SES Message ID, so a re-run skips users already emailed.
+- DispatchCheckpoint: the ticker snapshot fetched for a run_date, so a
+  resumed run does not hit Finnhub again for tickers it already has.
+"""
+
+from app.core.database import Base
+from app.util.timestamps import utcnow
+from sqlalchemy import Column, Date, DateTime, ForeignKey, Integer, String, Text, UniqueConstraint
+
+
+class DispatchLedgerEntry(Base):
+    __tablename__ = "dispatch_ledger"
+    __table_args__ = (UniqueConstraint("run_date", "user_id", name="uq_dispatch_ledger_run_user"),)
+
+    id = Column(Integer, primary_key=True, index=True)
+    run_date = Column(Date, index=True, nullable=False)
+    user_id = Column(Integer, ForeignKey("users.id"), nullable=False)
+    # "sent" or "failed"; only "sent" rows are skipped on resume
+    status = Column(String(16), nullable=False)
+    message_id = Column(String(128), nullable=True)
+    error = Column(Text, nullable=True)
+    updated_at = Column(DateTime, default=utcnow, onupdate=utcnow)
+
+
+class DispatchCheckpoint(Base):
+    __tablename__ = "dispatch_checkpoints"
+
+    run_date = Column(Date, primary_key=True)
+    # JSON: {ticker: {"quote": {...} | null, "profile": {...} | null}}
+    payload = Column(Text, nullable=False)
+    updated_at = Column(DateTime, default=utcnow, onupdate=utcnow)
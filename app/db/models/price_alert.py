@@ -0,0 +1,32 @@
+"""
+SQLAlchemy model for per-subscription price alerts.
+
+An alert fires once: "above"/"below" when the current price crosses
+`threshold`, "move_pct" when the day's move from the previous close is at
+least `threshold` percent either way. Firing records the trigger time and
+price and deactivates the alert until the user creates a new one.
+"""
+
+from app.core.database import Base
+from app.util.timestamps import utcnow
+from sqlalchemy import Boolean, Column, DateTime, Float, ForeignKey, Integer, String
+
+ABOVE = "above"
+BELOW = "below"
+MOVE_PCT = "move_pct"
+ALERT_KINDS = (ABOVE, BELOW, MOVE_PCT)
+
+
+class PriceAlert(Base):
+    __tablename__ = "price_alerts"
+
+    id = Column(Integer, primary_key=True)
+    # Alerts go away with their subscription
+    subscription_id = Column(Integer, ForeignKey("subscriptions.id", ondelete="CASCADE"), nullable=False, index=True)
+    kind = Column(String(16), nullable=False)
+    threshold = Column(Float, nullable=False)
+    active = Column(Boolean, nullable=False, default=True, index=True)
+    triggered_at = Column(DateTime)
+    triggered_price = Column(Float)
+    created_at = Column(DateTime, default=utcnow)
+    updated_at = Column(DateTime, default=utcnow, onupdate=utcnow)
@@ -1,15 +1,20 @@
 from app.core.database import Base
-from sqlalchemy import Column, DateTime, ForeignKey, Integer, String
+from app.util.timestamps import utcnow
+from sqlalchemy import Column, DateTime, ForeignKey, Index, Integer, String
 from sqlalchemy.orm import relationship
-from datetime import datetime, timezone
+
 
 class Subscription(Base):
     __tablename__ = "subscriptions"
+    # One row per (user, ticker); also the conflict target of the subscribe upsert
+    __table_args__ = (
+        Index("uq_subscriptions_user_ticker", "user_id", "ticker", unique=True),
+    )
 
     id = Column(Integer, primary_key=True, index=True)
     user_id = Column(Integer, ForeignKey("users.id"), index=True)
     ticker = Column(String(10), index=True)
-    created_at = Column(DateTime, default=datetime.now(timezone.utc))
-    updated_at = Column(DateTime, default=datetime.now(timezone.utc), onupdate=datetime.now(timezone.utc))
+    created_at = Column(DateTime, default=utcnow)
+    updated_at = Column(DateTime, default=utcnow, onupdate=utcnow)
 
     user = relationship("User", back_populates="subscriptions")
\ No newline at end of file
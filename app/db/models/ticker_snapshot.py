@@ -0,0 +1,39 @@
+"""
+SQLAlchemy model for persisted ticker snapshots.
+
+Every dispatch run appends one row per fetched ticker (quote + profile
+fields, flattened). The (ticker, as_of) index serves "latest snapshot for
+these tickers" lookups without going back to Finnhub.
+"""
+
+from app.core.database import Base
+from sqlalchemy import BigInteger, Column, DateTime, Float, Index, String
+
+
+class TickerSnapshot(Base):
+    __tablename__ = "ticker_snapshots"
+    __table_args__ = (
+        Index("ix_ticker_snapshots_ticker_as_of", "ticker", "as_of"),
+    )
+
+    id = Column(BigInteger, primary_key=True)
+    ticker = Column(String(10), nullable=False)
+    # Naive UTC time the run fetched this data
+    as_of = Column(DateTime, nullable=False)
+
+    # Quote (/quote)
+    current_price = Column(Float)
+    high_price = Column(Float)
+    low_price = Column(Float)
+    open_price = Column(Float)
+    previous_close = Column(Float)
+    quote_timestamp = Column(BigInteger)
+
+    # Company profile (/stock/profile2)
+    name = Column(String(200))
+    exchange = Column(String(100))
+    currency = Column(String(10))
+    country = Column(String(50))
+    industry = Column(String(100))
+    market_capitalization = Column(Float)
+    share_outstanding = Column(Float)
@@ -8,9 +8,9 @@ the database column name remains explicit and descriptive.
 """
 
 from app.core.database import Base
+from app.util.timestamps import utcnow
 from sqlalchemy import Column, Integer, String, DateTime
 from sqlalchemy.orm import relationship
-from datetime import datetime, timezone
 
 
 class User(Base):
@@ -25,7 +25,8 @@ class User(Base):
     # This stores the bcrypt hash produced by HashHelper.get_password_hash.
     password = Column('hashed_password', String(250))
 
-    created_at = Column(DateTime, default=datetime.now(timezone.utc))
+    # Passed as a callable so each row gets its own timestamp.
+    created_at = Column(DateTime, default=utcnow)
 
     # Relationship to other models (example: Subscription)
     subscriptions = relationship("Subscription", back_populates="user")
\ No newline at end of file
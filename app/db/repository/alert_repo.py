@@ -0,0 +1,146 @@
+"""
+Repositories for the `price_alerts` table.
+
+`AlertRepository` (sync) serves the dispatch-side evaluator: it loads the
+active alerts as plain tuples, reports a cheap version so the evaluator
+knows when to rebuild its arrays, and marks fired alerts in one statement,
+all on connections of its own (the caller's session is never committed).
+`AsyncAlertRepository` backs the `/alerts` API.
+"""
+
+from datetime import datetime
+from typing import List, NamedTuple, Optional, Sequence, Tuple
+import logging
+
+from sqlalchemy import bindparam, delete, func, select, update
+
+from app.db.models.price_alert import PriceAlert
+from app.db.models.subscription import Subscription
+from app.db.models.user import User
+from app.db.repository.base import AsyncBaseRepository, BaseRepository
+
+logger = logging.getLogger(__name__)
+
+
+class AlertNotification(NamedTuple):
+    """A triggered alert joined with who to tell."""
+    alert_id: int
+    user_id: int
+    email: str
+    first_name: Optional[str]
+    ticker: str
+    kind: str
+    threshold: float
+
+
+class AlertRepository(BaseRepository):
+    """Alert queries for the evaluator.
+
+    Like DispatchRepository's ledger writes, every statement runs on its own
+    short-lived connection from the session's engine rather than through the
+    session, so evaluating alerts mid-dispatch never commits or expires the
+    caller's work, and each read sees the latest committed alerts.
+    """
+
+    def _fetch_all(self, stmt) -> list:
+        with self.session.get_bind().connect() as conn:
+            return conn.execute(stmt).all()
+
+    def active_alerts(self) -> List[Tuple[int, str, str, float]]:
+        """(alert_id, ticker, kind, threshold) for every active alert."""
+        rows = self._fetch_all(
+            select(PriceAlert.id, Subscription.ticker, PriceAlert.kind, PriceAlert.threshold)
+            .join(Subscription, Subscription.id == PriceAlert.subscription_id)
+            .where(PriceAlert.active.is_(True))
+        )
+        return [tuple(row) for row in rows]
+
+    def alerts_version(self) -> Tuple[int, Optional[datetime]]:
+        """(active count, max updated_at) of active alerts, in one query.
+
+        Creating, deleting or triggering an alert changes one of the two.
+        """
+        [(count, last_updated)] = self._fetch_all(
+            select(func.count(PriceAlert.id), func.max(PriceAlert.updated_at))
+            .where(PriceAlert.active.is_(True))
+        )
+        return count, last_updated
+
+    def notifications(self, alert_ids: Sequence[int]) -> List[AlertNotification]:
+        """Recipient details for the still-active alerts among `alert_ids`."""
+        if not alert_ids:
+            return []
+        rows = self._fetch_all(
+            select(
+                PriceAlert.id,
+                User.id,
+                User.email,
+                User.first_name,
+                Subscription.ticker,
+                PriceAlert.kind,
+                PriceAlert.threshold,
+            )
+            .join(Subscription, Subscription.id == PriceAlert.subscription_id)
+            .join(User, User.id == Subscription.user_id)
+            .where(PriceAlert.id.in_(list(alert_ids)), PriceAlert.active.is_(True))
+            .order_by(User.id, Subscription.ticker)
+        )
+        return [AlertNotification(*row) for row in rows]
+
+    def mark_triggered(self, triggered: Sequence[Tuple[int, float]], triggered_at: datetime) -> int:
+        """Deactivate each (alert_id, price), recording when and at what price it fired."""
+        if not triggered:
+            return 0
+        stmt = (
+            update(PriceAlert.__table__)
+            .where(PriceAlert.__table__.c.id == bindparam("alert_id"))
+            .values(
+                active=False,
+                triggered_at=triggered_at,
+                triggered_price=bindparam("price"),
+                updated_at=triggered_at,
+            )
+        )
+        # One executemany round trip for the whole batch, in its own transaction
+        with self.session.get_bind().begin() as conn:
+            conn.execute(stmt, [{"alert_id": alert_id, "price": price} for alert_id, price in triggered])
+        logger.info("Marked %s price alerts as triggered", len(triggered))
+        return len(triggered)
+
+
+class AsyncAlertRepository(AsyncBaseRepository):
+    async def subscription_id_for(self, user_id: int, ticker: str) -> Optional[int]:
+        result = await self.session.execute(
+            select(Subscription.id).filter_by(user_id=user_id, ticker=ticker.upper()).limit(1)
+        )
+        return result.scalar()
+
+    async def create(self, subscription_id: int, kind: str, threshold: float) -> PriceAlert:
+        alert = PriceAlert(subscription_id=subscription_id, kind=kind, threshold=threshold)
+        self.session.add(alert)
+        await self.session.commit()
+        await self.session.refresh(alert)
+        logger.info("Created price alert id=%s subscription_id=%s %s %s", alert.id, subscription_id, kind, threshold)
+        return alert
+
+    async def list_by_user(self, user_id: int) -> List[Tuple[PriceAlert, str]]:
+        """The user's alerts (active and triggered) with their ticker, by id."""
+        result = await self.session.execute(
+            select(PriceAlert, Subscription.ticker)
+            .join(Subscription, Subscription.id == PriceAlert.subscription_id)
+            .where(Subscription.user_id == user_id)
+            .order_by(PriceAlert.id)
+        )
+        return [(alert, ticker) for alert, ticker in result.all()]
+
+    async def delete_for_user(self, user_id: int, alert_id: int) -> int:
+        """Delete one of the user's alerts and return number deleted."""
+        owned = select(Subscription.id).where(Subscription.user_id == user_id)
+        result = await self.session.execute(
+            delete(PriceAlert)
+            .where(PriceAlert.id == alert_id, PriceAlert.subscription_id.in_(owned))
+            .execution_options(synchronize_session=False)
+        )
+        await self.session.commit()
+        logger.info("Deleted %s price alerts id=%s for user_id=%s", result.rowcount, alert_id, user_id)
+        return result.rowcount
@@ -4,12 +4,22 @@ Base repository class that concrete repositories inherit from.
 It simply stores the SQLAlchemy `Session` instance so repository
 methods can run queries and commits. Keeping repositories thin helps
 unit testing and separates DB concerns from business logic.
+
+`AsyncBaseRepository` is the same idea for an `AsyncSession`; the API uses
+the async repositories while batch code keeps the sync ones.
 """
 
+from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import Session
 
 
 class BaseRepository:
     def __init__(self, session: Session) -> None:
         # session: a SQLAlchemy session provided by FastAPI dependency
-        self.session = session
\ No newline at end of file
+        self.session = session
+
+
+class AsyncBaseRepository:
+    def __init__(self, session: AsyncSession) -> None:
+        # session: an AsyncSession provided by the get_async_db dependency
+        self.session = session
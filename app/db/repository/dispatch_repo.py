@@ -0,0 +1,91 @@
+"""
+Repository for the dispatch ledger and per-run ticker checkpoints.
+
+Writes are upserts (INSERT ... ON CONFLICT DO UPDATE) executed on their
+own short transaction rather than through `session.commit()`, so
+recording results mid-run never commits or expires the caller's session.
+"""
+
+from datetime import date
+from typing import Any, Dict, Iterable, Optional, Set, Tuple
+import json
+import logging
+
+from sqlalchemy.dialects.postgresql import insert
+
+from app.db.models.dispatch_ledger import DispatchCheckpoint, DispatchLedgerEntry
+from app.util.timestamps import utcnow
+from app.db.repository.base import BaseRepository
+
+logger = logging.getLogger(__name__)
+
+SENT = "sent"
+FAILED = "failed"
+
+# (user_id, status, message_id, error)
+LedgerRow = Tuple[int, str, Optional[str], Optional[str]]
+
+
+class DispatchRepository(BaseRepository):
+    def _execute_in_own_transaction(self, stmt) -> None:
+        with self.session.get_bind().begin() as conn:
+            conn.execute(stmt)
+
+    def completed_user_ids(self, run_date: date) -> Set[int]:
+        """Ids of users already sent their email for `run_date`."""
+        rows = (
+            self.session.query(DispatchLedgerEntry.user_id)
+            .filter_by(run_date=run_date, status=SENT)
+            .all()
+        )
+        return {user_id for (user_id,) in rows}
+
+    def record_results(self, run_date: date, rows: Iterable[LedgerRow]) -> int:
+        """Upsert a batch of send results for `run_date` in one statement.
+
+        Returns the number of rows written.
+        """
+        now = utcnow()
+        values = [
+            {"run_date": run_date, "user_id": user_id, "status": status,
+             "message_id": message_id, "error": error, "updated_at": now}
+            for user_id, status, message_id, error in rows
+        ]
+        if not values:
+            return 0
+        stmt = insert(DispatchLedgerEntry).values(values)
+        stmt = stmt.on_conflict_do_update(
+            constraint="uq_dispatch_ledger_run_user",
+            set_={
+                "status": stmt.excluded.status,
+                "message_id": stmt.excluded.message_id,
+                "error": stmt.excluded.error,
+                "updated_at": stmt.excluded.updated_at,
+            },
+        )
+        self._execute_in_own_transaction(stmt)
+        logger.debug("Recorded %s ledger rows for %s", len(values), run_date)
+        return len(values)
+
+    def load_checkpoint(self, run_date: date) -> Optional[Dict[str, Any]]:
+        """Return the ticker snapshot saved for `run_date`, if any."""
+        payload = (
+            self.session.query(DispatchCheckpoint.payload)
+            .filter_by(run_date=run_date)
+            .scalar()
+        )
+        return json.loads(payload) if payload is not None else None
+
+    def save_checkpoint(self, run_date: date, snapshot: Dict[str, Any]) -> None:
+        """Create or replace the ticker snapshot for `run_date`."""
+        stmt = insert(DispatchCheckpoint).values(
+            run_date=run_date,
+            payload=json.dumps(snapshot),
+            updated_at=utcnow(),
+        )
+        stmt = stmt.on_conflict_do_update(
+            index_elements=[DispatchCheckpoint.run_date],
+            set_={"payload": stmt.excluded.payload, "updated_at": stmt.excluded.updated_at},
+        )
+        self._execute_in_own_transaction(stmt)
+        logger.info("Saved ticker checkpoint for %s (%s tickers)", run_date, len(snapshot))
@@ -0,0 +1,89 @@
+"""
+Repository for the `company_profiles` table.
+
+`load` reads the stored profile and its `fetched_at` for a set of tickers
+in one query; `upsert_many` writes a run's refreshed profiles in one
+INSERT ... ON CONFLICT DO UPDATE statement.
+"""
+
+from datetime import datetime
+from typing import Dict, Iterable, List, NamedTuple
+import logging
+
+from sqlalchemy.dialects.postgresql import insert
+
+from app.core.integrations.finnhub_schema import CompanyProfileOutput
+from app.db.models.company_profile import CompanyProfile
+from app.db.repository.base import BaseRepository
+
+logger = logging.getLogger(__name__)
+
+
+class StoredProfile(NamedTuple):
+    profile: CompanyProfileOutput
+    fetched_at: datetime
+
+
+def _to_output(row: CompanyProfile) -> CompanyProfileOutput:
+    return CompanyProfileOutput(
+        country=row.country,
+        currency=row.currency,
+        exchange=row.exchange,
+        finnhubIndustry=row.industry,
+        ipo=row.ipo,
+        logo=row.logo,
+        marketCapitalization=row.market_capitalization,
+        name=row.name,
+        phone=row.phone,
+        shareOutstanding=row.share_outstanding,
+        ticker=row.ticker,
+        weburl=row.weburl,
+    )
+
+
+class CompanyProfileRepository(BaseRepository):
+    def load(self, tickers: Iterable[str]) -> Dict[str, StoredProfile]:
+        """Stored profiles keyed by the tickers as passed (tickers never fetched are absent)."""
+        tickers: List[str] = list(tickers)
+        if not tickers:
+            return {}
+        rows = (
+            self.session.query(CompanyProfile)
+            .filter(CompanyProfile.ticker.in_({t.upper() for t in tickers}))
+            .all()
+        )
+        by_ticker = {row.ticker: StoredProfile(_to_output(row), row.fetched_at) for row in rows}
+        return {t: by_ticker[t.upper()] for t in tickers if t.upper() in by_ticker}
+
+    def upsert_many(self, profiles: Dict[str, CompanyProfileOutput], fetched_at: datetime) -> int:
+        """Create or replace one row per ticker, stamped with `fetched_at`."""
+        # Keyed by symbol so "aapl" and "AAPL" cannot both hit the same row in one statement
+        values = list({
+            ticker.upper(): {
+                "ticker": ticker.upper(),
+                "name": p.name,
+                "country": p.country,
+                "currency": p.currency,
+                "exchange": p.exchange,
+                "industry": p.finnhubIndustry,
+                "ipo": p.ipo,
+                "logo": p.logo,
+                "market_capitalization": p.marketCapitalization,
+                "phone": p.phone,
+                "share_outstanding": p.shareOutstanding,
+                "weburl": p.weburl,
+                "fetched_at": fetched_at,
+            }
+            for ticker, p in profiles.items()
+        }.values())
+        if not values:
+            return 0
+        stmt = insert(CompanyProfile).values(values)
+        stmt = stmt.on_conflict_do_update(
+            index_elements=[CompanyProfile.ticker],
+            set_={column: stmt.excluded[column] for column in values[0] if column != "ticker"},
+        )
+        self.session.execute(stmt)
+        self.session.commit()
+        logger.info("Stored %s company profiles", len(values))
+        return len(values)
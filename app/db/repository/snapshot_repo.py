@@ -0,0 +1,77 @@
+"""
+Repository for the `ticker_snapshots` table.
+
+`bulk_insert` writes a whole run in one executemany (psycopg2's
+execute_values batching under SQLAlchemy 1.4) rather than per-row ORM
+adds; `latest_for` reads the newest row per ticker with one
+DISTINCT ON query over the (ticker, as_of) index.
+"""
+
+from datetime import datetime
+from typing import Any, Dict, Iterable, List
+import logging
+
+from sqlalchemy import insert
+
+from app.db.models.ticker_snapshot import TickerSnapshot
+from app.db.repository.base import BaseRepository
+
+logger = logging.getLogger(__name__)
+
+
+def snapshot_row(ticker: str, as_of: datetime, data: Dict[str, Any]) -> Dict[str, Any]:
+    """Flatten one ticker's {"quote": StockQuoteOutput, "profile": CompanyProfileOutput} into a row."""
+    quote, profile = data.get("quote"), data.get("profile")
+    row: Dict[str, Any] = {"ticker": ticker, "as_of": as_of}
+    if quote is not None:
+        row.update(
+            current_price=quote.current_price,
+            high_price=quote.high_price,
+            low_price=quote.low_price,
+            open_price=quote.open_price,
+            previous_close=quote.previous_close,
+            quote_timestamp=quote.timestamp,
+        )
+    if profile is not None:
+        row.update(
+            name=profile.name,
+            exchange=profile.exchange,
+            currency=profile.currency,
+            country=profile.country,
+            industry=profile.finnhubIndustry,
+            market_capitalization=profile.marketCapitalization,
+            share_outstanding=profile.shareOutstanding,
+        )
+    return row
+
+
+class TickerSnapshotRepository(BaseRepository):
+    # Every row must carry the same keys for one executemany
+    _COLUMNS = [c.name for c in TickerSnapshot.__table__.columns if c.name != "id"]
+
+    def bulk_insert(self, as_of: datetime, stock_data: Dict[str, Dict[str, Any]]) -> int:
+        """Insert one snapshot row per ticker in a single batched statement."""
+        rows = [
+            {column: row.get(column) for column in self._COLUMNS}
+            for row in (snapshot_row(ticker, as_of, data) for ticker, data in stock_data.items())
+        ]
+        if not rows:
+            return 0
+        self.session.execute(insert(TickerSnapshot), rows)
+        self.session.commit()
+        logger.info("Inserted %s ticker snapshots as of %s", len(rows), as_of)
+        return len(rows)
+
+    def latest_for(self, tickers: Iterable[str]) -> Dict[str, TickerSnapshot]:
+        """Newest snapshot per ticker (tickers never snapshotted are absent)."""
+        tickers: List[str] = [t.upper() for t in tickers]
+        if not tickers:
+            return {}
+        rows = (
+            self.session.query(TickerSnapshot)
+            .filter(TickerSnapshot.ticker.in_(tickers))
+            .distinct(TickerSnapshot.ticker)
+            .order_by(TickerSnapshot.ticker, TickerSnapshot.as_of.desc())
+            .all()
+        )
+        return {row.ticker: row for row in rows}
@@ -1,14 +1,25 @@
 from sqlalchemy.orm import Session
-from app.db.repository.base import BaseRepository
+from app.db.repository.base import AsyncBaseRepository, BaseRepository
 from app.db.models.subscription import Subscription
+from app.db.models.user import User
 from app.db.schemas.subscription_schema import SubscriptionAdd
-from typing import List
-from sqlalchemy import distinct
+from datetime import datetime
+from typing import Collection, Iterator, List, NamedTuple, Optional, Tuple
+from sqlalchemy import delete, distinct, func, select
+from sqlalchemy.dialects.postgresql import insert
 import logging
 
 logger = logging.getLogger(__name__)
 
 
+class DispatchRecipient(NamedTuple):
+	"""One user to email, with the tickers they subscribe to (sorted)."""
+	user_id: int
+	email: str
+	first_name: Optional[str]
+	tickers: Tuple[str, ...]
+
+
 class SubscriptionRepository(BaseRepository):
 	"""Repository for subscription-related DB operations.
 
@@ -64,11 +75,159 @@ class SubscriptionRepository(BaseRepository):
 		)
 		return bool(exists)
 
-	def get_all_unique_tickers(self) -> List[str]:
-		"""Return a list of all unique ticker symbols subscribed to."""
-		tickers = (
-			self.session.query(distinct(Subscription.ticker))
-			.all()
-		)
+	def get_all_unique_tickers(self, user_ids: Optional[Collection[int]] = None) -> List[str]:
+		"""Return a sorted list of all unique ticker symbols subscribed to
+		(by the given users only, when `user_ids` is set)."""
+		query = self.session.query(distinct(Subscription.ticker))
+		if user_ids is not None:
+			query = query.filter(Subscription.user_id.in_(list(user_ids)))
+		tickers = query.order_by(Subscription.ticker).all()
 		# Flatten the list of single-item tuples: [('AAPL',), ('GOOG',)] -> ['AAPL', 'GOOG']
-		return [t[0] for t in tickers]
\ No newline at end of file
+		return [t[0] for t in tickers]
+
+	def iter_dispatch_recipients(
+		self, chunk_size: int = 500, user_ids: Optional[Collection[int]] = None
+	) -> Iterator[DispatchRecipient]:
+		"""Stream one DispatchRecipient per subscribed user, by ascending user id
+		(only the given users, when `user_ids` is set).
+
+		Each chunk is one grouped query (`array_agg` of the user's tickers)
+		paginated by keyset on users.id, so peak memory is bounded by
+		`chunk_size` and sending can start with the first chunk. Only columns
+		are selected, so no ORM objects are hydrated or tracked in the
+		session's identity map.
+		"""
+		base = (
+			self.session.query(
+				User.id,
+				User.email,
+				User.first_name,
+				func.array_agg(distinct(Subscription.ticker)),
+			)
+			.join(Subscription, Subscription.user_id == User.id)
+		)
+		if user_ids is not None:
+			base = base.filter(User.id.in_(list(user_ids)))
+		last_id = 0
+		while True:
+			rows = (
+				base.filter(User.id > last_id)
+				.group_by(User.id)
+				.order_by(User.id)
+				.limit(chunk_size)
+				.all()
+			)
+			for user_id, email, first_name, tickers in rows:
+				yield DispatchRecipient(user_id, email, first_name, tuple(sorted(tickers)))
+			if len(rows) < chunk_size:
+				return
+			last_id = rows[-1][0]
+
+
+class AsyncSubscriptionRepository(AsyncBaseRepository):
+	"""AsyncSession counterpart of SubscriptionRepository used by the API."""
+
+	async def create_subscription(self, ticker: str, user_id: int) -> Subscription:
+		"""Create and return a new Subscription."""
+		sub = Subscription(ticker=ticker.upper(), user_id=user_id)
+		self.session.add(sub)
+		await self.session.commit()
+		await self.session.refresh(sub)
+		logger.info("Created subscription id=%s user_id=%s ticker=%s", sub.id, user_id, sub.ticker)
+		return sub
+
+	async def insert_if_absent(self, ticker: str, user_id: int) -> Subscription | None:
+		"""Create a subscription unless the user already has one for `ticker`.
+
+		A single `INSERT ... ON CONFLICT (user_id, ticker) DO NOTHING RETURNING`
+		statement, so concurrent requests cannot create duplicates. Returns the
+		new Subscription, or None if it already existed.
+		"""
+		stmt = (
+			insert(Subscription)
+			.values(ticker=ticker.upper(), user_id=user_id)
+			.on_conflict_do_nothing(index_elements=[Subscription.user_id, Subscription.ticker])
+			.returning(Subscription)
+		)
+		result = await self.session.execute(select(Subscription).from_statement(stmt))
+		sub = result.scalars().first()
+		await self.session.commit()
+		if sub is not None:
+			logger.info("Created subscription id=%s user_id=%s ticker=%s", sub.id, user_id, sub.ticker)
+		return sub
+
+	async def insert_many_if_absent(self, tickers: List[str], user_id: int) -> List[Subscription]:
+		"""Subscribe the user to every ticker in one statement and transaction.
+
+		Pairs that already exist are skipped by ON CONFLICT DO NOTHING; only
+		the newly created subscriptions are returned.
+		"""
+		if not tickers:
+			return []
+		stmt = (
+			insert(Subscription)
+			.values([{"ticker": ticker.upper(), "user_id": user_id} for ticker in tickers])
+			.on_conflict_do_nothing(index_elements=[Subscription.user_id, Subscription.ticker])
+			.returning(Subscription)
+		)
+		result = await self.session.execute(select(Subscription).from_statement(stmt))
+		created = list(result.scalars().all())
+		await self.session.commit()
+		logger.info("Created %s of %s batch subscriptions for user_id=%s", len(created), len(tickers), user_id)
+		return created
+
+	async def delete_many(self, tickers: List[str], user_id: int) -> List[str]:
+		"""Delete the user's subscriptions to `tickers` in one statement.
+
+		Returns the tickers that were actually deleted.
+		"""
+		if not tickers:
+			return []
+		result = await self.session.execute(
+			delete(Subscription)
+			.where(Subscription.user_id == user_id, Subscription.ticker.in_([t.upper() for t in tickers]))
+			.returning(Subscription.ticker)
+		)
+		deleted = [ticker for (ticker,) in result.all()]
+		await self.session.commit()
+		logger.info("Deleted %s of %s batch subscriptions for user_id=%s", len(deleted), len(tickers), user_id)
+		return deleted
+
+	async def list_by_user(self, user_id: int) -> List[Subscription]:
+		result = await self.session.execute(select(Subscription).filter_by(user_id=user_id))
+		return list(result.scalars().all())
+
+	async def list_page_by_user(self, user_id: int, after: int, limit: int) -> List[Subscription]:
+		"""Keyset page of the user's subscriptions: id > `after`, ordered by id."""
+		result = await self.session.execute(
+			select(Subscription)
+			.where(Subscription.user_id == user_id, Subscription.id > after)
+			.order_by(Subscription.id)
+			.limit(limit)
+		)
+		return list(result.scalars().all())
+
+	async def listing_version(self, user_id: int) -> Tuple[int, Optional[datetime]]:
+		"""(row count, max updated_at) of the user's subscriptions, in one query."""
+		result = await self.session.execute(
+			select(func.count(Subscription.id), func.max(Subscription.updated_at))
+			.where(Subscription.user_id == user_id)
+		)
+		count, last_updated = result.one()
+		return count, last_updated
+
+	async def delete_by_user_and_ticker(self, user_id: int, ticker: str) -> int:
+		"""Delete subscriptions for user/ticker and return number deleted."""
+		result = await self.session.execute(
+			delete(Subscription).filter_by(user_id=user_id, ticker=ticker.upper())
+		)
+		await self.session.commit()
+		logger.info("Deleted %s rows for user_id=%s ticker=%s", result.rowcount, user_id, ticker.upper())
+		return result.rowcount
+
+	async def check_ticker_by_user(self, user_id: int, ticker: str) -> bool:
+		"""Return True if a subscription for the (user_id, ticker) exists."""
+		result = await self.session.execute(
+			select(Subscription.id).filter_by(user_id=user_id, ticker=ticker.upper()).limit(1)
+		)
+		return result.first() is not None
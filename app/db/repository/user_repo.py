@@ -6,11 +6,10 @@ methods accept and return SQLAlchemy model instances (not Pydantic models)
 so callers can commit or refresh as needed.
 """
 
-from typing import List
-from .base import BaseRepository
+from .base import AsyncBaseRepository, BaseRepository
 from app.db.models.user import User
 from app.db.schemas.user_schema import UserInRegister
-from sqlalchemy.orm import joinedload
+from sqlalchemy import select
 
 
 class UserRepository(BaseRepository):
@@ -42,17 +41,24 @@ class UserRepository(BaseRepository):
     def get_user_by_id(self, user_id: int) -> User | None:
         return self.session.query(User).filter_by(id=user_id).first()
 
-    def get_users_for_email_dispatch(self) -> List[User]:
-        """
-        Fetches all users who have at least one subscription,
-        eagerly loading their subscriptions in the same query.
-        """
-        # User.subscriptions is the relationship defined in app/db/models/user.py
-        users = (
-            self.session.query(User)
-            .join(User.subscriptions) # join to ensure only users with subscriptions are returned
-            .options(joinedload(User.subscriptions))
-            .distinct()
-            .all()
-        )
-        return users
+
+class AsyncUserRepository(AsyncBaseRepository):
+    """AsyncSession counterpart of UserRepository used by the API."""
+
+    async def create_user(self, user_data: UserInRegister) -> User:
+        newUser = User(**user_data.model_dump(exclude_none=True))
+        self.session.add(newUser)
+        await self.session.commit()
+        await self.session.refresh(newUser)
+        return newUser
+
+    async def user_exist_by_email(self, email: str) -> bool:
+        result = await self.session.execute(select(User.id).filter_by(email=email).limit(1))
+        return result.first() is not None
+
+    async def get_user_by_email(self, email: str) -> User | None:
+        result = await self.session.execute(select(User).filter_by(email=email).limit(1))
+        return result.scalars().first()
+
+    async def get_user_by_id(self, user_id: int) -> User | None:
+        return await self.session.get(User, user_id)
@@ -0,0 +1,35 @@
+"""
+Pydantic schemas for the price alert API (`/alerts`).
+"""
+
+from datetime import datetime
+from typing import Literal, Optional
+
+from pydantic import BaseModel, Field
+
+
+class AlertCreate(BaseModel):
+    """
+    Schema used when creating an alert on one of the user's subscriptions.
+    - kind: "above"/"below" compare the price to `threshold`; "move_pct"
+      fires when the day's move from the previous close is at least
+      `threshold` percent either way.
+    """
+    ticker: str = Field(..., min_length=1, max_length=10)
+    kind: Literal["above", "below", "move_pct"]
+    threshold: float = Field(..., gt=0)
+
+
+class AlertOutput(BaseModel):
+    """
+    Schema returned for alert resources. Triggered alerts stay listed with
+    `active` false and the time and price they fired at.
+    """
+    id: int
+    ticker: str
+    kind: str
+    threshold: float
+    active: bool
+    triggered_at: Optional[datetime] = None
+    triggered_price: Optional[float] = None
+    created_at: datetime
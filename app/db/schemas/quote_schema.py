@@ -0,0 +1,33 @@
+"""
+Pydantic schemas for the quote read API (`/quotes`).
+
+Prices use descriptive field names (not Finnhub's one-letter keys) and
+carry freshness metadata so clients can tell how old a price is.
+"""
+
+from datetime import datetime
+from typing import Dict, List
+
+from pydantic import BaseModel
+
+
+class QuoteOutput(BaseModel):
+    ticker: str
+    current_price: float
+    high_price: float
+    low_price: float
+    open_price: float
+    previous_close: float
+    # Finnhub's timestamp for the quote (unix seconds)
+    timestamp: int
+    # When this process fetched the quote from Finnhub, and how long ago that was
+    fetched_at: datetime
+    age_seconds: float
+    # True when served from the cache without waiting on an upstream call
+    cached: bool
+
+
+class QuoteBatchOutput(BaseModel):
+    quotes: List[QuoteOutput]
+    # ticker -> error detail for tickers that could not be quoted
+    errors: Dict[str, str]
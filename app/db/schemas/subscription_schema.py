@@ -1,9 +1,13 @@
 from __future__ import annotations
 
 from datetime import datetime
-from typing import Optional
+from typing import List, Literal, Optional
 
 from pydantic import BaseModel, Field, root_validator, validator
+from typing_extensions import Annotated
+
+# Upper bound on tickers per batch request (keeps one statement reasonably sized)
+MAX_BATCH_TICKERS = 100
 
 
 class SubscriptionAdd(BaseModel):
@@ -28,3 +32,28 @@ class SubscriptionOutput(BaseModel):
     updated_at: Optional[datetime] = None
 
 
+class SubscriptionBatchIn(BaseModel):
+    """
+    Schema for POST/DELETE /subscriptions/batch.
+    - tickers: 1..MAX_BATCH_TICKERS symbols; normalized to uppercase and
+      de-duplicated by the service.
+    """
+    tickers: List[Annotated[str, Field(min_length=1, max_length=10)]] = Field(
+        ..., min_length=1, max_length=MAX_BATCH_TICKERS
+    )
+
+
+class SubscriptionBatchItem(BaseModel):
+    """
+    Per-ticker outcome of a batch request.
+    - status: "created" / "exists" / "unknown" (not a listed symbol) for adds,
+      "deleted" / "not_found" for removals.
+    - id: the new subscription id when status is "created".
+    """
+    ticker: str
+    status: Literal["created", "exists", "unknown", "deleted", "not_found"]
+    id: Optional[int] = None
+
+
+class SubscriptionBatchOutput(BaseModel):
+    results: List[SubscriptionBatchItem]
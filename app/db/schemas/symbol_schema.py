@@ -0,0 +1,20 @@
+"""
+Pydantic schemas for the symbol search API (`/symbols`).
+"""
+
+from datetime import datetime
+from typing import List, Optional
+
+from pydantic import BaseModel
+
+
+class SymbolOutput(BaseModel):
+    symbol: str
+    description: str
+
+
+class SymbolSearchOutput(BaseModel):
+    results: List[SymbolOutput]
+    # Size of the loaded universe and when it was last refreshed
+    universe_size: int
+    refreshed_at: Optional[datetime] = None
@@ -0,0 +1,56 @@
+"""
+Price alert routes (`/alerts`).
+
+Alerts hang off the user's subscriptions and are checked by the dispatch
+against each fetched quote batch; a triggered alert is emailed once and
+then shows as inactive here.
+"""
+
+from fastapi import APIRouter, Depends, status
+from sqlalchemy.ext.asyncio import AsyncSession
+from typing import List
+
+from app.core.database import get_async_db
+from app.db.schemas.alert_schema import AlertCreate, AlertOutput
+from app.db.schemas.user_schema import UserOutput
+from app.service.alert_service import AlertService
+from app.util.protect_route import get_current_user
+import logging
+
+logger = logging.getLogger(__name__)
+
+
+alert_router = APIRouter()
+
+
+@alert_router.post("/", response_model=AlertOutput, status_code=status.HTTP_201_CREATED)
+async def create_alert(
+    payload: AlertCreate,
+    current_user: UserOutput = Depends(get_current_user),
+    session: AsyncSession = Depends(get_async_db),
+):
+    """Create a price alert on one of the authenticated user's subscriptions (404 if not subscribed)."""
+    alert = await AlertService(session=session).create_alert(user_id=current_user.id, payload=payload)
+    logger.info("Created alert id=%s for user_id=%s", alert.id, current_user.id)
+    return alert
+
+
+@alert_router.get("/", response_model=List[AlertOutput])
+async def list_alerts(
+    current_user: UserOutput = Depends(get_current_user),
+    session: AsyncSession = Depends(get_async_db),
+):
+    """List the authenticated user's alerts, active and triggered, by id."""
+    return await AlertService(session=session).list_alerts(user_id=current_user.id)
+
+
+@alert_router.delete("/{alert_id}", status_code=status.HTTP_200_OK)
+async def delete_alert(
+    alert_id: int,
+    current_user: UserOutput = Depends(get_current_user),
+    session: AsyncSession = Depends(get_async_db),
+):
+    """Delete one of the authenticated user's alerts."""
+    count = await AlertService(session=session).delete_alert(user_id=current_user.id, alert_id=alert_id)
+    logger.info("Deleted alert id=%s for user_id=%s", alert_id, current_user.id)
+    return {"deleted": count}
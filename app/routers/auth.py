@@ -7,8 +7,8 @@ Pydantic response models to validate outgoing payloads.
 
 from fastapi import APIRouter, Depends
 from app.db.schemas.user_schema import UserInRegister, UserInLogin, UserWithToken, UserOutput
-from app.core.database import get_db
-from sqlalchemy.orm import Session
+from app.core.database import get_async_db
+from sqlalchemy.ext.asyncio import AsyncSession
 from app.service.user_service import UserService
 import logging
 
@@ -19,7 +19,7 @@ auth_router = APIRouter()
 
 
 @auth_router.post("/login", status_code=200, response_model=UserWithToken)
-async def login(loginDetails: UserInLogin, session: Session = Depends(get_db)):
+async def login(loginDetails: UserInLogin, session: AsyncSession = Depends(get_async_db)):
     """Authenticate a user and return a token (and user payload).
 
     The heavy lifting lives in `UserService.login_user` which handles
@@ -28,14 +28,14 @@ async def login(loginDetails: UserInLogin, session: Session = Depends(get_db)):
     try:
         user_service = UserService(session)
         logger.info("Login request for email=%s", loginDetails.email)
-        return user_service.login_user(login_details=loginDetails)
+        return await user_service.login_user(login_details=loginDetails)
     except Exception as e:
         logger.exception("Error during login for email=%s: %s", getattr(loginDetails, 'email', None), e)
         raise e
 
 
 @auth_router.post("/register", status_code=201, response_model=UserOutput)
-async def register(registerDetails: UserInRegister, session: Session = Depends(get_db)):
+async def register(registerDetails: UserInRegister, session: AsyncSession = Depends(get_async_db)):
     """Create a new user.
 
     Returns the created user (without password). Duplicate emails raise 400.
@@ -43,7 +43,7 @@ async def register(registerDetails: UserInRegister, session: Session = Depends(g
     try:
         user_service = UserService(session)
         logger.info("Register request for email=%s", registerDetails.email)
-        return user_service.register_user(user_details=registerDetails)
+        return await user_service.register_user(user_details=registerDetails)
     except Exception as e:
         logger.exception("Error during registration for email=%s: %s", getattr(registerDetails, 'email', None), e)
         raise e
@@ -0,0 +1,51 @@
+"""
+Quote read routes (`/quotes`).
+
+Prices come from the app-wide QuoteService (cache + request coalescing),
+so many viewers of the same ticker cost one Finnhub call per TTL window.
+"""
+
+from fastapi import APIRouter, Depends, HTTPException, Query, Request, status
+
+from app.db.schemas.quote_schema import QuoteBatchOutput, QuoteOutput
+from app.db.schemas.user_schema import UserOutput
+from app.service.quote_service import QuoteService
+from app.settings import settings
+from app.util.protect_route import get_current_user
+import logging
+
+logger = logging.getLogger(__name__)
+
+
+quote_router = APIRouter()
+
+
+def get_quote_service(request: Request) -> QuoteService:
+    """The QuoteService created by the app lifespan."""
+    return request.app.state.quote_service
+
+
+@quote_router.get("", response_model=QuoteBatchOutput)
+async def get_quotes(
+    tickers: str = Query(..., description="Comma-separated symbols, e.g. AAPL,MSFT"),
+    current_user: UserOutput = Depends(get_current_user),
+    service: QuoteService = Depends(get_quote_service),
+):
+    """Quotes for several tickers; per-ticker failures are listed under `errors`."""
+    symbols = [t for t in tickers.split(",") if t.strip()]
+    if not symbols or len(symbols) > settings.QUOTE_API_MAX_TICKERS:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=f"Provide between 1 and {settings.QUOTE_API_MAX_TICKERS} tickers.",
+        )
+    return await service.get_quotes(symbols)
+
+
+@quote_router.get("/{ticker}", response_model=QuoteOutput)
+async def get_quote(
+    ticker: str,
+    current_user: UserOutput = Depends(get_current_user),
+    service: QuoteService = Depends(get_quote_service),
+):
+    """Latest quote for one ticker, with `fetched_at`/`age_seconds` freshness."""
+    return await service.get_quote(ticker)
@@ -1,12 +1,19 @@
-from fastapi import APIRouter, Depends, status
-from sqlalchemy.orm import Session
-from typing import List
+from fastapi import APIRouter, Depends, Header, Query, Response, status
+from sqlalchemy.ext.asyncio import AsyncSession
+from typing import List, Optional
 
-from app.core.database import get_db
+from app.core.database import get_async_db
 from app.util.protect_route import get_current_user
 from app.db.schemas.user_schema import UserOutput
-from app.db.schemas.subscription_schema import SubscriptionAdd, SubscriptionOutput
+from app.db.schemas.subscription_schema import (
+    SubscriptionAdd,
+    SubscriptionBatchIn,
+    SubscriptionBatchOutput,
+    SubscriptionOutput,
+)
+from app.routers.symbol import get_symbol_service
 from app.service.subscription_service import SubscriptionService
+from app.service.symbol_service import SymbolService
 import logging
 
 logger = logging.getLogger(__name__)
@@ -16,41 +23,92 @@ subscription_router = APIRouter()
 
 
 @subscription_router.post("/", response_model=SubscriptionOutput, status_code=status.HTTP_201_CREATED)
-def create_subscription(
+async def create_subscription(
     payload: SubscriptionAdd,
     current_user: UserOutput = Depends(get_current_user),
-    session: Session = Depends(get_db),
+    session: AsyncSession = Depends(get_async_db),
+    symbols: SymbolService = Depends(get_symbol_service),
 ):
     """Create a subscription for the authenticated user.
 
     The `user_id` field on the `SubscriptionAdd` schema is optional and is
-    ignored in favor of the authenticated user's id.
+    ignored in favor of the authenticated user's id. Tickers that are not
+    in the symbol universe are rejected with 400.
     """
-    service = SubscriptionService(session=session)
+    service = SubscriptionService(session=session, symbols=symbols)
     logger.info("Create subscription request by user_id=%s ticker=%s", current_user.id, payload.ticker)
-    sub = service.subscribe(user_id=current_user.id, payload=payload)
+    sub = await service.subscribe(user_id=current_user.id, payload=payload)
     logger.info("Created subscription id=%s for user_id=%s", sub.id, current_user.id)
     # Pydantic's orm_mode allows returning the SQLAlchemy model directly
     return sub
 
 
 @subscription_router.get("/", response_model=List[SubscriptionOutput])
-def list_subscriptions(
+async def list_subscriptions(
+    response: Response,
+    after: int = Query(0, ge=0, description="Return subscriptions with id greater than this cursor"),
+    limit: int = Query(100, ge=1, le=500),
+    if_none_match: Optional[str] = Header(None),
     current_user: UserOutput = Depends(get_current_user),
-    session: Session = Depends(get_db),
+    session: AsyncSession = Depends(get_async_db),
 ):
-    """List subscriptions belonging to the authenticated user."""
+    """List subscriptions belonging to the authenticated user, by ascending id.
+
+    Paginated by keyset: pass the `X-Next-Cursor` response header back as
+    `after` to get the next page (the header is absent on the last page).
+    Responses carry an ETag; a repeat request with a matching
+    `If-None-Match` gets `304 Not Modified` without the list being loaded.
+    """
     service = SubscriptionService(session=session)
-    subs = service.list_user_subscriptions(user_id=current_user.id)
+    etag = await service.subscriptions_etag(user_id=current_user.id, after=after, limit=limit)
+    if if_none_match == etag:
+        return Response(status_code=status.HTTP_304_NOT_MODIFIED, headers={"ETag": etag})
+
+    subs, next_cursor = await service.list_user_subscriptions_page(user_id=current_user.id, after=after, limit=limit)
+    response.headers["ETag"] = etag
+    if next_cursor is not None:
+        response.headers["X-Next-Cursor"] = str(next_cursor)
     logger.info("Listed %s subscriptions for user_id=%s", len(subs), current_user.id)
     return subs
 
 
+# Declared before "/{ticker}" so DELETE /batch is not treated as a ticker
+@subscription_router.post("/batch", response_model=SubscriptionBatchOutput, status_code=status.HTTP_200_OK)
+async def create_subscriptions_batch(
+    payload: SubscriptionBatchIn,
+    current_user: UserOutput = Depends(get_current_user),
+    session: AsyncSession = Depends(get_async_db),
+    symbols: SymbolService = Depends(get_symbol_service),
+):
+    """Subscribe the authenticated user to many tickers in one request.
+
+    Existing subscriptions are reported as "exists" and unknown symbols as
+    "unknown" rather than failing the whole batch.
+    """
+    service = SubscriptionService(session=session, symbols=symbols)
+    results = await service.subscribe_many(user_id=current_user.id, tickers=payload.tickers)
+    logger.info("Batch subscribe for user_id=%s (%s tickers)", current_user.id, len(results))
+    return {"results": results}
+
+
+@subscription_router.delete("/batch", response_model=SubscriptionBatchOutput, status_code=status.HTTP_200_OK)
+async def delete_subscriptions_batch(
+    payload: SubscriptionBatchIn,
+    current_user: UserOutput = Depends(get_current_user),
+    session: AsyncSession = Depends(get_async_db),
+):
+    """Unsubscribe the authenticated user from many tickers in one request."""
+    service = SubscriptionService(session=session)
+    results = await service.unsubscribe_many(user_id=current_user.id, tickers=payload.tickers)
+    logger.info("Batch unsubscribe for user_id=%s (%s tickers)", current_user.id, len(results))
+    return {"results": results}
+
+
 @subscription_router.delete("/{ticker}", status_code=status.HTTP_200_OK)
-def delete_subscription(
+async def delete_subscription(
     ticker: str,
     current_user: UserOutput = Depends(get_current_user),
-    session: Session = Depends(get_db),
+    session: AsyncSession = Depends(get_async_db),
 ):
     """Unsubscribe the authenticated user from `ticker`.
 
@@ -58,6 +116,6 @@ def delete_subscription(
     were removed.
     """
     service = SubscriptionService(session=session)
-    count = service.unsubscribe(user_id=current_user.id, ticker=ticker)
+    count = await service.unsubscribe(user_id=current_user.id, ticker=ticker)
     logger.info("Unsubscribed user_id=%s from ticker=%s (deleted=%s)", current_user.id, ticker, count)
     return {"deleted": count}
@@ -0,0 +1,35 @@
+"""
+Symbol search routes (`/symbols`).
+
+Backed by the app-wide SymbolService, so autocomplete is answered from
+memory without a Finnhub or DB round trip.
+"""
+
+from fastapi import APIRouter, Depends, Query, Request
+
+from app.db.schemas.symbol_schema import SymbolSearchOutput
+from app.db.schemas.user_schema import UserOutput
+from app.service.symbol_service import SymbolService
+from app.util.protect_route import get_current_user
+import logging
+
+logger = logging.getLogger(__name__)
+
+
+symbol_router = APIRouter()
+
+
+def get_symbol_service(request: Request) -> SymbolService:
+    """The SymbolService created by the app lifespan."""
+    return request.app.state.symbol_service
+
+
+@symbol_router.get("/search", response_model=SymbolSearchOutput)
+async def search_symbols(
+    q: str = Query(..., min_length=1, max_length=50, description="Symbol or company name prefix"),
+    limit: int = Query(10, ge=1, le=50),
+    current_user: UserOutput = Depends(get_current_user),
+    service: SymbolService = Depends(get_symbol_service),
+):
+    """Autocomplete: symbols starting with `q`, then companies with a word starting with `q`."""
+    return service.search(q, limit)
@@ -0,0 +1,85 @@
+"""
+Benchmark: latency of an unrelated endpoint during a login burst.
+
+Fires `--logins` concurrent POST /auth/login requests at the in-process
+app while a second task polls GET /health, and reports the health-check
+latency percentiles. Runs twice:
+
+- inline:  bcrypt verification on the event loop (the old behaviour)
+- offload: bcrypt on the bounded pool (HashHelper.verify_password_async)
+
+Needs the DB from SQLALCHEMY_DATABASE_URL (a throwaway user is registered).
+
+    python -m app.scripts.bcrypt_benchmark --logins 20
+"""
+
+import argparse
+import asyncio
+import time
+from collections import Counter
+
+import httpx
+
+from app.core.database import async_engine
+from app.core.security.hashHelper import HashHelper
+from app.util.init_db import create_tables
+from app.util.stats import summarize_latencies
+from main import app
+
+PASSWORD = "benchmark-password"
+
+
+async def _inline_verify(plain_password: str, hashed_password: str) -> bool:
+    return HashHelper.verify_password(plain_password, hashed_password)
+
+
+async def run_burst(client: httpx.AsyncClient, email: str, logins: int) -> dict:
+    done = asyncio.Event()
+    health_ms: list[float] = []
+
+    async def poll_health():
+        while not done.is_set():
+            started = time.perf_counter()
+            await client.get("/health")
+            health_ms.append((time.perf_counter() - started) * 1000)
+            await asyncio.sleep(0.005)
+
+    async def login():
+        r = await client.post("/auth/login", json={"email": email, "password": PASSWORD})
+        return r.status_code
+
+    poller = asyncio.create_task(poll_health())
+    started = time.perf_counter()
+    statuses = await asyncio.gather(*(login() for _ in range(logins)))
+    elapsed = time.perf_counter() - started
+    done.set()
+    await poller
+    return {
+        "burst_seconds": round(elapsed, 2),
+        "login_statuses": dict(Counter(statuses)),
+        "health": summarize_latencies(health_ms),
+    }
+
+
+async def main(logins: int) -> None:
+    await create_tables()
+    email = f"bench.{int(time.time() * 1000)}@example.com"
+    transport = httpx.ASGITransport(app=app)
+    async with httpx.AsyncClient(transport=transport, base_url="http://bench") as client:
+        await client.post("/auth/register", json={
+            "first_name": "Bench", "last_name": "Mark", "email": email, "password": PASSWORD,
+        })
+        offloaded = HashHelper.verify_password_async
+        try:
+            HashHelper.verify_password_async = staticmethod(_inline_verify)
+            print("inline ", await run_burst(client, email, logins))
+        finally:
+            HashHelper.verify_password_async = offloaded
+        print("offload", await run_burst(client, email, logins))
+    await async_engine.dispose()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--logins", type=int, default=20, help="concurrent logins in the burst")
+    asyncio.run(main(parser.parse_args().logins))
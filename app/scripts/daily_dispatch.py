@@ -1,51 +1,55 @@
-import os
+import argparse
 import asyncio
 import logging
-from sqlalchemy import create_engine
-from sqlalchemy.orm import sessionmaker
-from dotenv import load_dotenv
-from datetime import datetime, timedelta
+import signal
 
 
+# Shares the configured (pooled/PgBouncer-aware) engine from app.core.database
+# instead of building an untuned one here; settings loads .env on import
+from app.core.database import SessionLocal
+from app.core.job_scheduler import JobScheduler
 from app.service.email_service import EmailService
-
-# Load env vars
-load_dotenv()
-
-DATABASE_URL = os.getenv("SQLALCHEMY_DATABASE_URL")
-if not DATABASE_URL:
-    raise ValueError("SQLALCHEMY_DATABASE_URL not set in environment")
+from app.service.resident_dispatch import ResidentDispatch
+from app.settings import settings
+from app.util.init_db import create_tables
 
 # Logging
 logging.basicConfig(level=logging.INFO)
 
-# SQLAlchemy session
-engine = create_engine(DATABASE_URL)
-SessionLocal = sessionmaker(bind=engine)
-
 async def main():
+    # Make sure the dispatch ledger/checkpoint tables exist before resuming
+    await create_tables()
     session = SessionLocal()
     try:
         email_service = EmailService(session=session)
-        sent_count = await email_service.dispatch_daily_updates()
-        print(f"Emails sent: {sent_count}")
+        try:
+            sent_count = await email_service.dispatch_daily_updates()
+            print(f"Emails sent: {sent_count}")
+        finally:
+            await email_service.aclose()
     finally:
         session.close()
 
-async def periodic_dispatch():
-    
-    # while True:
-    #     now = datetime.now()
-    #     target = now.replace(hour=19, minute=50, second=0, microsecond=0)
-    #     if now >= target:
-    #         target += timedelta(days=1)
-
-    #     sleep_seconds = (target - now).total_seconds()
-    #     logging.info(f"Sleeping for {sleep_seconds} seconds until next dispatch")
-    #     await asyncio.sleep(sleep_seconds)
-
-        # Run dispatch
-        await main()
+async def serve():
+    """Resident mode: build clients once and run every job on its own cadence until SIGINT/SIGTERM."""
+    await create_tables()
+    dispatch = ResidentDispatch()
+    scheduler = JobScheduler(dispatch.jobs())
+    loop = asyncio.get_running_loop()
+    scheduler_task = asyncio.create_task(scheduler.run())
+    for sig in (signal.SIGINT, signal.SIGTERM):
+        loop.add_signal_handler(sig, scheduler_task.cancel)
+    try:
+        await scheduler_task
+    except asyncio.CancelledError:
+        logging.info("Shutting down scheduler: %s", scheduler.stats())
+    finally:
+        # Let an in-flight digest finish so its ledger is flushed
+        await scheduler.aclose(timeout=settings.SCHEDULER_SHUTDOWN_GRACE_SECONDS)
+        await dispatch.aclose()
 
 if __name__ == "__main__":
-    asyncio.run(periodic_dispatch())
\ No newline at end of file
+    parser = argparse.ArgumentParser(description="Send the daily digest once, or run the resident scheduler.")
+    parser.add_argument("--serve", action="store_true", help="run quote refresh, alerts and the digest on their schedules")
+    args = parser.parse_args()
+    asyncio.run(serve() if args.serve else main())
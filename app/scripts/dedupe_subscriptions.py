@@ -0,0 +1,53 @@
+"""
+One-off cleanup: remove duplicate (user_id, ticker) subscriptions.
+
+The old check-then-insert subscribe could store the same subscription
+twice, which blocks the `uq_subscriptions_user_ticker` unique index that
+startup creates. Startup refuses to delete data and fails instead; run
+this once to review and remove the duplicates (the oldest row of each
+pair is kept), then restart.
+
+    python -m app.scripts.dedupe_subscriptions            # report only
+    python -m app.scripts.dedupe_subscriptions --delete
+"""
+
+import argparse
+import logging
+
+from sqlalchemy import text
+
+from app.core.database import engine
+from app.util.init_db import count_duplicate_subscriptions, ensure_subscription_unique_index
+
+logger = logging.getLogger(__name__)
+
+
+def dedupe_subscriptions(conn) -> int:
+    """Delete every subscription that repeats an older one. Returns rows removed."""
+    return conn.execute(text(
+        "DELETE FROM subscriptions a USING subscriptions b "
+        "WHERE a.user_id = b.user_id AND a.ticker = b.ticker AND a.id > b.id"
+    )).rowcount
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Remove duplicate subscriptions so the unique index can be created.")
+    parser.add_argument("--delete", action="store_true", help="delete the duplicates (default: only count them)")
+    args = parser.parse_args()
+    logging.basicConfig(level=logging.INFO)
+
+    with engine.begin() as conn:
+        duplicates = count_duplicate_subscriptions(conn)
+        if duplicates and not args.delete:
+            logger.info("%s duplicate subscriptions found; re-run with --delete to remove them", duplicates)
+            return
+        if duplicates:
+            logger.warning("Removed %s duplicate subscriptions", dedupe_subscriptions(conn))
+        else:
+            logger.info("No duplicate subscriptions found")
+        # Same transaction: the index is only committed together with the cleanup
+        ensure_subscription_unique_index(conn)
+
+
+if __name__ == "__main__":
+    main()
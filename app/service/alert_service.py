@@ -0,0 +1,171 @@
+"""
+Business logic for price alerts.
+
+`AlertService` manages a user's alerts for the `/alerts` API; an alert
+belongs to one of the user's subscriptions, so alerting on a ticker
+requires subscribing to it first.
+
+`AlertEvaluator` checks a freshly fetched quote batch against every active
+alert. The alerts are kept in memory as an `AlertBook` (NumPy arrays) and
+only reloaded when the table's version changes, so a long-lived evaluator
+pays one small query per batch plus the vectorized pass. Triggered alerts
+are emailed through `EmailClient` (one email per user) and deactivated
+once the email went out.
+"""
+
+from collections import defaultdict
+from datetime import datetime
+from typing import Any, Dict, List, Optional, Tuple
+import asyncio
+import logging
+import time
+
+from fastapi import HTTPException, status
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import Session
+
+from app.core.integrations.email_client import (
+    EmailClient,
+    FinancialData,
+    PRICE_ALERT_SUBJECT,
+    compose_alert_message,
+    render_alert_line,
+)
+from app.core.integrations.email_send_stage import SINGLE, EmailSendStage, SendJob, SendResult
+from app.util.timestamps import utcnow
+from app.db.repository.alert_repo import AlertRepository, AsyncAlertRepository
+from app.db.schemas.alert_schema import AlertCreate, AlertOutput
+from app.util.alert_engine import AlertBook
+
+logger = logging.getLogger(__name__)
+
+
+class AlertService:
+    def __init__(self, session: AsyncSession):
+        self._repo = AsyncAlertRepository(session)
+
+    async def create_alert(self, user_id: int, payload: AlertCreate) -> AlertOutput:
+        """Create an alert on the user's subscription to `payload.ticker`.
+
+        Raises HTTPException(404) when the user is not subscribed to it.
+        """
+        ticker = payload.ticker.strip().upper()
+        subscription_id = await self._repo.subscription_id_for(user_id=user_id, ticker=ticker)
+        if subscription_id is None:
+            raise HTTPException(
+                status_code=status.HTTP_404_NOT_FOUND,
+                detail=f"Not subscribed to {ticker}."
+            )
+        alert = await self._repo.create(subscription_id, payload.kind, payload.threshold)
+        return _to_output(alert, ticker)
+
+    async def list_alerts(self, user_id: int) -> List[AlertOutput]:
+        return [_to_output(alert, ticker) for alert, ticker in await self._repo.list_by_user(user_id=user_id)]
+
+    async def delete_alert(self, user_id: int, alert_id: int) -> int:
+        """Delete one of the user's alerts; raises HTTPException(404) if there is none."""
+        count = await self._repo.delete_for_user(user_id=user_id, alert_id=alert_id)
+        if count == 0:
+            raise HTTPException(
+                status_code=status.HTTP_404_NOT_FOUND,
+                detail=f"No alert with id {alert_id}."
+            )
+        return count
+
+
+def _to_output(alert, ticker: str) -> AlertOutput:
+    return AlertOutput(
+        id=alert.id,
+        ticker=ticker,
+        kind=alert.kind,
+        threshold=alert.threshold,
+        active=alert.active,
+        triggered_at=alert.triggered_at,
+        triggered_price=alert.triggered_price,
+        created_at=alert.created_at,
+    )
+
+
+class AlertEvaluator:
+    def __init__(self, session: Session, email_client: EmailClient):
+        self._repo = AlertRepository(session)
+        self._email_client = email_client
+        self._book: Optional[AlertBook] = None
+        self._version: Optional[Tuple[int, Optional[datetime]]] = None
+
+    def _current_book(self) -> AlertBook:
+        version = self._repo.alerts_version()
+        if self._book is None or version != self._version:
+            started = time.perf_counter()
+            self._book = AlertBook.from_rows(self._repo.active_alerts())
+            self._version = version
+            logger.info("Loaded %s active price alerts in %.1fms", len(self._book), (time.perf_counter() - started) * 1000)
+        return self._book
+
+    async def evaluate_and_notify(self, stock_data: FinancialData) -> Dict[str, Any]:
+        """Check `stock_data`'s quotes against all active alerts and email the triggered ones.
+
+        Returns stats for the run summary.
+        """
+        # Repository calls run on worker threads (each on its own connection)
+        # so a scheduler sharing this loop is never held up by the DB
+        book = await asyncio.to_thread(self._current_book)
+        prices = {
+            ticker: (data["quote"].current_price, data["quote"].previous_close)
+            for ticker, data in stock_data.items()
+            if data.get("quote") is not None
+        }
+        started = time.perf_counter()
+        alert_ids, alert_prices = book.evaluate(prices)
+        stats: Dict[str, Any] = {
+            "active": len(book),
+            "triggered": len(alert_ids),
+            "evaluate_ms": round((time.perf_counter() - started) * 1000, 3),
+            "emails_sent": 0,
+        }
+        if not len(alert_ids):
+            return stats
+
+        price_by_id = dict(zip(alert_ids.tolist(), alert_prices.tolist()))
+        by_user = defaultdict(list)
+        for notification in await asyncio.to_thread(self._repo.notifications, list(price_by_id)):
+            by_user[notification.user_id].append(notification)
+
+        def build_jobs():
+            for user_id, notifications in by_user.items():
+                first_name = notifications[0].first_name or "Valued Customer"
+                lines = [
+                    render_alert_line(n.ticker, n.kind, n.threshold, price_by_id[n.alert_id])
+                    for n in notifications
+                ]
+                yield SendJob(
+                    user_id=user_id,
+                    recipient_email=notifications[0].email,
+                    first_name=first_name,
+                    body=compose_alert_message(first_name, lines),
+                    subject=PRICE_ALERT_SUBJECT,
+                )
+
+        notified: List[int] = []
+
+        async def on_result(result: SendResult) -> None:
+            # Deactivated as soon as the email is out, so a cancelled batch
+            # never re-sends it; alerts whose email failed stay active and
+            # fire again on the next batch
+            if not result.ok:
+                return
+            user_id = result.job.user_id
+            triggered = [(n.alert_id, price_by_id[n.alert_id]) for n in by_user[user_id]]
+            await asyncio.to_thread(self._repo.mark_triggered, triggered, utcnow())
+            notified.append(user_id)
+
+        # Alert emails are individual bodies, so always single sends
+        send_stage = EmailSendStage(self._email_client, mode=SINGLE)
+        try:
+            await send_stage.run(build_jobs(), on_result=on_result)
+        finally:
+            await send_stage.aclose()
+
+        stats["emails_sent"] = len(notified)
+        logger.info("Price alerts: %s triggered, %s emails sent", len(alert_ids), len(notified))
+        return stats
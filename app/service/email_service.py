@@ -6,20 +6,34 @@ customized updates to subscribed users. It uses Pydantic models for type safety
 when handling financial data.
 """
 
-from datetime import datetime, timezone
-from typing import Dict, Any, Union
+from dataclasses import dataclass
+from datetime import date, datetime, timezone
+from fastapi import HTTPException
+from itertools import islice
+from typing import Dict, Any, AsyncIterator, Collection, List, Optional, Tuple, Union
 from sqlalchemy.orm import Session
 import asyncio
 import logging # New import for logging
+import random
+import time
+import zlib
 
-from app.db.repository.subscription_repo import SubscriptionRepository
-from app.db.repository.user_repo import UserRepository
-from app.core.integrations.finnhub_client import FinnhubClient
-from app.core.integrations.email_client import EmailClient
-from app.db.models.user import User
+from app.db.repository.dispatch_repo import DispatchRepository, FAILED, SENT
+from app.db.repository.profile_repo import CompanyProfileRepository, StoredProfile
+from app.db.repository.snapshot_repo import TickerSnapshotRepository
+from app.db.repository.subscription_repo import DispatchRecipient, SubscriptionRepository
+from app.core.integrations.finnhub_client import FinnhubClient, is_transient_error
+from app.core.integrations.email_client import EmailClient, StockUpdateRenderer
+from app.core.integrations.email_send_stage import EmailSendStage, SendJob, SendResult
 from app.core.integrations.finnhub_schema import StockQuoteOutput, CompanyProfileOutput
 import json
 from app.core.integrations.s3_client import S3Client
+from app.core.quote_history import QuoteHistoryStore
+from app.service.alert_service import AlertEvaluator
+from app.settings import settings
+from app.util.indicators import TechnicalIndicators, indicators_by_ticker
+from app.util.stats import summarize_latencies
+from app.util.timestamps import utcnow
 
 
 # Initialize logger for this module
@@ -27,37 +41,259 @@ logger = logging.getLogger(__name__)
 # NOTE: You will need to configure the root logger in main.py or settings to see output.
 
 # Define a type alias for the complex dictionary structure for clarity
-FinancialData = Dict[str, Dict[str, Union[StockQuoteOutput, CompanyProfileOutput, None]]]
+FinancialData = Dict[str, Dict[str, Union[StockQuoteOutput, CompanyProfileOutput, TechnicalIndicators, None]]]
+
+
+def _snapshot_to_json(all_stock_data: FinancialData) -> Dict[str, Any]:
+    """Serialize fetched ticker data for the dispatch checkpoint (raw Finnhub keys)."""
+    return {
+        ticker: {
+            "quote": data["quote"].model_dump(by_alias=True) if data["quote"] is not None else None,
+            "profile": data["profile"].model_dump() if data["profile"] is not None else None,
+            "indicators": data["indicators"].model_dump() if data.get("indicators") is not None else None,
+        }
+        for ticker, data in all_stock_data.items()
+    }
+
+
+def _snapshot_from_json(snapshot: Dict[str, Any]) -> FinancialData:
+    return {
+        ticker: {
+            "quote": StockQuoteOutput.model_validate(data["quote"]) if data["quote"] is not None else None,
+            "profile": CompanyProfileOutput.model_validate(data["profile"]) if data["profile"] is not None else None,
+            "indicators": (
+                TechnicalIndicators.model_validate(data["indicators"]) if data.get("indicators") is not None else None
+            ),
+        }
+        for ticker, data in snapshot.items()
+    }
+
+
+def profile_is_stale(ticker: str, stored: StoredProfile, now: datetime) -> bool:
+    """True once `stored` is older than the ticker's refresh age.
+
+    The age is the configured max age shortened by a fixed per-ticker
+    fraction of COMPANY_PROFILE_AGE_JITTER, so profiles fetched on the
+    same day come due on different days.
+    """
+    spread = zlib.crc32(ticker.encode()) / 2**32
+    max_age_days = settings.COMPANY_PROFILE_MAX_AGE_DAYS * (1 - settings.COMPANY_PROFILE_AGE_JITTER * spread)
+    return (now - stored.fetched_at).total_seconds() > max_age_days * 86400
+
+
+def select_profile_refreshes(
+    tickers: List[str],
+    stored: Dict[str, StoredProfile],
+    now: datetime,
+) -> List[str]:
+    """Tickers whose profile should be fetched from Finnhub this run.
+
+    Never-fetched tickers are always included. Stale ones are included
+    oldest first, up to COMPANY_PROFILE_MAX_REFRESH_PER_RUN; the rest keep
+    their stored profile until a later run.
+    """
+    missing = [t for t in tickers if t not in stored]
+    stale = sorted(
+        (t for t in tickers if t in stored and profile_is_stale(t, stored[t], now)),
+        key=lambda t: stored[t].fetched_at,
+    )
+    return missing + stale[:settings.COMPANY_PROFILE_MAX_REFRESH_PER_RUN]
+
+
+@dataclass
+class DispatchClients:
+    """Upstream clients and stores that are costly to build and safe to reuse across runs.
+
+    A one-shot dispatch builds its own; the resident scheduler builds one
+    set at startup so every run reuses warm connection pools and caches.
+    """
+    finnhub_client: FinnhubClient
+    email_client: EmailClient
+    s3_client: S3Client
+    history_store: Optional[QuoteHistoryStore]
+
+    @classmethod
+    def from_settings(cls) -> "DispatchClients":
+        return cls(
+            finnhub_client=FinnhubClient(),
+            email_client=EmailClient(),
+            s3_client=S3Client(),
+            history_store=QuoteHistoryStore() if settings.QUOTE_HISTORY_ENABLED else None,
+        )
+
+    async def aclose(self) -> None:
+        await self.finnhub_client.aclose()
+
 
 class EmailService:
-    def __init__(self, session: Session):
+    def __init__(
+        self,
+        session: Session,
+        clients: Optional[DispatchClients] = None,
+        evaluate_alerts: Optional[bool] = None,
+    ):
+        """`clients` are shared (and left open by `aclose`) when given.
+
+        Alerts are checked against the digest's quotes unless
+        `evaluate_alerts` is False (default: ALERTS_ENABLED), e.g. when a
+        scheduler job evaluates them on its own cadence.
+        """
         self._sub_repo = SubscriptionRepository(session)
-        self._user_repo = UserRepository(session)
-        self._finnhub_client = FinnhubClient()
-        self._email_client = EmailClient()
-        self._s3_client = S3Client()
+        self._dispatch_repo = DispatchRepository(session)
+        self._snapshot_repo = TickerSnapshotRepository(session)
+        self._profile_repo = CompanyProfileRepository(session)
+        self._owns_clients = clients is None
+        clients = clients or DispatchClients.from_settings()
+        self._history_store = clients.history_store
+        self._finnhub_client = clients.finnhub_client
+        self._email_client = clients.email_client
+        self._s3_client = clients.s3_client
+        if evaluate_alerts is None:
+            evaluate_alerts = settings.ALERTS_ENABLED
+        self._alert_evaluator = AlertEvaluator(session, self._email_client) if evaluate_alerts else None
+        # Retry/latency stats from the last fetch, included in the S3 summary
+        self._fetch_stats: Dict[str, Any] = {}
+        self._send_stats: Dict[str, Any] = {}
+        self._alert_stats: Dict[str, Any] = {}
+
+    async def aclose(self) -> None:
+        """Release pooled upstream connections held for the run (unless shared)."""
+        if self._owns_clients:
+            await self._finnhub_client.aclose()
 
-    async def _fetch_all_stock_data(self) -> FinancialData:
+    async def _fetch_all_stock_data(self, tickers: Optional[List[str]] = None) -> FinancialData:
         """
-        Step 1: Get all unique tickers and fetch their quote and profile 
-        data in parallel using FinnhubClient.
+        Step 1: Get all unique tickers (or just `tickers`) and fetch their
+        quote and profile data in parallel using FinnhubClient.
+
+        Profiles come from the `company_profiles` table; only never-fetched
+        and stale ones (see `select_profile_refreshes`) go upstream, so a
+        steady-state run makes one quote call per ticker. A failed refresh
+        of a stale profile falls back to the stored copy.
+
+        With INDICATORS_ENABLED, daily candles are fetched alongside (best
+        effort, no retries) and indicators for every ticker are computed in
+        one vectorized pass once all fetches are done. The first 403 (a plan
+        without candle access) turns candles off for the rest of the run.
+
+        Transient failures (429, upstream 5xx, timeouts) are retried with
+        jittered exponential backoff until the per-ticker deadline; 404s
+        and other permanent errors drop the ticker immediately.
         """
-        unique_tickers = self._sub_repo.get_all_unique_tickers()
+        unique_tickers = tickers if tickers is not None else self._sub_repo.get_all_unique_tickers()
         if not unique_tickers:
             logger.info("No subscriptions found to fetch data for.")
             return {}
 
         logger.info("Fetching data for unique tickers: %s", unique_tickers)
-        
-        async def fetch_ticker_data(ticker: str) -> Dict[str, Union[str, StockQuoteOutput, CompanyProfileOutput, None]]:
-            # These calls now return Pydantic models or None
-            profile = await self._finnhub_client.get_company_profile(ticker)
-            quote = await self._finnhub_client.get_stock_quote(ticker)
-            
+        now = utcnow()
+        try:
+            stored_profiles = await asyncio.to_thread(self._profile_repo.load, unique_tickers)
+        except Exception as e:
+            # Without stored profiles every ticker is simply fetched
+            self._profile_repo.session.rollback()
+            logger.error("Failed to load stored company profiles: %s", e)
+            stored_profiles = {}
+        profile_refreshes = set(select_profile_refreshes(unique_tickers, stored_profiles, now))
+        refreshed_profiles: Dict[str, CompanyProfileOutput] = {}
+        profile_fallbacks = 0
+
+        loop = asyncio.get_running_loop()
+        retries = 0
+        failures = {"permanent": 0, "transient": 0, "deadline": 0}
+        candle_failures = 0
+        candles_enabled = settings.INDICATORS_ENABLED
+        latencies_ms: list[float] = []
+        # Each ticker makes two upstream calls (three with indicators). Capping
+        # tickers in progress keeps queueing for scheduler slots outside the
+        # per-ticker deadline.
+        calls_per_ticker = 3 if settings.INDICATORS_ENABLED else 2
+        ticker_slots = asyncio.Semaphore(max(1, settings.FINNHUB_MAX_IN_FLIGHT // calls_per_ticker))
+
+        async def fetch_with_retry(fetch, ticker: str, deadline: float):
+            nonlocal retries
+            attempt = 0
+            while True:
+                try:
+                    return await fetch(ticker)
+                except Exception as e:
+                    if not is_transient_error(e) or attempt >= settings.FINNHUB_FETCH_MAX_RETRIES:
+                        raise
+                    # Full jitter: sleep a random amount up to the capped exponential delay
+                    delay = random.uniform(0, min(
+                        settings.FINNHUB_RETRY_MAX_DELAY_SECONDS,
+                        settings.FINNHUB_RETRY_BASE_DELAY_SECONDS * 2 ** attempt,
+                    ))
+                    if loop.time() + delay >= deadline:
+                        raise
+                    attempt += 1
+                    retries += 1
+                    logger.warning("Retrying %s for %s in %.2fs (attempt %s): %s",
+                                   fetch.__name__, ticker, delay, attempt, getattr(e, 'detail', e))
+                    await asyncio.sleep(delay)
+
+        async def fetch_profile(ticker: str, deadline: float) -> Optional[CompanyProfileOutput]:
+            nonlocal profile_fallbacks
+            stored = stored_profiles.get(ticker)
+            if ticker not in profile_refreshes:
+                return stored.profile
+            try:
+                profile = await fetch_with_retry(self._finnhub_client.get_company_profile, ticker, deadline)
+            except Exception as e:
+                if stored is None:
+                    raise
+                # A stale profile is still better than dropping the ticker
+                profile_fallbacks += 1
+                logger.warning("Profile refresh failed for %s; keeping copy from %s: %s",
+                               ticker, stored.fetched_at, getattr(e, 'detail', e))
+                return stored.profile
+            refreshed_profiles[ticker] = profile
+            return profile
+
+        async def fetch_closes(ticker: str) -> Optional[List[float]]:
+            # Indicators are an extra: a missing series only drops them from the email
+            nonlocal candle_failures, candles_enabled
+            if not candles_enabled:
+                return None
+            try:
+                candles = await self._finnhub_client.get_daily_candles(ticker, settings.INDICATOR_LOOKBACK_DAYS)
+            except Exception as e:
+                candle_failures += 1
+                if getattr(e, "status_code", None) == 403 and candles_enabled:
+                    candles_enabled = False
+                    logger.warning("Finnhub denied candles (403); skipping indicators for the rest of this run")
+                logger.debug("No candles for %s: %s", ticker, getattr(e, 'detail', e))
+                return None
+            return candles.close
+
+        async def fetch_ticker_data(ticker: str) -> Dict[str, Any]:
+            async with ticker_slots:
+                started = time.perf_counter()
+                deadline = loop.time() + settings.FINNHUB_TICKER_DEADLINE_SECONDS
+                try:
+                    # Profile, quote and candles are independent, so fetch them concurrently
+                    profile, quote, closes = await asyncio.wait_for(
+                        asyncio.gather(
+                            fetch_profile(ticker, deadline),
+                            fetch_with_retry(self._finnhub_client.get_stock_quote, ticker, deadline),
+                            fetch_closes(ticker),
+                        ),
+                        timeout=settings.FINNHUB_TICKER_DEADLINE_SECONDS,
+                    )
+                except asyncio.TimeoutError:
+                    failures["deadline"] += 1
+                    raise HTTPException(status_code=504, detail=f"Deadline exceeded fetching data for '{ticker}'.")
+                except Exception as e:
+                    failures["transient" if is_transient_error(e) else "permanent"] += 1
+                    raise
+                finally:
+                    latencies_ms.append((time.perf_counter() - started) * 1000)
+
             return {
                 "ticker": ticker,
                 "quote": quote,
                 "profile": profile,
+                "closes": closes,
             }
 
         tasks = [fetch_ticker_data(ticker) for ticker in unique_tickers]
@@ -78,6 +314,7 @@ class EmailService:
         results = await asyncio.gather(*tasks, return_exceptions=True)
 
         all_stock_data: FinancialData = {}
+        closes_by_ticker: Dict[str, List[float]] = {}
         for res in results:
             if isinstance(res, Exception):
                 # Log non-critical errors (we can continue with other tickers)
@@ -88,82 +325,235 @@ class EmailService:
                 all_stock_data[res["ticker"]] = {
                     "quote": res["quote"],
                     "profile": res["profile"],
+                    "indicators": None,
                 }
-        
+                if res["closes"]:
+                    closes_by_ticker[res["ticker"]] = res["closes"]
+
+        # One NumPy pass over every ticker's closes instead of a loop per ticker
+        indicators_started = time.perf_counter()
+        indicators = indicators_by_ticker(
+            closes_by_ticker,
+            sma_window=settings.INDICATOR_SMA_WINDOW,
+            rsi_window=settings.INDICATOR_RSI_WINDOW,
+            volatility_window=settings.INDICATOR_VOLATILITY_WINDOW,
+        )
+        for ticker, values in indicators.items():
+            all_stock_data[ticker]["indicators"] = values
+        indicators_ms = (time.perf_counter() - indicators_started) * 1000
+
+        try:
+            await asyncio.to_thread(self._profile_repo.upsert_many, refreshed_profiles, now)
+        except Exception as e:
+            # Unsaved profiles are just refetched next run
+            self._profile_repo.session.rollback()
+            logger.error("Failed to store company profiles: %s", e)
+        self._fetch_stats = {
+            "tickers_requested": len(unique_tickers),
+            "tickers_fetched": len(all_stock_data),
+            "retries": retries,
+            "failures": failures,
+            "ticker_latency": summarize_latencies(latencies_ms),
+            "profiles": {
+                "stored": len(stored_profiles),
+                "refreshed": len(refreshed_profiles),
+                "deferred": sum(
+                    1 for t, stored in stored_profiles.items()
+                    if t not in profile_refreshes and profile_is_stale(t, stored, now)
+                ),
+                "refresh_fallbacks": profile_fallbacks,
+            },
+            "indicators": {
+                "tickers": len(indicators),
+                "candle_failures": candle_failures,
+                "candles_denied": settings.INDICATORS_ENABLED and not candles_enabled,
+                "compute_ms": round(indicators_ms, 1),
+            },
+            "scheduler": self._finnhub_client.scheduler.stats(),
+            "cache": self._finnhub_client.cache.stats(),
+        }
+        logger.info("Finnhub fetch stats: %s", self._fetch_stats)
+
         return all_stock_data
 
-    def _prepare_user_data(self, user: User, all_stock_data: FinancialData) -> FinancialData:
+    async def _load_or_fetch_stock_data(
+        self, run_date: date, tickers: List[str]
+    ) -> Tuple[FinancialData, FinancialData]:
         """
-        Filters the full stock data to include only the tickers the user 
-        is subscribed to.
-        """
-        user_subscribed_data: FinancialData = {}
-        # Use a set for efficient lookup
-        user_tickers = {sub.ticker for sub in user.subscriptions} 
-
-        for ticker in user_tickers:
-            if ticker in all_stock_data:
-                user_subscribed_data[ticker] = all_stock_data[ticker]
-            # Tickers for which data fetching failed are automatically skipped
+        Return the ticker snapshot for `run_date`, checkpointing it in the DB,
+        together with the part of it fetched by this call.
 
-        return user_subscribed_data
+        A resumed run reuses the saved snapshot and only goes to Finnhub for
+        tickers missing from it (new subscriptions, or tickers that failed).
+        Freshly fetched tickers are also appended to `ticker_snapshots` and
+        to the on-disk quote history partition for `run_date`.
+        """
+        fetched_at = utcnow()
+        snapshot = await asyncio.to_thread(self._dispatch_repo.load_checkpoint, run_date)
+        if snapshot is None:
+            fetched = await self._fetch_all_stock_data(tickers)
+            all_stock_data = dict(fetched)
+            restored = 0
+        else:
+            all_stock_data = _snapshot_from_json(snapshot)
+            restored = len(all_stock_data)
+            missing = [t for t in tickers if t not in all_stock_data]
+            logger.info("Resuming from checkpoint for %s: %s tickers restored, %s missing",
+                        run_date, restored, len(missing))
+            fetched = await self._fetch_all_stock_data(missing) if missing else {}
+            all_stock_data.update(fetched)
 
+        if fetched:
+            try:
+                await asyncio.to_thread(
+                    lambda: self._dispatch_repo.save_checkpoint(run_date, _snapshot_to_json(all_stock_data))
+                )
+            except Exception as e:
+                # Without a checkpoint a resume simply refetches; keep sending
+                logger.error("Failed to save ticker checkpoint for %s: %s", run_date, e)
+            try:
+                await asyncio.to_thread(self._snapshot_repo.bulk_insert, fetched_at, fetched)
+            except Exception as e:
+                self._snapshot_repo.session.rollback()
+                logger.error("Failed to persist ticker snapshots: %s", e)
+            if self._history_store is not None:
+                try:
+                    await asyncio.to_thread(self._history_store.append, run_date, fetched)
+                except Exception as e:
+                    logger.error("Failed to append quote history for %s: %s", run_date, e)
+        self._fetch_stats["checkpoint_tickers_restored"] = restored
+        return all_stock_data, fetched
 
-    async def dispatch_daily_updates(self) -> int:
+    async def dispatch_daily_updates(
+        self, run_date: Optional[date] = None, user_ids: Optional[Collection[int]] = None
+    ) -> int:
         """
         Main function to orchestrate the daily update process.
+
+        Runs are resumable: every send result is recorded in the dispatch
+        ledger under `run_date` (today in UTC by default), and re-running for
+        the same date skips users already marked as sent. `user_ids` limits
+        the run to those users and their tickers (default: everyone).
         """
         start_time = datetime.now(timezone.utc)
-        emails_sent_count = 0
+        run_date = run_date or start_time.date()
+
+        # 1. Aggregate financial data for the distinct subscribed tickers (one
+        #    cheap DISTINCT query; recipients are streamed separately below)
+        #    DB work runs on worker threads so the event loop (and, in the
+        #    resident process, the other scheduled jobs) never waits on it
+        unique_tickers = await asyncio.to_thread(self._sub_repo.get_all_unique_tickers, user_ids)
+        all_stock_data, fetched = await self._load_or_fetch_stock_data(run_date, unique_tickers)
 
-        # 1. Aggregate financial data (contains Pydantic models)
-        all_stock_data = await self._fetch_all_stock_data()
-        unique_tickers = self._sub_repo.get_all_unique_tickers()
-        
         if not all_stock_data:
-            self._log_pipeline_summary(start_time, 0, unique_tickers, "no_data_fetched")
+            await self._log_pipeline_summary(run_date, start_time, 0, unique_tickers, "no_data_fetched")
             return 0
 
-        # 2. Get all users who have subscriptions
-        users_with_subscriptions = self._user_repo.get_users_for_email_dispatch()
-        
-        if not users_with_subscriptions:
-            self._log_pipeline_summary(start_time, 0, unique_tickers, "no_data_fetched")
-            logger.info("No users with active subscriptions found. Dispatch complete.")
-            return 0
+        # Price alerts ride on the same quote batch, but only on quotes fetched
+        # now: a resumed run's checkpointed quotes are stale and already had
+        # their alerts evaluated. A failure must not block the digest.
+        if self._alert_evaluator is not None and fetched:
+            try:
+                self._alert_stats = await self._alert_evaluator.evaluate_and_notify(fetched)
+            except Exception as e:
+                logger.error("Price alert evaluation failed: %s", e)
 
-        logger.info("Found %d users to send emails to.", len(users_with_subscriptions))
-
-        # 3. Filter data per user and dispatch email
-        for user in users_with_subscriptions:
-            user_data_to_send = self._prepare_user_data(user, all_stock_data)
-            
-            if user_data_to_send:
-                first_name = user.first_name if user.first_name else "Valued Customer"
-                
-                # Pass Pydantic models to the email client
-                status = self._email_client.send_stock_update(
-                    recipient_email=user.email,
-                    first_name=first_name,
-                    user_subscribed_data=user_data_to_send
-                )
+        # 2. Stream recipients (plain tuples, no ORM objects) in keyset-paginated
+        #    chunks so memory stays flat and the first emails go out immediately
+        users_seen = 0
+        already_sent = await asyncio.to_thread(self._dispatch_repo.completed_user_ids, run_date)
+        skipped_already_sent = 0
+
+        # Bodies are rendered once per distinct portfolio; only the greeting is per user
+        renderer = StockUpdateRenderer(all_stock_data)
+
+        async def recipients() -> AsyncIterator[DispatchRecipient]:
+            chunk_size = settings.DISPATCH_USER_CHUNK_SIZE
+            stream = self._sub_repo.iter_dispatch_recipients(chunk_size=chunk_size, user_ids=user_ids)
+            # Each chunk's query runs on a worker thread; the generator is only
+            # ever advanced by one thread at a time
+            while chunk := await asyncio.to_thread(lambda: list(islice(stream, chunk_size))):
+                for recipient in chunk:
+                    yield recipient
+
+        async def build_jobs() -> AsyncIterator[SendJob]:
+            nonlocal users_seen, skipped_already_sent
+            async for recipient in recipients():
+                users_seen += 1
+                if recipient.user_id in already_sent:
+                    skipped_already_sent += 1
+                    continue
+                # Tickers for which data fetching failed are automatically skipped
+                portfolio = renderer.portfolio_key(recipient.tickers)
 
-                if status:
-                    emails_sent_count += 1
-                    logger.debug("Successfully dispatched email for user: %s", user.email)
+                if portfolio:
+                    first_name = recipient.first_name if recipient.first_name else "Valued Customer"
+                    yield SendJob(
+                        user_id=recipient.user_id,
+                        recipient_email=recipient.email,
+                        first_name=first_name,
+                        ticker_section=renderer.ticker_section(portfolio),
+                    )
                 else:
-                    logger.error("Failed to dispatch email to user: %s", user.email)
-            else:
-                logger.warning("Skipping email for user %s: no valid data found for subscribed tickers.", user.email)
-                
-        logger.info("Daily email dispatch completed. Sent %d emails.", emails_sent_count)
-        self._log_pipeline_summary(start_time, emails_sent_count, unique_tickers, "success")
+                    logger.warning("Skipping email for user %s: no valid data found for subscribed tickers.", recipient.email)
+
+        # 3. Filter data per user and send concurrently, under the SES send rate
+        #    Results are buffered and written to the ledger in batches
+        ledger_buffer: list[tuple] = []
+
+        async def flush_ledger() -> None:
+            if not ledger_buffer:
+                return
+            # Take the rows before awaiting so concurrent results start a new batch
+            rows = list(ledger_buffer)
+            ledger_buffer.clear()
+            try:
+                await asyncio.to_thread(self._dispatch_repo.record_results, run_date, rows)
+            except Exception as e:
+                # Sending matters more than bookkeeping; a resume may re-send these users
+                logger.error("Failed to record %s dispatch ledger rows: %s", len(rows), e)
+
+        async def on_result(result: SendResult) -> None:
+            ledger_buffer.append((
+                result.job.user_id,
+                SENT if result.ok else FAILED,
+                result.message_id,
+                result.error,
+            ))
+            if len(ledger_buffer) >= settings.DISPATCH_LEDGER_FLUSH_SIZE:
+                await flush_ledger()
+
+        send_stage = EmailSendStage(self._email_client)
+        try:
+            self._send_stats = await send_stage.run(build_jobs(), on_result=on_result)
+        finally:
+            # run() returns or raises only after its workers have reported, so
+            # this flush sees every result, including on cancellation/timeouts;
+            # a resumed run therefore never repeats a send SES accepted
+            await flush_ledger()
+            await send_stage.aclose()
+        self._send_stats["distinct_portfolios"] = renderer.distinct_portfolios
+        self._send_stats["skipped_already_sent"] = skipped_already_sent
+        emails_sent_count = self._send_stats["sent"]
+
+        if users_seen == 0:
+            await self._log_pipeline_summary(run_date, start_time, 0, unique_tickers, "no_data_fetched")
+            logger.info("No users with active subscriptions found. Dispatch complete.")
+            return 0
+
+        logger.info("Daily email dispatch completed. Sent %d emails to %d users.", emails_sent_count, users_seen)
+        await self._log_pipeline_summary(run_date, start_time, emails_sent_count, unique_tickers, "success")
         return emails_sent_count
-    
-    def _log_pipeline_summary(self, start_time: datetime, emails_sent: int, tickers_processed: list[str], status: str):
+
+    async def _log_pipeline_summary(self, run_date: date, start_time: datetime, emails_sent: int, tickers_processed: list[str], status: str):
+        """Upload the summary log to S3, keyed by the run date (not the start
+        time, so a catch-up run after midnight is filed under its own day)."""
+        await asyncio.to_thread(self._upload_pipeline_summary, run_date, start_time, emails_sent, tickers_processed, status)
+
+    def _upload_pipeline_summary(self, run_date: date, start_time: datetime, emails_sent: int, tickers_processed: list[str], status: str):
         """Helper function to build and upload the summary log to S3."""
         end_time = datetime.now(timezone.utc)
-        today_date = start_time.strftime("%Y-%m-%d")
+        today_date = run_date.strftime("%Y-%m-%d")
 
         log_data = {
             "date": today_date,
@@ -172,6 +562,9 @@ class EmailService:
             "emails_sent": emails_sent,
             "tickers_processed": tickers_processed,
             "status": status,
+            "fetch": self._fetch_stats,
+            "send": self._send_stats,
+            "alerts": self._alert_stats,
         }
 
         # Construct key: daily_logs/DATE.json
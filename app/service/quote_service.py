@@ -0,0 +1,127 @@
+"""
+Business logic for the quote read API.
+
+Quotes are served from a short-TTL in-process cache. Misses go upstream
+through FinnhubClient (and its rate-limiting scheduler) behind a
+SingleFlight, so concurrent requests for the same ticker share a single
+Finnhub call. One QuoteService lives for the app's lifetime (created in
+the FastAPI lifespan) so the cache is shared across requests; it uses the
+process-wide FinnhubClient, so its calls count against the same quota as
+every other Finnhub caller in the process.
+
+Tickers that are not in the symbol universe (see SymbolService) are
+rejected without an upstream call, and upstream 404s are cached briefly,
+so repeated requests for a bad symbol do not spend quota.
+"""
+
+from datetime import datetime, timezone
+from typing import Callable, List, Optional, Tuple
+import asyncio
+import logging
+import time
+
+from fastapi import HTTPException, status
+
+from app.core.integrations.finnhub_cache import FinnhubCache
+from app.core.integrations.finnhub_client import FinnhubClient
+from app.core.integrations.finnhub_schema import StockQuoteOutput
+from app.db.schemas.quote_schema import QuoteBatchOutput, QuoteOutput
+from app.service.symbol_service import SymbolService
+from app.settings import settings
+from app.util.single_flight import SingleFlight
+from app.util.ttl_cache import MemoryCacheBackend
+
+logger = logging.getLogger(__name__)
+
+# (quote, fetched_at unix seconds)
+CachedQuote = Tuple[StockQuoteOutput, float]
+
+
+class QuoteService:
+    def __init__(
+        self,
+        finnhub_client: Optional[FinnhubClient] = None,
+        ttl_seconds: Optional[float] = None,
+        max_entries: Optional[int] = None,
+        clock: Callable[[], float] = time.time,
+        symbol_service: Optional[SymbolService] = None,
+        not_found_ttl_seconds: Optional[float] = None,
+    ):
+        # An injected client is shared (and left open by `aclose`). The client's
+        # own quote cache should be disabled: this service caches with a fetch
+        # time so it can report freshness
+        self._owns_client = finnhub_client is None
+        self._client = finnhub_client or FinnhubClient(cache=FinnhubCache({}))
+        self._ttl = settings.QUOTE_API_CACHE_TTL_SECONDS if ttl_seconds is None else ttl_seconds
+        self._clock = clock
+        self._cache = MemoryCacheBackend(max_entries or settings.FINNHUB_CACHE_MAX_ENTRIES, clock=clock)
+        self._symbols = symbol_service
+        self._not_found_ttl = (
+            settings.QUOTE_API_NOT_FOUND_TTL_SECONDS if not_found_ttl_seconds is None else not_found_ttl_seconds
+        )
+        # ticker -> 404 detail, for tickers Finnhub had no quote for
+        self._not_found = MemoryCacheBackend(max_entries or settings.FINNHUB_CACHE_MAX_ENTRIES, clock=clock)
+        self._flight = SingleFlight()
+        self.rejected_unknown = 0
+
+    async def aclose(self) -> None:
+        if self._owns_client:
+            await self._client.aclose()
+
+    async def _fetch(self, ticker: str) -> CachedQuote:
+        try:
+            quote = await self._client.get_stock_quote(ticker)
+        except HTTPException as e:
+            if e.status_code == status.HTTP_404_NOT_FOUND:
+                self._not_found.set(ticker, e.detail, expires_at=self._clock() + self._not_found_ttl)
+            raise
+        entry = (quote, self._clock())
+        self._cache.set(ticker, entry, expires_at=entry[1] + self._ttl)
+        return entry
+
+    async def get_quote(self, ticker: str) -> QuoteOutput:
+        """Return the quote for `ticker`; raises the client's HTTPException on failure.
+
+        Raises HTTPException(404) without going upstream when the ticker is
+        not a known symbol or was recently not found.
+        """
+        ticker = ticker.strip().upper()
+        if self._symbols is not None and self._symbols.is_known(ticker) is False:
+            self.rejected_unknown += 1
+            raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail=f"Unknown ticker symbol {ticker}.")
+        not_found = self._not_found.get(ticker)
+        if not_found is not None:
+            raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail=not_found)
+        entry = self._cache.get(ticker)
+        cached = entry is not None
+        if entry is None:
+            entry = await self._flight.do(ticker, lambda: self._fetch(ticker))
+        quote, fetched_at = entry
+        return QuoteOutput(
+            ticker=ticker,
+            **quote.model_dump(),
+            fetched_at=datetime.fromtimestamp(fetched_at, tz=timezone.utc),
+            age_seconds=round(max(0.0, self._clock() - fetched_at), 3),
+            cached=cached,
+        )
+
+    async def get_quotes(self, tickers: List[str]) -> QuoteBatchOutput:
+        """Quote several tickers concurrently; failures are reported per ticker."""
+        tickers = list(dict.fromkeys(t.strip().upper() for t in tickers if t.strip()))
+        results = await asyncio.gather(*(self.get_quote(t) for t in tickers), return_exceptions=True)
+        quotes, errors = [], {}
+        for ticker, result in zip(tickers, results):
+            if isinstance(result, Exception):
+                errors[ticker] = getattr(result, "detail", str(result))
+            else:
+                quotes.append(result)
+        return QuoteBatchOutput(quotes=quotes, errors=errors)
+
+    def stats(self) -> dict:
+        return {
+            "upstream_calls": self._flight.calls,
+            "coalesced": self._flight.coalesced,
+            "cached": len(self._cache),
+            "not_found_cached": len(self._not_found),
+            "rejected_unknown": self.rejected_unknown,
+        }
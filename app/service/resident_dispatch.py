@@ -0,0 +1,115 @@
+"""
+Jobs for the resident (long-running) dispatch process.
+
+Instead of a cron cold-starting Python, boto3 and SQLAlchemy for every run,
+one process builds its clients once and runs two jobs on a JobScheduler:
+
+- quote refresh: fetches the latest quote for every subscribed ticker, then
+  checks that batch against active alerts (each batch is evaluated exactly
+  once), keeping the AlertBook (and its session) warm between runs,
+- daily digest: the usual `dispatch_daily_updates` for the slot's date.
+
+All jobs share the same Finnhub client (transport pool, cache, rate
+scheduler), SES/S3 clients and the SQLAlchemy connection pool; each run
+checks a session out of the pool and returns it when done. Blocking DB
+calls run on worker threads so one job never stalls the others.
+"""
+
+from datetime import datetime, timedelta
+from typing import Any, Dict, List, Optional
+import asyncio
+import logging
+
+from app.core.database import SessionLocal
+from app.core.job_scheduler import Job
+from app.db.repository.subscription_repo import SubscriptionRepository
+from app.service.alert_service import AlertEvaluator
+from app.service.email_service import DispatchClients, EmailService, FinancialData
+from app.settings import settings
+
+logger = logging.getLogger(__name__)
+
+QUOTE_REFRESH = "quote_refresh"
+DAILY_DIGEST = "daily_digest"
+
+
+class ResidentDispatch:
+    def __init__(self, session_factory=SessionLocal, clients: Optional[DispatchClients] = None):
+        self._session_factory = session_factory
+        self._clients = clients or DispatchClients.from_settings()
+        # The evaluator caches active alerts between runs, so it keeps its own session
+        self._alert_session = session_factory() if settings.ALERTS_ENABLED else None
+        self._alert_evaluator = (
+            AlertEvaluator(self._alert_session, self._clients.email_client)
+            if self._alert_session is not None else None
+        )
+        self.latest_quotes: FinancialData = {}
+        self.quotes_slot: Optional[datetime] = None
+
+    def _subscribed_tickers(self) -> List[str]:
+        session = self._session_factory()
+        try:
+            return SubscriptionRepository(session).get_all_unique_tickers()
+        finally:
+            session.close()
+
+    async def refresh_quotes(self, slot: datetime) -> int:
+        """Fetch the latest quote for every subscribed ticker, then evaluate alerts on them.
+
+        Returns tickers fetched.
+        """
+        tickers = await asyncio.to_thread(self._subscribed_tickers)
+        finnhub = self._clients.finnhub_client
+        # The client's FetchScheduler keeps the burst inside Finnhub's rate limits
+        results = await asyncio.gather(*(finnhub.get_stock_quote(t) for t in tickers), return_exceptions=True)
+        quotes = {
+            ticker: {"quote": quote}
+            for ticker, quote in zip(tickers, results)
+            if not isinstance(quote, Exception)
+        }
+        if len(quotes) < len(tickers):
+            logger.warning("Quote refresh for %s: %s of %s tickers failed", slot, len(tickers) - len(quotes), len(tickers))
+        self.latest_quotes, self.quotes_slot = quotes, slot
+        try:
+            await self.evaluate_alerts(slot)
+        except Exception:
+            # The refreshed quotes are kept; the next refresh evaluates again
+            logger.exception("Price alert evaluation failed for %s", slot)
+        return len(quotes)
+
+    async def evaluate_alerts(self, slot: datetime) -> Dict[str, Any]:
+        """Check the latest quote batch against active alerts and email triggered ones."""
+        if self._alert_evaluator is None or not self.latest_quotes:
+            return {}
+        stats = await self._alert_evaluator.evaluate_and_notify(self.latest_quotes)
+        logger.info("Price alerts for %s: %s", slot, stats)
+        return stats
+
+    async def daily_digest(self, slot: datetime) -> int:
+        """Send the daily digest for the slot's date (resumable, like the one-shot run)."""
+        session = self._session_factory()
+        try:
+            # Alerts have their own job here
+            service = EmailService(session, clients=self._clients, evaluate_alerts=False)
+            return await service.dispatch_daily_updates(run_date=slot.date())
+        finally:
+            session.close()
+
+    def jobs(self) -> List[Job]:
+        jitter = settings.SCHEDULER_JITTER_SECONDS
+        refresh_every = timedelta(minutes=settings.SCHEDULER_QUOTE_REFRESH_MINUTES)
+        return [
+            Job(QUOTE_REFRESH, self.refresh_quotes, every=refresh_every, jitter_seconds=jitter, catch_up=refresh_every),
+            Job(
+                DAILY_DIGEST,
+                self.daily_digest,
+                daily_at=settings.SCHEDULER_DIGEST_TIME_UTC,
+                jitter_seconds=jitter,
+                catch_up=timedelta(hours=settings.SCHEDULER_DIGEST_CATCH_UP_HOURS),
+            ),
+        ]
+
+    async def aclose(self) -> None:
+        if self._alert_session is not None:
+            self._alert_session.close()
+        await self._clients.aclose()
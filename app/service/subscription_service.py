@@ -3,57 +3,125 @@ Business logic for subscription management.
 
 Provides functions to create, list, and delete user subscriptions while
 encapsulating repository calls and raising appropriate HTTP errors for the
-router layer.
+router layer. When given the app's SymbolService, new subscriptions are
+checked against the symbol universe first.
 """
 
-from typing import List
-from sqlalchemy.orm import Session
+from typing import List, Optional, Tuple
+import hashlib
+from sqlalchemy.ext.asyncio import AsyncSession
 from fastapi import HTTPException, status
 
-from app.db.repository.subscription_repo import SubscriptionRepository
-from app.db.schemas.subscription_schema import SubscriptionAdd, SubscriptionOutput
+from app.db.repository.subscription_repo import AsyncSubscriptionRepository
+from app.db.schemas.subscription_schema import SubscriptionAdd, SubscriptionBatchItem, SubscriptionOutput
 from app.db.models.subscription import Subscription
+from app.service.symbol_service import SymbolService
 import logging
 
 logger = logging.getLogger(__name__)
 
 
+def _normalize_tickers(tickers: List[str]) -> List[str]:
+    """Uppercase and de-duplicate tickers, keeping their first-seen order."""
+    return list(dict.fromkeys(t.strip().upper() for t in tickers if t.strip()))
+
+
 class SubscriptionService:
-    def __init__(self, session: Session):
-        self._repo = SubscriptionRepository(session)
+    def __init__(self, session: AsyncSession, symbols: Optional[SymbolService] = None):
+        self._repo = AsyncSubscriptionRepository(session)
+        self._symbols = symbols
 
-    def subscribe(self, user_id: int, payload: SubscriptionAdd) -> Subscription:
+    async def subscribe(self, user_id: int, payload: SubscriptionAdd) -> Subscription:
         """Create a subscription for the user.
 
-        Raises HTTPException(400) when subscription already exists.
+        Raises HTTPException(400) when the ticker is not a known symbol or
+        the subscription already exists.
         Returns the SQLAlchemy Subscription model instance on success.
         """
-        # normalize ticker and check for existing
-        ticker = payload.ticker.upper()
+        # normalize ticker; the insert is a no-op when the pair already exists
+        ticker = payload.ticker.strip().upper()
         logger.info("Attempting to subscribe user_id=%s to ticker=%s", user_id, ticker)
-        if self._repo.check_ticker_by_user(user_id=user_id, ticker=ticker):
+        if self._symbols is not None and self._symbols.is_known(ticker) is False:
+            raise HTTPException(
+                status_code=status.HTTP_400_BAD_REQUEST,
+                detail=f"Unknown ticker symbol {ticker}."
+            )
+        sub = await self._repo.insert_if_absent(ticker=ticker, user_id=user_id)
+        if sub is None:
             logger.info("Subscription already exists for user_id=%s ticker=%s", user_id, ticker)
             raise HTTPException(
                 status_code=status.HTTP_400_BAD_REQUEST,
                 detail=f"Already subscribed to {ticker}."
             )
 
-        sub = self._repo.create_subscription(ticker=ticker, user_id=user_id)
         logger.info("Created subscription id=%s for user_id=%s ticker=%s", sub.id, user_id, ticker)
         return sub
 
-    def list_user_subscriptions(self, user_id: int) -> List[Subscription]:
+    async def subscribe_many(self, user_id: int, tickers: List[str]) -> List[SubscriptionBatchItem]:
+        """Subscribe the user to several tickers with one INSERT.
+
+        Returns one result per distinct ticker, in request order: "created"
+        (with the new id), "exists" if the user was already subscribed, or
+        "unknown" for symbols not in the universe (those are not inserted).
+        """
+        tickers = _normalize_tickers(tickers)
+        unknown = set(self._symbols.unknown(tickers)) if self._symbols is not None else set()
+        valid = [t for t in tickers if t not in unknown]
+        created = {sub.ticker: sub.id for sub in await self._repo.insert_many_if_absent(tickers=valid, user_id=user_id)}
+        return [
+            SubscriptionBatchItem(ticker=t, status="unknown") if t in unknown
+            else SubscriptionBatchItem(ticker=t, status="created", id=created[t]) if t in created
+            else SubscriptionBatchItem(ticker=t, status="exists")
+            for t in tickers
+        ]
+
+    async def unsubscribe_many(self, user_id: int, tickers: List[str]) -> List[SubscriptionBatchItem]:
+        """Remove several subscriptions with one DELETE.
+
+        Returns "deleted" or "not_found" per distinct ticker, in request order.
+        Unlike `unsubscribe`, missing tickers do not fail the request.
+        """
+        tickers = _normalize_tickers(tickers)
+        deleted = set(await self._repo.delete_many(tickers=tickers, user_id=user_id))
+        return [
+            SubscriptionBatchItem(ticker=t, status="deleted" if t in deleted else "not_found")
+            for t in tickers
+        ]
+
+    async def list_user_subscriptions(self, user_id: int) -> List[Subscription]:
         """Return a list of Subscription model instances for the user."""
-        return self._repo.list_by_user(user_id=user_id)
+        return await self._repo.list_by_user(user_id=user_id)
+
+    async def list_user_subscriptions_page(
+        self, user_id: int, after: int, limit: int
+    ) -> Tuple[List[Subscription], Optional[int]]:
+        """Return one keyset page and the cursor for the next page (or None).
+
+        One extra row is fetched to know whether another page exists.
+        """
+        rows = await self._repo.list_page_by_user(user_id=user_id, after=after, limit=limit + 1)
+        if len(rows) > limit:
+            return rows[:limit], rows[limit - 1].id
+        return rows, None
+
+    async def subscriptions_etag(self, user_id: int, after: int, limit: int) -> str:
+        """Weak ETag for a page of the user's subscriptions.
+
+        Derived from the row count and latest `updated_at` (any insert,
+        delete or update changes one of them) plus the page parameters.
+        """
+        count, last_updated = await self._repo.listing_version(user_id=user_id)
+        version = f"{user_id}:{count}:{last_updated.isoformat() if last_updated else ''}:{after}:{limit}"
+        return f'W/"{hashlib.sha1(version.encode()).hexdigest()}"'
 
-    def unsubscribe(self, user_id: int, ticker: str) -> int:
+    async def unsubscribe(self, user_id: int, ticker: str) -> int:
         """Delete subscription(s) for a given user and ticker.
 
         Returns the number of deleted rows (0 if none existed). If nothing was
         deleted, raises 404 to signal resource not found.
         """
         logger.info("Unsubscribe request user_id=%s ticker=%s", user_id, ticker)
-        count = self._repo.delete_by_user_and_ticker(user_id=user_id, ticker=ticker)
+        count = await self._repo.delete_by_user_and_ticker(user_id=user_id, ticker=ticker)
         if count == 0:
             raise HTTPException(
                 status_code=status.HTTP_404_NOT_FOUND,
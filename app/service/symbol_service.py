@@ -0,0 +1,121 @@
+"""
+Business logic for the symbol universe.
+
+One SymbolService lives for the app's lifetime (created in the FastAPI
+lifespan). It downloads the exchange's symbol list from Finnhub, or reads
+SYMBOL_UNIVERSE_FILE when set (tests and local development use a small
+fixture), and keeps it in a read-only SymbolIndex that is swapped out
+whole on every refresh. Subscribing checks tickers against it so unknown
+symbols are rejected up front instead of 404ing on every dispatch run.
+
+Until the first load succeeds the universe is unknown and validation
+fails open: subscriptions are accepted as before.
+"""
+
+from datetime import datetime, timezone
+from typing import Callable, Iterable, List, Optional, Tuple
+import asyncio
+import json
+import logging
+import time
+
+from fastapi import HTTPException, status
+
+from app.core.integrations.finnhub_cache import FinnhubCache
+from app.core.integrations.finnhub_client import FinnhubClient
+from app.db.schemas.symbol_schema import SymbolOutput, SymbolSearchOutput
+from app.settings import settings
+from app.util.symbol_index import SymbolIndex
+
+logger = logging.getLogger(__name__)
+
+# Wait before retrying a failed refresh (a full refresh interval is too long)
+RETRY_SECONDS = 300.0
+
+
+def load_symbol_file(path: str) -> List[Tuple[str, str]]:
+    """(symbol, description) pairs from a JSON file shaped like /stock/symbol's response."""
+    with open(path) as f:
+        return [(entry["symbol"], entry.get("description", "")) for entry in json.load(f)]
+
+
+class SymbolService:
+    def __init__(
+        self,
+        finnhub_client: Optional[FinnhubClient] = None,
+        source_file: Optional[str] = None,
+        exchange: Optional[str] = None,
+        clock: Callable[[], float] = time.time,
+    ):
+        # An injected client is shared (and left open by `aclose`)
+        self._client = finnhub_client
+        self._owns_client = finnhub_client is None
+        self._source_file = source_file if source_file is not None else settings.SYMBOL_UNIVERSE_FILE
+        self._exchange = exchange or settings.SYMBOL_UNIVERSE_EXCHANGE
+        self._clock = clock
+        self._index: Optional[SymbolIndex] = None
+        self._refreshed_at: Optional[float] = None
+
+    @property
+    def loaded(self) -> bool:
+        return self._index is not None
+
+    async def _entries(self) -> List[Tuple[str, str]]:
+        if self._source_file:
+            return await asyncio.to_thread(load_symbol_file, self._source_file)
+        if self._client is None:
+            # The listing is too large to be worth the response cache
+            self._client = FinnhubClient(cache=FinnhubCache({}))
+        return [(s.symbol, s.description) for s in await self._client.get_stock_symbols(self._exchange)]
+
+    async def refresh(self) -> int:
+        """Reload the universe and swap in a new index. Returns its size."""
+        entries = await self._entries()
+        # Building the index sorts tens of thousands of entries; keep it off the loop
+        self._index = await asyncio.to_thread(SymbolIndex, entries)
+        self._refreshed_at = self._clock()
+        logger.info("Loaded symbol universe: %s symbols (%s)", len(self._index), self._source_file or self._exchange)
+        return len(self._index)
+
+    async def run_refresh_loop(self) -> None:
+        """Refresh now and then every SYMBOL_UNIVERSE_REFRESH_HOURS until cancelled."""
+        while True:
+            try:
+                await self.refresh()
+                delay = settings.SYMBOL_UNIVERSE_REFRESH_HOURS * 3600
+            except Exception as e:
+                logger.error("Symbol universe refresh failed: %s", getattr(e, "detail", e))
+                delay = RETRY_SECONDS
+            await asyncio.sleep(delay)
+
+    async def aclose(self) -> None:
+        if self._owns_client and self._client is not None:
+            await self._client.aclose()
+
+    def is_known(self, ticker: str) -> Optional[bool]:
+        """True/False once the universe is loaded, None while it is not."""
+        if self._index is None:
+            return None
+        return ticker in self._index
+
+    def unknown(self, tickers: Iterable[str]) -> List[str]:
+        """The tickers not in the universe (none while it is not loaded)."""
+        index = self._index
+        if index is None:
+            return []
+        return [t for t in tickers if t not in index]
+
+    def search(self, query: str, limit: Optional[int] = None) -> SymbolSearchOutput:
+        """Autocomplete matches for `query`; 503 until the universe has loaded."""
+        if self._index is None:
+            raise HTTPException(
+                status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+                detail="Symbol list is still loading; try again shortly.",
+                headers={"Retry-After": "5"},
+            )
+        limit = min(limit or settings.SYMBOL_SEARCH_MAX_RESULTS, settings.SYMBOL_SEARCH_MAX_RESULTS)
+        return SymbolSearchOutput(
+            results=[SymbolOutput(symbol=s, description=d) for s, d in self._index.search(query, limit)],
+            universe_size=len(self._index),
+            refreshed_at=datetime.fromtimestamp(self._refreshed_at, tz=timezone.utc),
+        )
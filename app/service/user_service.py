@@ -7,29 +7,40 @@ Keep this layer free of framework code wherever possible to make it
 easier to unit-test.
 """
 
-from app.db.repository.user_repo import UserRepository
+from app.db.repository.user_repo import AsyncUserRepository
 from app.db.schemas.user_schema import UserInRegister, UserOutput, UserInLogin, UserWithToken
-from app.core.security.hashHelper import HashHelper
+from app.core.security.hashHelper import HashHelper, HashQueueFull
 from app.core.security.authHandler import AuthHandler
-from sqlalchemy.orm import Session
+from sqlalchemy.ext.asyncio import AsyncSession
 from fastapi import HTTPException, status
 import logging
 
 logger = logging.getLogger(__name__)
 
 
+def _busy_exception() -> HTTPException:
+    # The bcrypt pool is saturated; shed load rather than queue indefinitely
+    logger.warning("Password hashing queue full; rejecting request")
+    return HTTPException(
+        status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+        detail="Server busy. Please try again shortly.",
+        headers={"Retry-After": "1"},
+    )
+
+
 class UserService:
-    def __init__(self, session: Session):
-        # repository is responsible for talking to the DB
-        self.__userRepo = UserRepository(session)
+    def __init__(self, session: AsyncSession):
+        # repository is responsible for talking to the DB (async, so the
+        # event loop keeps serving other requests during round trips)
+        self.__userRepo = AsyncUserRepository(session)
 
-    def register_user(self, user_details: UserInRegister) -> UserOutput:
+    async def register_user(self, user_details: UserInRegister) -> UserOutput:
         """Register a user after ensuring the email is unique.
 
         The password in `user_details` is replaced with a bcrypt hash
         before creating the DB record.
         """
-        existing_user = self.__userRepo.user_exist_by_email(email=user_details.email)
+        existing_user = await self.__userRepo.user_exist_by_email(email=user_details.email)
         if existing_user:
             raise HTTPException(
                 status_code=status.HTTP_400_BAD_REQUEST,
@@ -38,28 +49,37 @@ class UserService:
 
         # Hash the plaintext password and store the hash in the model
         logger.info("Registering user: %s", user_details.email)
-        hashed_password = HashHelper.get_password_hash(password=user_details.password)
+        try:
+            hashed_password = await HashHelper.get_password_hash_async(password=user_details.password)
+        except HashQueueFull:
+            raise _busy_exception()
         user_details.password = hashed_password
-        new_user = self.__userRepo.create_user(user_data=user_details)
+        new_user = await self.__userRepo.create_user(user_data=user_details)
         logger.info("Registered user id=%s email=%s", new_user.id, new_user.email)
         return new_user
 
-    def login_user(self, login_details: UserInLogin) -> UserWithToken:
+    async def login_user(self, login_details: UserInLogin) -> UserWithToken:
         """Verify credentials and return a token (and user payload).
 
         Raises HTTPException(400) for authentication failures and 500 for
         token generation problems.
         """
-        existing_user = self.__userRepo.user_exist_by_email(email=login_details.email)
+        existing_user = await self.__userRepo.user_exist_by_email(email=login_details.email)
         if not existing_user:
             raise HTTPException(
                 status_code=status.HTTP_400_BAD_REQUEST,
                 detail="Invalid email or password. Create Account!"
             )
         logger.info("Login attempt for email=%s", login_details.email)
-        user = self.__userRepo.get_user_by_email(email=login_details.email)
+        user = await self.__userRepo.get_user_by_email(email=login_details.email)
         # verify_password compares plaintext with stored bcrypt hash
-        if not HashHelper.verify_password(plain_password=login_details.password, hashed_password=user.password):
+        try:
+            password_ok = await HashHelper.verify_password_async(
+                plain_password=login_details.password, hashed_password=user.password
+            )
+        except HashQueueFull:
+            raise _busy_exception()
+        if not password_ok:
             raise HTTPException(
                 status_code=status.HTTP_400_BAD_REQUEST,
                 detail="Invalid password. Please try again!"
@@ -74,9 +94,9 @@ class UserService:
             detail="Token generation failed. Please try again!"
         )
 
-    def get_user_by_id(self, user_id: int):
+    async def get_user_by_id(self, user_id: int):
         """Fetch a user model by id or raise a 404 HTTPException."""
-        user = self.__userRepo.get_user_by_id(user_id=user_id)
+        user = await self.__userRepo.get_user_by_id(user_id=user_id)
         if not user:
             raise HTTPException(
                 status_code=status.HTTP_404_NOT_FOUND,
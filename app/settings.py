@@ -1,4 +1,5 @@
 import os
+from datetime import time
 from pydantic_settings import BaseSettings, SettingsConfigDict
 from dotenv import load_dotenv
 
@@ -9,11 +10,31 @@ load_dotenv()
 class Settings(BaseSettings):
     # This URL will read the value directly from the .env file or OS environment
     SQLALCHEMY_DATABASE_URL: str 
+    # Async (asyncpg) URL for the API; derived from SQLALCHEMY_DATABASE_URL when unset
+    SQLALCHEMY_ASYNC_DATABASE_URL: str | None = None
+
+    # Connection pool, applied to both the sync and async engines (per process)
+    DB_POOL_SIZE: int = 5
+    DB_MAX_OVERFLOW: int = 10
+    DB_POOL_TIMEOUT_SECONDS: float = 30.0
+    # Recycle connections before managed Postgres/load balancers drop idle ones
+    DB_POOL_RECYCLE_SECONDS: int = 1800
+    DB_POOL_PRE_PING: bool = True
+    # Behind PgBouncer (transaction pooling): NullPool, no prepared statement caches
+    DB_PGBOUNCER_MODE: bool = False
     
     # You can also define other keys you need
     FINNHUB_API_KEY: str
     JWT_SECRET_KEY: str
     JWT_ALGORITHM: str 
+
+    # get_current_user cache: UserOutput TTL and max users/tokens held per process
+    AUTH_USER_CACHE_TTL_SECONDS: float = 60.0
+    AUTH_CACHE_MAX_ENTRIES: int = 10000
+
+    # bcrypt runs off the event loop: concurrent hashes, and max outstanding before 503
+    BCRYPT_WORKERS: int = 2
+    BCRYPT_MAX_QUEUE: int = 32
     
     EMAIL_FROM_ADDRESS: str 
 
@@ -22,6 +43,93 @@ class Settings(BaseSettings):
     AWS_SECRET_ACCESS_KEY: str
     AWS_REGION_NAME: str
 
+    # Finnhub response cache (quotes only; profiles live in `company_profiles`)
+    FINNHUB_QUOTE_CACHE_TTL_SECONDS: int = 60
+    FINNHUB_CACHE_MAX_ENTRIES: int = 5000
+
+    # Finnhub request scheduling (defaults match the free-tier quota)
+    FINNHUB_CALLS_PER_SECOND: float = 30
+    FINNHUB_CALLS_PER_MINUTE: float = 60
+    FINNHUB_MAX_IN_FLIGHT: int = 10
+    FINNHUB_MAX_429_RETRIES: int = 5
+
+    # "thread" runs finnhub.Client via asyncio.to_thread; "async" uses pooled httpx
+    FINNHUB_TRANSPORT: str = "thread"
+    FINNHUB_HTTP_MAX_CONNECTIONS: int = 20
+    FINNHUB_HTTP_TIMEOUT_SECONDS: float = 10.0
+
+    # Dispatch ETL retries for transient Finnhub failures (429/5xx/timeouts)
+    FINNHUB_FETCH_MAX_RETRIES: int = 3
+    FINNHUB_RETRY_BASE_DELAY_SECONDS: float = 0.5
+    FINNHUB_RETRY_MAX_DELAY_SECONDS: float = 8.0
+    FINNHUB_TICKER_DEADLINE_SECONDS: float = 60.0
+
+    # Quote read API: cache TTL per ticker and max tickers per /quotes request.
+    # Not-found tickers are remembered for QUOTE_API_NOT_FOUND_TTL_SECONDS so
+    # repeated lookups of a bad symbol do not spend Finnhub quota.
+    QUOTE_API_CACHE_TTL_SECONDS: float = 15.0
+    QUOTE_API_NOT_FOUND_TTL_SECONDS: float = 300.0
+    QUOTE_API_MAX_TICKERS: int = 50
+
+    # Symbol universe for subscribe-time validation and /symbols/search, refreshed
+    # from Finnhub's /stock/symbol. SYMBOL_UNIVERSE_FILE (same JSON shape) replaces
+    # the download, e.g. with the tests' fixture.
+    SYMBOL_UNIVERSE_ENABLED: bool = True
+    SYMBOL_UNIVERSE_EXCHANGE: str = "US"
+    SYMBOL_UNIVERSE_FILE: str | None = None
+    SYMBOL_UNIVERSE_REFRESH_HOURS: float = 24.0
+    SYMBOL_SEARCH_MAX_RESULTS: int = 20
+
+    # Technical indicators in the daily email, computed from daily candles.
+    # Off by default: /stock/candle is premium-only on Finnhub (403 on the free tier).
+    # Lookback is in calendar days and must cover the longest window in trading days.
+    INDICATORS_ENABLED: bool = False
+    INDICATOR_LOOKBACK_DAYS: int = 60
+    INDICATOR_SMA_WINDOW: int = 20
+    INDICATOR_RSI_WINDOW: int = 14
+    INDICATOR_VOLATILITY_WINDOW: int = 20
+
+    # Stored company profiles are refetched once older than the max age. Each
+    # ticker's age limit is shortened by up to AGE_JITTER (a fraction, fixed per
+    # ticker) so a batch fetched together expires over several days, and at most
+    # MAX_REFRESH_PER_RUN stale profiles are refetched per run (oldest first).
+    COMPANY_PROFILE_MAX_AGE_DAYS: float = 30.0
+    COMPANY_PROFILE_AGE_JITTER: float = 0.25
+    COMPANY_PROFILE_MAX_REFRESH_PER_RUN: int = 500
+
+    # Columnar daily quote history (NumPy memmap files, one directory per date)
+    QUOTE_HISTORY_ENABLED: bool = True
+    QUOTE_HISTORY_DIR: str = "data/quote_history"
+
+    # Check price alerts against each dispatch's quote batch and email triggered ones
+    ALERTS_ENABLED: bool = True
+
+    # Resident scheduler (`python -m app.scripts.daily_dispatch --serve`): job cadences,
+    # the digest's UTC time, per-run start jitter, and how late a missed digest may still run.
+    # Quote refresh (and the alert evaluation that follows each refresh) catches up on
+    # any slot missed by less than its interval.
+    SCHEDULER_QUOTE_REFRESH_MINUTES: float = 5.0
+    SCHEDULER_DIGEST_TIME_UTC: time = time(20, 0)
+    SCHEDULER_JITTER_SECONDS: float = 15.0
+    SCHEDULER_DIGEST_CATCH_UP_HOURS: float = 6.0
+    # How long shutdown waits for running jobs before cancelling them
+    SCHEDULER_SHUTDOWN_GRACE_SECONDS: float = 60.0
+
+    # Users loaded per keyset-paginated query during email dispatch
+    DISPATCH_USER_CHUNK_SIZE: int = 500
+
+    # Send results buffered before being written to the dispatch ledger.
+    # After a hard crash at most this many users can be emailed twice on resume.
+    DISPATCH_LEDGER_FLUSH_SIZE: int = 50
+
+    # SES send stage: worker threads, account max send rate (emails/sec), throttle retries
+    EMAIL_SEND_WORKERS: int = 8
+    SES_MAX_SEND_RATE: float = 14.0
+    SES_MAX_THROTTLE_RETRIES: int = 3
+    # "single" sends one send_email per user; "bulk" packs 50 per send_bulk_templated_email
+    EMAIL_SEND_MODE: str = "single"
+    SES_TEMPLATE_NAME: str = "daily-financial-update"
+
     # Pydantic setting to specify where to read environment variables from
     model_config = SettingsConfigDict(env_file=".env", extra='ignore')
 
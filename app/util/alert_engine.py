@@ -0,0 +1,78 @@
+"""
+Vectorized evaluation of price alerts against a batch of quotes.
+
+Active alerts are held as parallel NumPy arrays (id, ticker index,
+threshold, one boolean mask per alert kind) sorted by ticker. Evaluating
+a quote batch fills one price slot per ticker, expands it to one value
+per alert, and tests every condition with a few array comparisons -- no
+Python loop per alert, so a million alerts take milliseconds.
+
+Tickers missing from the batch get NaN prices, and every comparison with
+NaN is False, so their alerts simply never fire.
+"""
+
+from typing import Dict, Iterable, List, Sequence, Tuple
+
+import numpy as np
+
+from app.db.models.price_alert import ABOVE, BELOW, MOVE_PCT
+
+
+class AlertBook:
+    """Active alerts, grouped by ticker, ready to evaluate."""
+
+    def __init__(
+        self,
+        alert_ids: Sequence[int],
+        tickers: Sequence[str],
+        kinds: Sequence[str],
+        thresholds: Sequence[float],
+    ):
+        unique_tickers, ticker_idx = np.unique(np.asarray(tickers, dtype=str), return_inverse=True)
+        # Sorting by ticker keeps each ticker's alerts contiguous in memory
+        order = np.argsort(ticker_idx, kind="stable")
+        self.tickers: List[str] = unique_tickers.tolist()
+        self._ticker_pos = {ticker: i for i, ticker in enumerate(self.tickers)}
+        self.alert_ids = np.asarray(alert_ids, dtype=np.int64)[order]
+        self.ticker_idx = ticker_idx.astype(np.int32)[order]
+        self._counts = np.bincount(ticker_idx, minlength=len(self.tickers))
+        kinds = np.asarray(kinds, dtype=str)[order]
+        self.thresholds = np.asarray(thresholds, dtype=np.float64)[order]
+        # One mask per kind, built once; unknown kinds match none and never fire
+        self._is_above = kinds == ABOVE
+        self._is_below = kinds == BELOW
+        self._is_move = kinds == MOVE_PCT
+
+    @classmethod
+    def from_rows(cls, rows: Iterable[Tuple[int, str, str, float]]) -> "AlertBook":
+        """Build from (alert_id, ticker, kind, threshold) rows."""
+        columns = list(zip(*rows)) or [(), (), (), ()]
+        return cls(*columns)
+
+    def __len__(self) -> int:
+        return len(self.alert_ids)
+
+    def evaluate(self, prices: Dict[str, Tuple[float, float]]) -> Tuple[np.ndarray, np.ndarray]:
+        """Alerts triggered by `prices` ({ticker: (current, previous_close)}).
+
+        Returns (alert ids, current price for each of them).
+        """
+        current = np.full(len(self.tickers), np.nan)
+        previous = np.full(len(self.tickers), np.nan)
+        for ticker, (price, previous_close) in prices.items():
+            pos = self._ticker_pos.get(ticker)
+            if pos is not None:
+                current[pos], previous[pos] = price, previous_close
+
+        with np.errstate(divide="ignore", invalid="ignore"):
+            move_pct = np.abs(current / previous - 1.0) * 100.0
+        # Alerts are sorted by ticker, so expanding per-ticker values is a repeat
+        price = np.repeat(current, self._counts)
+        move_pct = np.repeat(move_pct, self._counts)
+        hit = (
+            (self._is_above & (price >= self.thresholds))
+            | (self._is_below & (price <= self.thresholds))
+            | (self._is_move & (move_pct >= self.thresholds))
+        )
+        fired = np.flatnonzero(hit)
+        return self.alert_ids[fired], price[fired]
@@ -0,0 +1,102 @@
+"""
+Vectorized technical indicators over many tickers at once.
+
+Daily closes for all tickers are packed into one 2-D float array
+(rows = tickers, columns = days, oldest first, right-aligned and
+left-padded with NaN for short histories). Each indicator is then a
+handful of NumPy reductions along axis 1, so thousands of tickers cost
+milliseconds rather than a Python loop per ticker. Values that need more
+history than a ticker has come out as NaN and are reported as None.
+"""
+
+from typing import Dict, List, Optional, Sequence, Tuple
+
+import numpy as np
+from pydantic import BaseModel
+
+# Trading days per year, for annualizing daily volatility
+TRADING_DAYS = 252
+
+
+class TechnicalIndicators(BaseModel):
+    """Latest indicator values for one ticker (None when history is too short)."""
+    sma: Optional[float] = None
+    sma_window: int
+    rsi: Optional[float] = None
+    rsi_window: int
+    daily_change_pct: Optional[float] = None
+    # Annualized standard deviation of daily log returns
+    volatility: Optional[float] = None
+    volatility_window: int
+
+
+def pack_closes(closes_by_ticker: Dict[str, Sequence[float]], max_days: int) -> Tuple[List[str], np.ndarray]:
+    """Stack the last `max_days` closes per ticker into a right-aligned NaN-padded array."""
+    tickers = list(closes_by_ticker)
+    packed = np.full((len(tickers), max_days), np.nan)
+    for row, ticker in enumerate(tickers):
+        closes = np.asarray(closes_by_ticker[ticker], dtype=float)[-max_days:]
+        if closes.size:
+            packed[row, -closes.size:] = closes
+    return tickers, packed
+
+
+def compute_indicators(
+    closes: np.ndarray,
+    sma_window: int = 20,
+    rsi_window: int = 14,
+    volatility_window: int = 20,
+) -> Dict[str, np.ndarray]:
+    """Latest SMA, RSI, daily % change and volatility for every row of `closes`.
+
+    RSI uses simple averages of gains and losses over the window (Cutler's
+    variant), which keeps it a pure window reduction.
+    """
+    closes = np.asarray(closes, dtype=float)
+    with np.errstate(divide="ignore", invalid="ignore"):
+        sma = closes[:, -sma_window:].mean(axis=1)
+
+        change_pct = (closes[:, -1] / closes[:, -2] - 1.0) * 100.0
+
+        deltas = np.diff(closes[:, -(rsi_window + 1):], axis=1)
+        avg_gain = np.clip(deltas, 0, None).mean(axis=1)
+        avg_loss = np.clip(-deltas, 0, None).mean(axis=1)
+        rsi = 100.0 - 100.0 / (1.0 + avg_gain / avg_loss)
+        # No losses in the window: RSI is 100 (or undefined if flat, left as NaN)
+        rsi = np.where((avg_loss == 0) & (avg_gain > 0), 100.0, rsi)
+
+        log_returns = np.diff(np.log(closes[:, -(volatility_window + 1):]), axis=1)
+        volatility = log_returns.std(axis=1, ddof=1) * np.sqrt(TRADING_DAYS)
+
+    return {"sma": sma, "rsi": rsi, "daily_change_pct": change_pct, "volatility": volatility}
+
+
+def indicators_by_ticker(
+    closes_by_ticker: Dict[str, Sequence[float]],
+    sma_window: int = 20,
+    rsi_window: int = 14,
+    volatility_window: int = 20,
+) -> Dict[str, TechnicalIndicators]:
+    """Compute indicators for every ticker in one batched pass."""
+    if not closes_by_ticker:
+        return {}
+    max_days = max(sma_window, rsi_window + 1, volatility_window + 1)
+    tickers, closes = pack_closes(closes_by_ticker, max_days)
+    values = compute_indicators(closes, sma_window, rsi_window, volatility_window)
+
+    def at(name: str, row: int) -> Optional[float]:
+        value = values[name][row]
+        return round(float(value), 4) if np.isfinite(value) else None
+
+    return {
+        ticker: TechnicalIndicators(
+            sma=at("sma", row),
+            sma_window=sma_window,
+            rsi=at("rsi", row),
+            rsi_window=rsi_window,
+            daily_change_pct=at("daily_change_pct", row),
+            volatility=at("volatility", row),
+            volatility_window=volatility_window,
+        )
+        for row, ticker in enumerate(tickers)
+    }
@@ -6,17 +6,55 @@ We made it async so it can be awaited during FastAPI's async lifespan.
 """
 
 from app.core.database import Base, engine
-from app.db.models import user, subscription
+from app.db.models import user, subscription, dispatch_ledger, ticker_snapshot, company_profile, price_alert
+from sqlalchemy import inspect, text
 import asyncio
 import logging
 
 logger = logging.getLogger(__name__)
 
 
+def count_duplicate_subscriptions(conn) -> int:
+    """Rows that repeat an older subscription of the same user to the same ticker."""
+    return conn.execute(text(
+        "SELECT count(*) FROM subscriptions a WHERE EXISTS ("
+        "SELECT 1 FROM subscriptions b "
+        "WHERE b.user_id = a.user_id AND b.ticker = a.ticker AND b.id < a.id)"
+    )).scalar()
+
+
+def ensure_subscription_unique_index(conn) -> None:
+    """Add the (user_id, ticker) unique index to an existing subscriptions table.
+
+    `create_all` only creates indexes together with new tables. Duplicate
+    rows left by the old check-then-insert subscribe would block the index;
+    startup never deletes them, it fails and points at the one-off cleanup
+    (`python -m app.scripts.dedupe_subscriptions`).
+    """
+    index = next(i for i in subscription.Subscription.__table__.indexes if i.name == "uq_subscriptions_user_ticker")
+    existing = {i["name"] for i in inspect(conn).get_indexes("subscriptions")}
+    if index.name in existing:
+        return
+    duplicates = count_duplicate_subscriptions(conn)
+    if duplicates:
+        raise RuntimeError(
+            f"Cannot create {index.name}: {duplicates} duplicate subscriptions exist. "
+            "Review and remove them with `python -m app.scripts.dedupe_subscriptions`, then restart."
+        )
+    index.create(bind=conn)
+    logger.info("Created index %s", index.name)
+
+
+def _ensure_indexes() -> None:
+    with engine.begin() as conn:
+        ensure_subscription_unique_index(conn)
+
+
 # Create all tables defined on SQLAlchemy models. Kept async so it can be
 # awaited from FastAPI lifespan handlers without blocking the event loop.
 async def create_tables():
     logger.info("Initializing database schema (create_tables)")
     await asyncio.to_thread(Base.metadata.create_all, bind=engine)
+    await asyncio.to_thread(_ensure_indexes)
     logger.info("Database schema initialization complete")
 
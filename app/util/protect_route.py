@@ -8,12 +8,13 @@ If anything goes wrong the dependency raises HTTP 401 Unauthorized.
 """
 
 from fastapi import Depends, Header, HTTPException, status
-from sqlalchemy.orm import Session
+from sqlalchemy.ext.asyncio import AsyncSession
 from fastapi.security import HTTPBearer, HTTPAuthorizationCredentials
 from typing import Annotated, Union
+from app.core.security.authCache import auth_cache
 from app.core.security.authHandler import AuthHandler
 from app.service.user_service import UserService
-from app.core.database import get_db
+from app.core.database import get_async_db
 from app.db.schemas.user_schema import UserOutput
 import logging
 
@@ -22,9 +23,9 @@ logger = logging.getLogger(__name__)
 
 security = HTTPBearer()
 
-def get_current_user(
+async def get_current_user(
         credentials: HTTPAuthorizationCredentials = Depends(security),
-        session: Session = Depends(get_db),
+        session: AsyncSession = Depends(get_async_db),
 ) -> UserOutput:
 
     auth_exception = HTTPException(
@@ -37,26 +38,37 @@ def get_current_user(
             raise auth_exception
 
         token = credentials.credentials  # automatically extracts token after "Bearer "
-        payload = AuthHandler.decode_token(token)
+        # Tokens verified earlier are trusted until their exp without re-decoding
+        user_id = auth_cache.get_token_user_id(token)
+        if user_id is None:
+            payload = AuthHandler.decode_token(token)
+
+            if not payload or not payload.get("user_id"):
+                raise auth_exception
+
+            user_id = payload["user_id"]
+            auth_cache.remember_token(token, user_id, payload["exp"])
+
+        cached_user = auth_cache.get_user(user_id)
+        if cached_user is not None:
+            return cached_user
+
+        try:
+            logger.debug("Decoded token for user_id=%s", user_id)
+            user = await UserService(session=session).get_user_by_id(user_id)
+            # Return a Pydantic object (safe for JSON serialization)
+            current_user = UserOutput(
+                id=user.id,
+                first_name=user.first_name,
+                last_name=user.last_name,
+                email=user.email
+            )
+        except Exception as e:
+            logger.exception("Error fetching user for id=%s: %s", user_id, e)
+            raise e
+        auth_cache.set_user(current_user)
+        return current_user
 
-        if not payload or not payload.get("user_id"):
-            raise auth_exception
-
-        if payload and payload.get("user_id"):
-            try:
-                logger.debug("Decoded token for user_id=%s", payload["user_id"])
-                user = UserService(session=session).get_user_by_id(payload["user_id"])
-                # Return a Pydantic object (safe for JSON serialization)
-                return UserOutput(
-                    id=user.id,
-                    first_name=user.first_name,
-                    last_name=user.last_name,
-                    email=user.email
-                )
-            except Exception as e:
-                logger.exception("Error fetching user for id=%s: %s", payload.get("user_id"), e)
-                raise e
-            
     except Exception:
         # Token invalid or missing required claims
         raise auth_exception
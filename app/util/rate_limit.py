@@ -0,0 +1,44 @@
+"""
+Token-bucket rate limiter shared by the upstream clients (Finnhub, SES).
+"""
+
+from typing import Callable
+import asyncio
+import time
+
+
+class TokenBucket:
+    """Classic token bucket: `capacity` burst, refilled at `rate` tokens/sec."""
+
+    def __init__(self, rate: float, capacity: float, clock: Callable[[], float] = time.monotonic):
+        self.rate = rate
+        self.capacity = capacity
+        self._clock = clock
+        self._tokens = capacity
+        self._updated = clock()
+
+    def _refill(self, scale: float) -> None:
+        now = self._clock()
+        self._tokens = min(self.capacity, self._tokens + (now - self._updated) * self.rate * scale)
+        self._updated = now
+
+    def wait_time(self, scale: float = 1.0) -> float:
+        """Seconds until one token is available (0 if available now)."""
+        self._refill(scale)
+        if self._tokens >= 1:
+            return 0.0
+        return (1 - self._tokens) / (self.rate * scale)
+
+    def consume(self) -> None:
+        self._tokens -= 1
+
+    async def acquire(self) -> bool:
+        """Wait for and take one token. Returns True if the caller had to wait."""
+        waited = False
+        while True:
+            delay = self.wait_time()
+            if delay <= 0:
+                self.consume()
+                return waited
+            waited = True
+            await asyncio.sleep(delay)
@@ -0,0 +1,30 @@
+"""
+Request coalescing ("single flight") for async calls.
+
+While a call for a key is in progress, later callers for the same key
+await the same result instead of starting their own call, so N concurrent
+requests cost one upstream call.
+"""
+
+from typing import Any, Awaitable, Callable, Dict
+import asyncio
+
+
+class SingleFlight:
+    def __init__(self):
+        self._in_flight: Dict[str, asyncio.Task] = {}
+        self.calls = 0
+        self.coalesced = 0
+
+    async def do(self, key: str, call: Callable[[], Awaitable[Any]]) -> Any:
+        """Run `call()` unless a call for `key` is already in flight; share its result or error."""
+        task = self._in_flight.get(key)
+        if task is None:
+            self.calls += 1
+            task = asyncio.ensure_future(call())
+            self._in_flight[key] = task
+            task.add_done_callback(lambda _: self._in_flight.pop(key, None))
+        else:
+            self.coalesced += 1
+        # Shielded so one cancelled caller (e.g. a dropped connection) does not cancel it for everyone
+        return await asyncio.shield(task)
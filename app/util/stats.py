@@ -0,0 +1,26 @@
+"""
+Small helpers for summarizing latency samples in pipeline logs.
+"""
+
+from typing import Dict, Iterable
+import math
+
+
+def percentile(sorted_samples: list[float], pct: float) -> float:
+    """Nearest-rank percentile of an already sorted, non-empty list."""
+    rank = max(1, math.ceil(pct / 100 * len(sorted_samples)))
+    return sorted_samples[rank - 1]
+
+
+def summarize_latencies(samples_ms: Iterable[float]) -> Dict[str, float]:
+    """Return count/p50/p95/p99/max (milliseconds, rounded) for a set of samples."""
+    ordered = sorted(samples_ms)
+    if not ordered:
+        return {"count": 0}
+    return {
+        "count": len(ordered),
+        "p50_ms": round(percentile(ordered, 50), 1),
+        "p95_ms": round(percentile(ordered, 95), 1),
+        "p99_ms": round(percentile(ordered, 99), 1),
+        "max_ms": round(ordered[-1], 1),
+    }
@@ -0,0 +1,70 @@
+"""
+In-memory index over the tradable symbol universe.
+
+Built once per refresh and then read-only, so lookups need no locking:
+
+- a frozenset answers "is this a known ticker?" in O(1),
+- a sorted list of symbols answers symbol-prefix queries with two
+  bisects (the flat equivalent of walking a trie),
+- a sorted list of (word, symbol) pairs does the same for words in the
+  company description, so "appl" and "apple" both find AAPL.
+"""
+
+from bisect import bisect_left
+from typing import Dict, Iterable, List, Tuple
+import re
+
+_WORD_RE = re.compile(r"[a-z0-9]+")
+
+
+class SymbolIndex:
+    def __init__(self, entries: Iterable[Tuple[str, str]]):
+        """`entries` are (symbol, description) pairs; symbols are uppercased."""
+        descriptions: Dict[str, str] = {}
+        for symbol, description in entries:
+            symbol = symbol.strip().upper()
+            if symbol:
+                descriptions[symbol] = description or ""
+        self._descriptions = descriptions
+        self._known = frozenset(descriptions)
+        self._symbols = sorted(descriptions)
+        self._words = sorted({
+            (word, symbol)
+            for symbol, description in descriptions.items()
+            for word in _WORD_RE.findall(description.lower())
+        })
+
+    def __len__(self) -> int:
+        return len(self._known)
+
+    def __contains__(self, symbol: str) -> bool:
+        return symbol.upper() in self._known
+
+    def description(self, symbol: str) -> str:
+        return self._descriptions.get(symbol.upper(), "")
+
+    def search(self, query: str, limit: int = 20) -> List[Tuple[str, str]]:
+        """Up to `limit` (symbol, description) matches for `query`.
+
+        Symbol-prefix matches come first (an exact symbol match leads),
+        then symbols whose description has a word starting with `query`.
+        """
+        query = query.strip()
+        if not query or limit <= 0:
+            return []
+        matches: Dict[str, None] = {}
+
+        prefix = query.upper()
+        start = bisect_left(self._symbols, prefix)
+        for symbol in self._symbols[start:start + limit]:
+            if not symbol.startswith(prefix):
+                break
+            matches[symbol] = None
+
+        word = query.lower()
+        i = bisect_left(self._words, (word, ""))
+        while len(matches) < limit and i < len(self._words) and self._words[i][0].startswith(word):
+            matches[self._words[i][1]] = None
+            i += 1
+
+        return [(symbol, self._descriptions[symbol]) for symbol in matches]
@@ -0,0 +1,14 @@
+"""
+Timestamp helper shared by the models, repositories and services.
+"""
+
+from datetime import datetime, timezone
+
+
+def utcnow() -> datetime:
+    """The current time as naive UTC.
+
+    Every timestamp column is `DateTime` without a time zone, and asyncpg
+    rejects aware values for those, so the app stores naive UTC throughout.
+    """
+    return datetime.now(timezone.utc).replace(tzinfo=None)
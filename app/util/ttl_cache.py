@@ -0,0 +1,49 @@
+"""
+Bounded in-memory LRU cache with per-entry expiry.
+
+Shared by the Finnhub response cache and the authenticated-user cache.
+Not thread-safe: callers use it from a single event loop.
+"""
+
+from collections import OrderedDict
+from typing import Any, Callable, Tuple
+import time
+
+
+class MemoryCacheBackend:
+    """Bounded LRU mapping of key -> (expires_at, payload).
+
+    Expired entries are dropped lazily on read; once `max_entries` is
+    reached the least recently used entry is evicted.
+    """
+
+    def __init__(self, max_entries: int, clock: Callable[[], float] = time.time):
+        self.max_entries = max_entries
+        self._clock = clock
+        self._entries: "OrderedDict[str, Tuple[float, Any]]" = OrderedDict()
+
+    def get(self, key: str) -> Any | None:
+        entry = self._entries.get(key)
+        if entry is None:
+            return None
+        expires_at, payload = entry
+        if expires_at <= self._clock():
+            del self._entries[key]
+            return None
+        self._entries.move_to_end(key)
+        return payload
+
+    def set(self, key: str, payload: Any, expires_at: float) -> None:
+        self._entries[key] = (expires_at, payload)
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+
+    def delete(self, key: str) -> None:
+        self._entries.pop(key, None)
+
+    def clear(self) -> None:
+        self._entries.clear()
+
+    def __len__(self) -> int:
+        return len(self._entries)
@@ -7,21 +7,35 @@ context to initialize database tables before serving requests.
 
 Routes:
  - /auth/* are mounted from `app.routers.auth`
+ - /subscriptions/*, /quotes/*, /symbols/* and /alerts/* from
+   `app.routers.subscription`, `app.routers.quote`, `app.routers.symbol`
+   and `app.routers.alert`
  - /protected demonstrates a route protected by auth dependency
 
 Keep side-effects (like DB creation) inside the lifespan so test imports
 don't run expensive or blocking actions at import time.
 """
-from contextlib import asynccontextmanager
+from contextlib import asynccontextmanager, suppress
 from fastapi import FastAPI, Depends
 from fastapi.middleware.cors import CORSMiddleware 
 from app.util.init_db import create_tables  # async create_tables called by lifespan
+from app.core.database import async_engine, engine
+from app.core.db_pool import pool_metrics
 from fastapi.security import HTTPBearer
 from app.routers.auth import auth_router
 from app.routers.subscription import subscription_router
+from app.routers.quote import quote_router
+from app.routers.symbol import symbol_router
+from app.routers.alert import alert_router
+from app.core.integrations.finnhub_cache import FinnhubCache
+from app.core.integrations.finnhub_client import FinnhubClient
+from app.service.quote_service import QuoteService
+from app.service.symbol_service import SymbolService
+from app.settings import settings
 from app.util.protect_route import get_current_user
 from app.db.schemas.user_schema import UserOutput
 from app.core.logging_config import configure_logging
+import asyncio
 import logging
 from time import time
 
@@ -39,8 +53,31 @@ async def lifespan(app: FastAPI):
     """
     # create tables (uses SQLAlchemy metadata.create_all under the hood)
     await create_tables()
+    # One Finnhub client (and so one rate-limit scheduler) per process: every
+    # service's upstream calls share the FINNHUB_CALLS_PER_* quota. Its response
+    # cache is off because the services cache what they fetch themselves
+    app.state.finnhub_client = FinnhubClient(cache=FinnhubCache({}))
+    # Symbol universe loads in the background; subscribe and quote validation fail open until then
+    app.state.symbol_service = SymbolService(finnhub_client=app.state.finnhub_client)
+    # One quote cache/single-flight per process, shared by all requests
+    app.state.quote_service = QuoteService(
+        finnhub_client=app.state.finnhub_client,
+        symbol_service=app.state.symbol_service,
+    )
+    symbol_refresh = (
+        asyncio.create_task(app.state.symbol_service.run_refresh_loop())
+        if settings.SYMBOL_UNIVERSE_ENABLED else None
+    )
     yield
-    # (optional) add graceful shutdown logic here
+    if symbol_refresh is not None:
+        symbol_refresh.cancel()
+        with suppress(asyncio.CancelledError):
+            await symbol_refresh
+    await app.state.symbol_service.aclose()
+    await app.state.quote_service.aclose()
+    await app.state.finnhub_client.aclose()
+    # Close pooled asyncpg connections while their event loop is still running
+    await async_engine.dispose()
 
 
 # The FastAPI instance must be named `app` so tests and uvicorn can import it.
@@ -70,6 +107,7 @@ app.add_middleware(
     allow_credentials=True,
     allow_methods=["*"], # Allows all HTTP methods (GET, POST, etc.)
     allow_headers=["*"], # Allows all headers (including Authorization)
+    expose_headers=["ETag", "X-Next-Cursor"], # Read by the client for conditional GETs and paging
 )
 # --- END CORS CONFIGURATION ---
 
@@ -78,6 +116,9 @@ security = HTTPBearer()
 # Mount the auth router under /auth (register, login)
 app.include_router(router=auth_router, tags=["auth"], prefix="/auth")
 app.include_router(router=subscription_router, tags=["subscriptions"], prefix="/subscriptions")
+app.include_router(router=quote_router, tags=["quotes"], prefix="/quotes")
+app.include_router(router=symbol_router, tags=["symbols"], prefix="/symbols")
+app.include_router(router=alert_router, tags=["alerts"], prefix="/alerts")
 
 @app.get("/")
 async def root():
@@ -92,6 +133,16 @@ async def health_check():
     return {"status": "running..."}
 
 
+@app.get("/metrics/db")
+async def db_pool_metrics():
+    """Connection pool usage for this worker process.
+
+    Reports checkout wait percentiles, connections in use and timeouts for
+    the async (API) and sync engines, for sizing the DB_POOL_* settings.
+    """
+    return {"async": pool_metrics(async_engine), "sync": pool_metrics(engine)}
+
+
 @app.get("/protected")
 async def read_protected(current_user: UserOutput = Depends(get_current_user)):
     """Example protected route that requires a valid JWT.
@@ -1,3 +1,4 @@
+import os
 import sys
 from pathlib import Path
 
@@ -5,3 +6,6 @@ from pathlib import Path
 ROOT = Path(__file__).resolve().parents[1]
 if str(ROOT) not in sys.path:
     sys.path.insert(0, str(ROOT))
+
+# Load the symbol universe from the fixture instead of downloading it from Finnhub
+os.environ.setdefault("SYMBOL_UNIVERSE_FILE", str(ROOT / "tests" / "fixtures" / "us_symbols.json"))
@@ -0,0 +1,162 @@
+"""
+Fakes and helpers shared by several test modules.
+
+The fakes stand in for Finnhub, SES and S3 so dispatch tests never touch
+the network; `make_user` creates a uniquely named user (with
+subscriptions) in the DB configured in settings.
+"""
+
+import asyncio
+import json
+import threading
+import time
+
+from botocore.exceptions import ClientError
+from fastapi import HTTPException
+
+from app.core.integrations.finnhub_cache import FinnhubCache
+from app.core.integrations.finnhub_client import FetchScheduler
+from app.core.integrations.finnhub_schema import CandleOutput, CompanyProfileOutput, StockQuoteOutput
+from app.db.repository.profile_repo import StoredProfile
+
+
+def unique_email():
+    # millisecond precision to avoid collisions in quick repeated runs
+    return f"test.{int(time.time()*1000)}@example.com"
+
+
+def make_user(session, idx, tickers):
+    """Create a user subscribed to `tickers` and return its id."""
+    from app.db.models.subscription import Subscription
+    from app.db.models.user import User
+
+    u = User(first_name="Stream", last_name="Tester", email=f"{idx}.{unique_email()}", password="x")
+    u.subscriptions = [Subscription(ticker=t) for t in tickers]
+    session.add(u)
+    session.commit()
+    return u.id
+
+
+class StubSES:
+    """In-process SES stand-in: records messages, tracks concurrency and can
+    answer with throttling errors like SES past the account's max send rate."""
+
+    def __init__(self, throttle_first: int = 0, fail_for: str | None = None, latency: float = 0.01):
+        self.throttle_first = throttle_first
+        self.fail_for = fail_for
+        self.latency = latency
+        self.sent = []
+        self.in_flight = 0
+        self.peak = 0
+        self._lock = threading.Lock()
+
+    def send_email(self, Source, Destination, Message):
+        recipient = Destination["ToAddresses"][0]
+        with self._lock:
+            self.in_flight += 1
+            self.peak = max(self.peak, self.in_flight)
+            throttle = self.throttle_first > 0
+            if throttle:
+                self.throttle_first -= 1
+        try:
+            time.sleep(self.latency)
+            if throttle:
+                raise ClientError({"Error": {"Code": "Throttling", "Message": "Maximum sending rate exceeded."}}, "SendEmail")
+            if recipient == self.fail_for:
+                raise ClientError({"Error": {"Code": "MessageRejected", "Message": "Email address is not verified."}}, "SendEmail")
+            with self._lock:
+                self.sent.append(recipient)
+                return {"MessageId": f"msg-{len(self.sent)}"}
+        finally:
+            with self._lock:
+                self.in_flight -= 1
+
+    # --- bulk templated API ---
+    def create_template(self, Template):
+        if getattr(self, "templates", None):
+            raise ClientError({"Error": {"Code": "AlreadyExists", "Message": "exists"}}, "CreateTemplate")
+        self.templates = {Template["TemplateName"]: Template}
+
+    def update_template(self, Template):
+        self.templates[Template["TemplateName"]] = Template
+
+    def send_bulk_templated_email(self, Source, Template, DefaultTemplateData, Destinations):
+        assert Template in self.templates and len(Destinations) <= 50
+        self.bulk_calls = getattr(self, "bulk_calls", 0) + 1
+        statuses = []
+        for dest in Destinations:
+            recipient = dest["Destination"]["ToAddresses"][0]
+            data = json.loads(dest["ReplacementTemplateData"])
+            if recipient == self.fail_for:
+                statuses.append({"Status": "MessageRejected", "Error": "Email address is not verified."})
+            else:
+                self.sent.append((recipient, data["first_name"], data["ticker_section"]))
+                statuses.append({"Status": "Success", "MessageId": f"bulk-{len(self.sent)}"})
+        return {"Status": statuses}
+
+
+class FakeFinnhub:
+    """Fails the first `flaky` calls per ticker with a 503, 404s on 'BAD'."""
+
+    def __init__(self, flaky: int = 0):
+        self.flaky = flaky
+        self.calls: dict[tuple[str, str], int] = {}
+        self.cache = FinnhubCache({})
+        self.scheduler = FetchScheduler(calls_per_second=1000, calls_per_minute=60000, max_in_flight=10)
+
+    async def _call(self, kind: str, ticker: str):
+        n = self.calls[(kind, ticker)] = self.calls.get((kind, ticker), 0) + 1
+        await asyncio.sleep(0.01)
+        if ticker == "BAD":
+            raise HTTPException(status_code=404, detail=f"{kind} for '{ticker}' not found.")
+        if n <= self.flaky:
+            raise HTTPException(status_code=503, detail="upstream unavailable")
+        return f"{kind}:{ticker}"
+
+    async def get_company_profile(self, ticker):
+        return await self._call("profile", ticker)
+
+    async def get_stock_quote(self, ticker):
+        return await self._call("quote", ticker)
+
+    async def get_daily_candles(self, ticker, days):
+        raise HTTPException(status_code=404, detail=f"Candles for '{ticker}' not found.")
+
+
+class ModelFinnhub(FakeFinnhub):
+    """FakeFinnhub that returns real schema objects so they can be checkpointed."""
+
+    async def _call(self, kind, ticker):
+        self.calls[(kind, ticker)] = self.calls.get((kind, ticker), 0) + 1
+        if kind == "profile":
+            return CompanyProfileOutput(country="US", currency="USD", exchange="NASDAQ", name=f"{ticker} Inc", ticker=ticker)
+        if kind == "candles":
+            return CandleOutput.model_validate({"c": [9.0 + i / 10 for i in range(30)], "t": list(range(30)), "s": "ok"})
+        return StockQuoteOutput.model_validate({"c": 10, "h": 11, "l": 9, "o": 9.5, "pc": 9.8, "t": 1700000000})
+
+    async def get_daily_candles(self, ticker, days):
+        return await self._call("candles", ticker)
+
+    async def aclose(self):
+        pass
+
+
+class NullS3:
+    def __init__(self):
+        self.keys = []
+
+    def upload_log(self, key, data):
+        self.keys.append(key)
+        return f"s3://test/{key}"
+
+
+class InMemoryProfileRepo:
+    def __init__(self, stored=None):
+        self.stored = dict(stored or {})
+
+    def load(self, tickers):
+        return {t: self.stored[t] for t in tickers if t in self.stored}
+
+    def upsert_many(self, profiles, fetched_at):
+        self.stored.update({t: StoredProfile(p, fetched_at) for t, p in profiles.items()})
+        return len(profiles)
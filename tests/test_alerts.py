@@ -0,0 +1,136 @@
+"""
+Tests for price alerts: the vectorized AlertBook, the `/alerts` API, and
+the evaluator that emails and deactivates triggered alerts (against the
+DB configured in settings, with a stub SES client).
+"""
+
+import asyncio
+import time
+
+import numpy as np
+import pytest
+from fastapi.testclient import TestClient
+
+from app.core.database import SessionLocal
+from app.core.integrations.email_client import EmailClient
+from app.core.integrations.finnhub_schema import StockQuoteOutput
+from app.db.models.price_alert import PriceAlert
+from app.db.models.subscription import Subscription
+from app.db.models.user import User
+from app.service.alert_service import AlertEvaluator
+from app.settings import settings
+from app.util.alert_engine import AlertBook
+from tests.helpers import StubSES, make_user
+from tests.test_subscription_flow import auth_headers, client  # noqa: F401  (fixture)
+
+
+def quote(current: float, previous_close: float) -> StockQuoteOutput:
+    return StockQuoteOutput.model_validate({"c": current, "h": current, "l": current, "o": current, "pc": previous_close, "t": 1700000000})
+
+
+def test_book_evaluates_each_kind():
+    book = AlertBook.from_rows([
+        (1, "AAPL", "above", 200.0),
+        (2, "AAPL", "below", 150.0),
+        (3, "MSFT", "move_pct", 5.0),
+        (4, "MSFT", "below", 400.0),
+        (5, "TSLA", "above", 1.0),  # no quote in the batch: never fires
+    ])
+    ids, prices = book.evaluate({"AAPL": (201.0, 199.0), "MSFT": (380.0, 400.0)})
+    assert sorted(zip(ids.tolist(), prices.tolist())) == [(1, 201.0), (3, 380.0), (4, 380.0)]
+
+    ids, _ = book.evaluate({"AAPL": (150.0, 0.0), "MSFT": (401.0, 400.0)})  # zero previous close: no move alert
+    assert ids.tolist() == [2]
+    assert len(AlertBook.from_rows([]).evaluate({"AAPL": (1.0, 1.0)})[0]) == 0
+
+
+def test_million_alerts_evaluate_in_milliseconds():
+    rng = np.random.default_rng(0)
+    n, symbols = 1_000_000, np.array([f"T{i}" for i in range(5000)])
+    book = AlertBook(
+        np.arange(n),
+        symbols[rng.integers(0, len(symbols), n)],
+        rng.choice(["above", "below", "move_pct"], n),
+        rng.uniform(0, 200, n),
+    )
+    prices = {s: (100.0, 99.0) for s in symbols.tolist()}
+    book.evaluate(prices)
+    started = time.perf_counter()
+    ids, _ = book.evaluate(prices)
+    assert 0 < len(ids) < n
+    assert time.perf_counter() - started < 0.25
+
+
+def test_alert_api_and_one_shot_notification(client: TestClient):  # noqa: F811
+    headers = auth_headers(client)
+    assert client.post("/alerts/", json={"ticker": "AAPL", "kind": "above", "threshold": 100}, headers=headers).status_code == 404
+    assert client.post("/subscriptions/", json={"ticker": "AAPL"}, headers=headers).status_code == 201
+
+    r = client.post("/alerts/", json={"ticker": "aapl", "kind": "above", "threshold": 100}, headers=headers)
+    assert r.status_code == 201, r.text
+    fired_id = r.json()["id"]
+    kept_id = client.post("/alerts/", json={"ticker": "AAPL", "kind": "below", "threshold": 1}, headers=headers).json()["id"]
+    assert client.post("/alerts/", json={"ticker": "AAPL", "kind": "sideways", "threshold": 1}, headers=headers).status_code == 422
+    email = client.get("/protected", headers=headers).json()["data"]["email"]
+
+    session = SessionLocal()
+    try:
+        email_client = EmailClient()
+        email_client.ses_client = ses = StubSES(latency=0)
+        evaluator = AlertEvaluator(session, email_client)
+        stats = asyncio.run(evaluator.evaluate_and_notify({"AAPL": {"quote": quote(101.0, 100.0)}}))
+        assert stats["triggered"] >= 1 and ses.sent.count(email) == 1
+
+        # One-shot: the same batch does not email the user again
+        asyncio.run(evaluator.evaluate_and_notify({"AAPL": {"quote": quote(101.0, 100.0)}}))
+        assert ses.sent.count(email) == 1
+    finally:
+        session.close()
+
+    alerts = {a["id"]: a for a in client.get("/alerts/", headers=headers).json()}
+    assert alerts[fired_id]["active"] is False and alerts[fired_id]["triggered_price"] == 101.0
+    assert alerts[kept_id]["active"] is True
+
+    assert client.delete(f"/alerts/{kept_id}", headers=headers).json() == {"deleted": 1}
+    assert client.delete(f"/alerts/{kept_id}", headers=headers).status_code == 404
+
+
+def test_cancelled_batch_deactivates_every_alert_it_emailed(monkeypatch):
+    monkeypatch.setattr(settings, "EMAIL_SEND_WORKERS", 2)
+    session = SessionLocal()
+    try:
+        ids = [make_user(session, f"alertcancel{i}", ["CNCL"]) for i in range(4)]
+        subs = session.query(Subscription.id).filter(Subscription.user_id.in_(ids))
+        session.add_all(PriceAlert(subscription_id=sub_id, kind="above", threshold=1.0) for (sub_id,) in subs)
+        session.commit()
+
+        email_client = EmailClient()
+        email_client.ses_client = ses = StubSES(latency=0.05)
+        evaluator = AlertEvaluator(session, email_client)
+
+        async def cancel_mid_batch():
+            task = asyncio.create_task(evaluator.evaluate_and_notify({"CNCL": {"quote": quote(10.0, 9.0)}}))
+            while not ses.in_flight:
+                await asyncio.sleep(0.001)
+            task.cancel()
+            with pytest.raises(asyncio.CancelledError):
+                await task
+
+        asyncio.run(cancel_mid_batch())
+        rows = (
+            session.query(User.email, PriceAlert.active)
+            .join(Subscription, Subscription.user_id == User.id)
+            .join(PriceAlert, PriceAlert.subscription_id == Subscription.id)
+            .filter(User.id.in_(ids))
+            .all()
+        )
+        # Emailed users' alerts are already off, so the next batch does not email them again
+        assert 0 < len(ses.sent) < len(ids)
+        assert sorted(email for email, active in rows if not active) == sorted(ses.sent)
+    finally:
+        # Leave no CNCL alerts armed for later runs
+        session.query(PriceAlert).filter(PriceAlert.active.is_(True), PriceAlert.subscription_id.in_(
+            session.query(Subscription.id).filter(Subscription.ticker == "CNCL")
+        )).delete(synchronize_session=False)
+        session.commit()
+        session.close()
@@ -0,0 +1,44 @@
+"""
+Tests for the async (asyncpg) database path used by the API.
+
+The repository test runs against the DB configured in settings; the
+engine is disposed at the end so pooled connections never outlive the
+event loop created by asyncio.run.
+"""
+
+import asyncio
+
+from app.core.database import AsyncSessionLocal, async_engine, to_async_url
+from app.db.repository.user_repo import AsyncUserRepository
+from app.db.schemas.user_schema import UserInRegister
+from tests.helpers import unique_email
+
+
+def test_to_async_url():
+    assert to_async_url("postgresql+psycopg2://u:p@db:5432/app") == "postgresql+asyncpg://u:p@db:5432/app"
+    assert to_async_url("postgres://u:p@db/app?sslmode=require") == "postgresql+asyncpg://u:p@db/app?ssl=require"
+    assert to_async_url("sqlite:///local.db") == "sqlite:///local.db"
+
+
+def test_async_user_repository_concurrent_sessions():
+    email = unique_email()
+
+    async def run():
+        try:
+            async with AsyncSessionLocal() as session:
+                created = await AsyncUserRepository(session).create_user(
+                    UserInRegister(first_name="Async", last_name="Tester", email=email, password="x")
+                )
+
+            async def lookup():
+                async with AsyncSessionLocal() as session:
+                    return await AsyncUserRepository(session).get_user_by_email(email)
+
+            # Each lookup has its own session/connection and they overlap on the loop
+            users = await asyncio.gather(*(lookup() for _ in range(5)))
+            return created, users
+        finally:
+            await async_engine.dispose()
+
+    created, users = asyncio.run(run())
+    assert {u.id for u in users} == {created.id}
@@ -0,0 +1,78 @@
+"""
+Tests for the authenticated-user cache used by get_current_user.
+
+Unit tests drive an AuthCache with an injected clock; the integration
+tests use the module-level cache through the API and the DB configured
+in settings.
+"""
+
+import pytest
+from fastapi.testclient import TestClient
+
+from app.core.database import SessionLocal
+from app.core.security.authCache import AuthCache, auth_cache
+from app.db.models.user import User
+from app.db.schemas.user_schema import UserOutput
+from main import app
+from tests.helpers import unique_email
+from tests.test_finnhub_cache import FakeClock
+
+
+def make_output(user_id=1):
+    return UserOutput(id=user_id, first_name="Cache", last_name="Tester", email="cache@example.com")
+
+
+def test_user_ttl_and_token_expiry():
+    clock = FakeClock()
+    cache = AuthCache(user_ttl_seconds=30, max_entries=10, clock=clock)
+    cache.set_user(make_output())
+    cache.remember_token("tok", 1, exp=clock.now + 120)
+    cache.remember_token("stale", 1, exp=clock.now - 1)
+
+    assert cache.get_user(1).email == "cache@example.com"
+    assert cache.get_token_user_id("tok") == 1
+    assert cache.get_token_user_id("stale") is None
+
+    clock.now += 60  # past the user TTL, before the token's exp
+    assert cache.get_user(1) is None
+    assert cache.get_token_user_id("tok") == 1
+    clock.now += 61
+    assert cache.get_token_user_id("tok") is None
+
+
+def test_orm_update_invalidates_cached_user():
+    session = SessionLocal()
+    try:
+        user = User(first_name="Before", last_name="Tester", email=unique_email(), password="x")
+        session.add(user)
+        session.commit()
+        auth_cache.set_user(UserOutput(id=user.id, first_name="Before", last_name="Tester", email=user.email))
+
+        user.first_name = "After"
+        session.commit()
+        assert auth_cache.get_user(user.id) is None
+    finally:
+        session.close()
+
+
+@pytest.fixture(scope="module")
+def client():
+    with TestClient(app) as c:
+        yield c
+
+
+def test_repeat_requests_are_served_from_cache(client: TestClient):
+    email = unique_email()
+    client.post("/auth/register", json={"first_name": "Hot", "last_name": "Path", "email": email, "password": "pw-123"})
+    token = client.post("/auth/login", json={"email": email, "password": "pw-123"}).json()["token"]
+    headers = {"Authorization": f"Bearer {token}"}
+
+    assert client.get("/protected", headers=headers).status_code == 200
+    hits = auth_cache.hits
+    r = client.get("/protected", headers=headers)
+    assert r.status_code == 200
+    assert r.json()["data"]["email"] == email
+    assert auth_cache.hits == hits + 1
+
+    # A tampered token is still rejected
+    assert client.get("/protected", headers={"Authorization": f"Bearer {token}x"}).status_code == 401
@@ -7,10 +7,10 @@ Assumptions/notes:
   isolated databases per test run consider wiring a test-specific DB URL.
 """
 
-import time
 import pytest
 from fastapi.testclient import TestClient
 from main import app
+from tests.helpers import unique_email
 
 
 @pytest.fixture(scope="module")
@@ -20,11 +20,6 @@ def client():
         yield c
 
 
-def unique_email():
-    # millisecond precision to avoid collisions in quick repeated runs
-    return f"test.{int(time.time()*1000)}@example.com"
-
-
 def test_register_success(client: TestClient):
     email = unique_email()
     resp = client.post(
@@ -0,0 +1,48 @@
+"""
+Tests for the instrumented connection pools and the /metrics/db endpoint.
+
+The pool test builds a tiny dedicated engine against the DB configured in
+settings so exhaustion and timeouts are easy to provoke.
+"""
+
+import pytest
+from fastapi.testclient import TestClient
+from sqlalchemy import create_engine, exc
+
+from app.core.db_pool import InstrumentedQueuePool, pool_metrics
+from app.settings import settings
+from main import app
+
+
+def test_pool_records_checkouts_and_timeouts():
+    engine = create_engine(
+        settings.SQLALCHEMY_DATABASE_URL,
+        poolclass=InstrumentedQueuePool,
+        pool_size=1,
+        max_overflow=0,
+        pool_timeout=0.1,
+        pool_logging_name="test-exhaustion",
+    )
+    try:
+        held = engine.connect()
+        assert pool_metrics(engine)["in_use"] == 1
+        with pytest.raises(exc.TimeoutError):
+            engine.connect()
+        held.close()
+
+        metrics = pool_metrics(engine)
+        assert metrics["checkouts"] == 1
+        assert metrics["timeouts"] == 1
+        assert metrics["in_use"] == 0 and metrics["peak_in_use"] == 1
+        assert metrics["checkout_wait"]["count"] == 1
+    finally:
+        engine.dispose()
+
+
+def test_metrics_endpoint_reports_both_engines():
+    with TestClient(app) as client:
+        resp = client.get("/metrics/db")
+    assert resp.status_code == 200
+    body = resp.json()
+    assert body["async"]["pool"].startswith("Instrumented")
+    assert "checkout_wait" in body["sync"]
@@ -0,0 +1,121 @@
+"""
+Tests for the ETL fetch stage of EmailService (retries, deadlines, stats).
+
+A fake Finnhub client stands in for the real one; the repository call that
+lists tickers and the company profile store are replaced so no
+subscriptions or profiles need to exist in the DB.
+"""
+
+import asyncio
+from datetime import datetime, timedelta, timezone
+
+import pytest
+from fastapi import HTTPException
+
+from app.db.repository.profile_repo import StoredProfile
+from app.service.email_service import EmailService
+from app.settings import settings
+from tests.helpers import FakeFinnhub, InMemoryProfileRepo
+
+
+@pytest.fixture
+def fast_retries(monkeypatch):
+    monkeypatch.setattr(settings, "FINNHUB_RETRY_BASE_DELAY_SECONDS", 0.001)
+    monkeypatch.setattr(settings, "FINNHUB_RETRY_MAX_DELAY_SECONDS", 0.005)
+
+
+def make_service(finnhub, tickers, profiles=None):
+    service = EmailService(session=None)
+    service._finnhub_client = finnhub
+    service._sub_repo.get_all_unique_tickers = lambda: tickers
+    service._profile_repo = InMemoryProfileRepo(profiles)
+    return service
+
+
+def test_transient_errors_are_retried(fast_retries):
+    service = make_service(FakeFinnhub(flaky=2), ["AAPL", "MSFT"])
+    data = asyncio.run(service._fetch_all_stock_data())
+
+    assert data["AAPL"] == {"quote": "quote:AAPL", "profile": "profile:AAPL", "indicators": None}
+    assert set(data) == {"AAPL", "MSFT"}
+    assert service._fetch_stats["retries"] == 8  # 2 retries x 2 calls x 2 tickers
+    assert service._fetch_stats["ticker_latency"]["count"] == 2
+
+
+def test_not_found_is_permanent(fast_retries):
+    finnhub = FakeFinnhub()
+    service = make_service(finnhub, ["AAPL", "BAD"])
+    data = asyncio.run(service._fetch_all_stock_data())
+
+    assert set(data) == {"AAPL"}
+    assert finnhub.calls[("quote", "BAD")] == 1
+    assert service._fetch_stats["failures"]["permanent"] == 1
+    assert service._fetch_stats["retries"] == 0
+
+
+def test_retries_stop_at_ticker_deadline(fast_retries, monkeypatch):
+    monkeypatch.setattr(settings, "FINNHUB_FETCH_MAX_RETRIES", 1000)
+    monkeypatch.setattr(settings, "FINNHUB_TICKER_DEADLINE_SECONDS", 0.2)
+    service = make_service(FakeFinnhub(flaky=10**6), ["AAPL"])
+    data = asyncio.run(service._fetch_all_stock_data())
+
+    assert data == {}
+    failures = service._fetch_stats["failures"]
+    assert failures["deadline"] + failures["transient"] == 1
+
+
+def test_only_missing_and_stale_profiles_are_fetched(fast_retries, monkeypatch):
+    monkeypatch.setattr(settings, "COMPANY_PROFILE_MAX_AGE_DAYS", 30)
+    now = datetime.now(timezone.utc).replace(tzinfo=None)
+    finnhub = FakeFinnhub()
+    service = make_service(finnhub, ["FRESH", "STALE", "NEW"], profiles={
+        "FRESH": StoredProfile("stored:FRESH", now - timedelta(days=1)),
+        "STALE": StoredProfile("stored:STALE", now - timedelta(days=31)),
+    })
+    data = asyncio.run(service._fetch_all_stock_data())
+
+    assert data["FRESH"]["profile"] == "stored:FRESH"
+    assert data["STALE"]["profile"] == "profile:STALE"
+    assert ("profile", "FRESH") not in finnhub.calls
+    assert service._profile_repo.stored["NEW"].profile == "profile:NEW"
+    assert service._fetch_stats["profiles"]["refreshed"] == 2
+
+
+def test_stale_refreshes_are_capped_and_fall_back(fast_retries, monkeypatch):
+    monkeypatch.setattr(settings, "COMPANY_PROFILE_MAX_REFRESH_PER_RUN", 1)
+    monkeypatch.setattr(settings, "FINNHUB_FETCH_MAX_RETRIES", 0)
+    old = datetime.now(timezone.utc).replace(tzinfo=None) - timedelta(days=365)
+    finnhub = FakeFinnhub(flaky=1)
+    service = make_service(finnhub, ["OLDEST", "OLD"], profiles={
+        "OLDEST": StoredProfile("stored:OLDEST", old - timedelta(days=1)),
+        "OLD": StoredProfile("stored:OLD", old),
+    })
+    monkeypatch.setattr(finnhub, "get_stock_quote", lambda ticker: asyncio.sleep(0, f"quote:{ticker}"))
+    data = asyncio.run(service._fetch_all_stock_data())
+
+    # Only the oldest is refreshed; its refresh 503s, so the stored copy is kept
+    assert finnhub.calls == {("profile", "OLDEST"): 1}
+    assert data["OLDEST"]["profile"] == "stored:OLDEST" and data["OLD"]["profile"] == "stored:OLD"
+    stats = service._fetch_stats["profiles"]
+    assert stats["deferred"] == 1 and stats["refresh_fallbacks"] == 1
+
+
+def test_candles_stop_after_first_403(fast_retries, monkeypatch):
+    monkeypatch.setattr(settings, "INDICATORS_ENABLED", True)
+    # One ticker in progress at a time, so the 403 is seen before the next one starts
+    monkeypatch.setattr(settings, "FINNHUB_MAX_IN_FLIGHT", 3)
+    finnhub = FakeFinnhub()
+    candle_calls = []
+
+    async def premium_only(ticker, days):
+        candle_calls.append(ticker)
+        raise HTTPException(status_code=403, detail="You don't have access to this resource.")
+
+    monkeypatch.setattr(finnhub, "get_daily_candles", premium_only)
+    service = make_service(finnhub, ["AAPL", "MSFT", "NVDA"])
+    data = asyncio.run(service._fetch_all_stock_data())
+
+    assert set(data) == {"AAPL", "MSFT", "NVDA"}
+    assert len(candle_calls) == 1
+    stats = service._fetch_stats["indicators"]
+    assert stats["candle_failures"] == 1 and stats["candles_denied"]
@@ -0,0 +1,189 @@
+"""
+Tests for resumable dispatch runs (send ledger + ticker checkpoint).
+
+Runs `dispatch_daily_updates` against the DB configured in settings with
+fake Finnhub/SES/S3 clients, checking the ledger, checkpoint,
+ticker_snapshots and company_profiles side effects. Each test uses its
+own run date so ledgers from other runs never interfere.
+"""
+
+import asyncio
+import random
+from datetime import date, datetime, timedelta, timezone
+
+import pytest
+
+from app.core.database import Base, SessionLocal, engine
+from app.db.models import dispatch_ledger, price_alert, subscription, ticker_snapshot, user  # noqa: F401  (register tables)
+from app.db.models.dispatch_ledger import DispatchLedgerEntry
+from app.db.models.price_alert import PriceAlert
+from app.db.models.subscription import Subscription
+from app.db.repository.profile_repo import CompanyProfileRepository
+from app.db.repository.snapshot_repo import TickerSnapshotRepository
+from app.service.email_service import DispatchClients, EmailService
+from app.service.resident_dispatch import ResidentDispatch
+from app.settings import settings
+from tests.helpers import ModelFinnhub, NullS3, StubSES, make_user
+
+
+@pytest.fixture
+def session():
+    Base.metadata.create_all(bind=engine)
+    db = SessionLocal()
+    try:
+        yield db
+    finally:
+        db.close()
+
+
+def make_service(session, ses):
+    service = EmailService(session=session)
+    service._finnhub_client = ModelFinnhub()
+    service._email_client.ses_client = ses
+    service._s3_client = NullS3()
+    service._history_store = None
+    return service
+
+
+def run_dispatch(session, run_date, ses, user_ids):
+    # Scoped to the test's own users so the run does not grow with the shared DB
+    service = make_service(session, ses)
+    sent = asyncio.run(service.dispatch_daily_updates(run_date=run_date, user_ids=user_ids))
+    return service, service._finnhub_client, sent
+
+
+def test_rerun_skips_sent_users_and_reuses_checkpoint(session):
+    run_date = date(2000, 1, 1) + timedelta(days=random.randrange(10**5))
+    ids = [make_user(session, f"ledger{i}", ["AAPL"]) for i in range(3)]
+    emails = {u.id: u.email for u in session.query(user.User).filter(user.User.id.in_(ids))}
+    already, ok, failing = ids
+
+    service, _, _ = run_dispatch(session, run_date, StubSES(latency=0), ids)  # warm-up creates the checkpoint
+    session.query(DispatchLedgerEntry).filter_by(run_date=run_date).filter(
+        DispatchLedgerEntry.user_id.in_([ok, failing])
+    ).delete(synchronize_session=False)
+    session.commit()
+
+    # Resume: `already` is in the ledger, `failing` is rejected by SES
+    ses = StubSES(latency=0, fail_for=emails[failing])
+    service, finnhub, _ = run_dispatch(session, run_date, ses, ids)
+    assert emails[ok] in ses.sent and emails[already] not in ses.sent
+    assert finnhub.calls == {}  # every ticker came from the checkpoint
+    assert service._send_stats["skipped_already_sent"] >= 1
+
+    ledger = {
+        row.user_id: row
+        for row in session.query(DispatchLedgerEntry).filter_by(run_date=run_date).filter(
+            DispatchLedgerEntry.user_id.in_(ids)
+        )
+    }
+    assert ledger[ok].status == "sent" and ledger[ok].message_id
+    assert ledger[failing].status == "failed" and ledger[failing].error
+
+    # Only the failed user is retried on the next run
+    ses = StubSES(latency=0)
+    run_dispatch(session, run_date, ses, ids)
+    assert ses.sent == [emails[failing]]
+
+
+def test_cancelled_run_records_every_send_ses_accepted(session, monkeypatch):
+    # The resident scheduler cancels a digest that outlives its shutdown grace
+    monkeypatch.setattr(settings, "EMAIL_SEND_WORKERS", 2)
+    run_date = date(2000, 1, 1) + timedelta(days=random.randrange(10**5))
+    ids = [make_user(session, f"cancel{i}", ["AAPL"]) for i in range(6)]
+    emails = {u.id: u.email for u in session.query(user.User).filter(user.User.id.in_(ids))}
+    ses = StubSES(latency=0.05)
+    service = make_service(session, ses)
+
+    async def cancel_mid_run():
+        task = asyncio.create_task(service.dispatch_daily_updates(run_date=run_date, user_ids=ids))
+        while not ses.in_flight:
+            await asyncio.sleep(0.001)
+        task.cancel()
+        with pytest.raises(asyncio.CancelledError):
+            await task
+
+    asyncio.run(cancel_mid_run())
+    assert 0 < len(ses.sent) < len(ids)
+    recorded = session.query(DispatchLedgerEntry).filter_by(run_date=run_date, status="sent").filter(
+        DispatchLedgerEntry.user_id.in_(ids)
+    )
+    assert sorted(emails[row.user_id] for row in recorded) == sorted(ses.sent)
+
+
+def test_run_persists_ticker_snapshots(session):
+    run_date = date(2000, 1, 1) + timedelta(days=random.randrange(10**5))
+    user_ids = [make_user(session, "snapshot", ["SNAPA", "SNAPB"])]
+
+    run_dispatch(session, run_date, StubSES(latency=0), user_ids)
+
+    latest = TickerSnapshotRepository(session).latest_for(["snapa", "SNAPB", "NEVER"])
+    assert set(latest) == {"SNAPA", "SNAPB"}
+    assert latest["SNAPA"].current_price == 10 and latest["SNAPA"].name == "SNAPA Inc"
+
+
+def test_stored_profiles_are_reused_on_later_runs(session):
+    run_date = date(2000, 1, 1) + timedelta(days=random.randrange(10**5))
+    user_ids = [make_user(session, "profiles", ["PROFA", "PROFB"])]
+
+    run_dispatch(session, run_date, StubSES(latency=0), user_ids)
+    stored = CompanyProfileRepository(session).load(["PROFA", "profb"])
+    assert stored["profb"].profile.name == "PROFB Inc"
+
+    # A later date has no checkpoint, so quotes are refetched but profiles are not
+    _, finnhub, _ = run_dispatch(session, run_date + timedelta(days=1), StubSES(latency=0), user_ids)
+    assert finnhub.calls.get(("quote", "PROFA")) == 1
+    assert ("profile", "PROFA") not in finnhub.calls
+
+
+def test_resumed_run_skips_alerts_on_checkpointed_quotes(session):
+    run_date = date(2000, 1, 1) + timedelta(days=random.randrange(10**5))
+    user_id = make_user(session, "alerts", ["ALRT"])
+    run_dispatch(session, run_date, StubSES(latency=0), [user_id])  # creates the checkpoint
+
+    sub_id = session.query(Subscription.id).filter_by(user_id=user_id, ticker="ALRT").scalar()
+    alert = PriceAlert(subscription_id=sub_id, kind="above", threshold=1.0)
+    session.add(alert)
+    session.commit()
+
+    # Resume: ALRT's quote (10.0) comes from the checkpoint, so the alert is not checked against it
+    service, finnhub, _ = run_dispatch(session, run_date, StubSES(latency=0), [user_id])
+    assert finnhub.calls == {}
+    session.refresh(alert)
+    assert alert.active and service._alert_stats == {}
+
+    # A fresh fetch on the next day fires it
+    service, _, _ = run_dispatch(session, run_date + timedelta(days=1), StubSES(latency=0), [user_id])
+    session.refresh(alert)
+    assert not alert.active and alert.triggered_price == 10.0
+
+
+def test_summary_log_is_filed_under_the_run_date(session):
+    # A catch-up run started the next day still belongs to its slot's date
+    run_date = date(2000, 1, 1) + timedelta(days=random.randrange(10**5))
+    user_ids = [make_user(session, "s3key", ["AAPL"])]
+    service, _, _ = run_dispatch(session, run_date, StubSES(latency=0), user_ids)
+    assert service._s3_client.keys == [f"daily_logs/{run_date.isoformat()}.json"]
+
+
+class CountingEvaluator:
+    def __init__(self):
+        self.batches = []
+
+    async def evaluate_and_notify(self, stock_data):
+        self.batches.append(stock_data)
+        return {"triggered": 0}
+
+
+def test_each_refreshed_batch_is_evaluated_once(session):
+    make_user(session, "resident", ["RSDT"])
+    clients = DispatchClients(finnhub_client=ModelFinnhub(), email_client=None, s3_client=NullS3(), history_store=None)
+    dispatch = ResidentDispatch(clients=clients)
+    evaluator = dispatch._alert_evaluator = CountingEvaluator()
+
+    slot = datetime(2024, 1, 2, 15, 5, tzinfo=timezone.utc)
+    assert asyncio.run(dispatch.refresh_quotes(slot)) >= 1
+    assert dispatch.quotes_slot == slot
+    assert len(evaluator.batches) == 1 and "RSDT" in evaluator.batches[0]
+    assert [job.name for job in dispatch.jobs()] == ["quote_refresh", "daily_digest"]
+    asyncio.run(dispatch.aclose())
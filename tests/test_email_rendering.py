@@ -0,0 +1,42 @@
+"""
+Tests for email body rendering (per-ticker fragments, per-portfolio sections).
+"""
+
+from app.core.integrations.email_client import EmailClient, StockUpdateRenderer
+from app.core.integrations.finnhub_schema import CompanyProfileOutput, StockQuoteOutput
+
+
+def ticker_data(ticker, price):
+    return {
+        "quote": StockQuoteOutput.model_validate({"c": price, "h": price + 1, "l": price - 1, "o": price, "pc": price, "t": 1}),
+        "profile": CompanyProfileOutput(country="US", currency="USD", exchange="NASDAQ", name=f"{ticker} Corp", ticker=ticker),
+    }
+
+
+STOCK_DATA = {
+    "AAPL": ticker_data("AAPL", 190.0),
+    "MSFT": ticker_data("MSFT", 410.0),
+    "TSLA": {"quote": None, "profile": None},
+}
+
+
+def test_renderer_matches_format_message():
+    renderer = StockUpdateRenderer(STOCK_DATA)
+    portfolio = renderer.portfolio_key(["MSFT", "AAPL", "NOPE"])
+
+    assert portfolio == ("AAPL", "MSFT")
+    expected = EmailClient()._format_message("Ada", {t: STOCK_DATA[t] for t in portfolio})
+    assert renderer.render("Ada", portfolio) == expected
+    assert expected.startswith("Hello Ada,\n\n")
+    assert "--- AAPL (AAPL Corp) ---\nCurrent Price: 190.0\nDaily High: 191.0\n" in expected
+
+
+def test_section_rendered_once_per_distinct_portfolio():
+    renderer = StockUpdateRenderer(STOCK_DATA)
+    a = renderer.render("Ada", renderer.portfolio_key(["AAPL", "MSFT"]))
+    b = renderer.render("Bob", renderer.portfolio_key(["MSFT", "AAPL", "AAPL"]))
+    c = renderer.render("Cy", renderer.portfolio_key(["TSLA"]))
+
+    assert renderer.distinct_portfolios == 2
+    assert a.replace("Ada", "Bob") == b
+    assert "--- TSLA (N/A) ---\nCurrent Price: N/A\n" in c and "Website: #\n" in c
@@ -0,0 +1,147 @@
+"""
+Tests for the concurrent SES send stage.
+
+A small in-process SES stand-in (`StubSES`, in tests/helpers.py)
+replaces the boto3 client: it records messages, tracks concurrency and
+can answer with throttling errors the way SES does when the account's
+max send rate is exceeded.
+"""
+
+import asyncio
+import time
+
+import pytest
+
+from app.core.integrations.email_client import EmailClient
+from app.core.integrations.email_send_stage import EmailSendStage, SendJob
+from tests.helpers import StubSES
+
+
+def make_stage(ses, **kwargs):
+    client = EmailClient()
+    client.ses_client = ses
+    return EmailSendStage(client, base_backoff_seconds=0.001, **kwargs)
+
+
+async def run_stage(stage, send_jobs, **kwargs):
+    try:
+        return await stage.run(send_jobs, **kwargs)
+    finally:
+        await stage.aclose()
+
+
+def jobs(n):
+    return (SendJob(user_id=i, recipient_email=f"user{i}@example.com", first_name="Test", body="hi") for i in range(n))
+
+
+def test_sends_concurrently_with_bounded_workers():
+    ses = StubSES(latency=0.02)
+    stage = make_stage(ses, max_workers=4, max_send_rate=1000)
+    results = []
+    stats = asyncio.run(run_stage(stage, jobs(20), on_result=results.append))
+
+    assert stats["sent"] == 20 and stats["failed"] == 0
+    assert ses.peak == 4
+    assert all(r.ok for r in results)
+    assert stats["latency"]["count"] == 20 and stats["latency"]["p95_ms"] >= 20
+
+
+def test_stays_under_max_send_rate():
+    ses = StubSES(latency=0)
+    stage = make_stage(ses, max_workers=16, max_send_rate=50)
+    started = time.perf_counter()
+    asyncio.run(run_stage(stage, jobs(75)))
+
+    # 50 go out in the first one-second burst, the remaining 25 need ~0.5s of refill
+    assert time.perf_counter() - started >= 0.45
+    assert len(ses.sent) == 75
+
+
+def test_retries_throttling_but_not_rejections():
+    ses = StubSES(throttle_first=3, fail_for="user2@example.com")
+    stage = make_stage(ses, max_workers=1, max_send_rate=1000, max_throttle_retries=5)
+    results = []
+    stats = asyncio.run(run_stage(stage, jobs(4), on_result=results.append))
+
+    assert stats["throttled_retries"] == 3
+    assert stats["sent"] == 3 and stats["failed"] == 1
+    failed = [r for r in results if not r.ok]
+    assert failed[0].job.recipient_email == "user2@example.com" and failed[0].attempts == 1
+
+
+def test_worker_error_outside_a_send_fails_the_run():
+    ses = StubSES(latency=0.005)
+    stage = make_stage(ses, max_workers=2, max_send_rate=1000)
+
+    def on_result(result):
+        if result.job.user_id == 3:
+            raise RuntimeError("ledger write failed")
+
+    with pytest.raises(RuntimeError, match="ledger write failed"):
+        asyncio.run(run_stage(stage, jobs(50), on_result=on_result))
+    # No new sends start once a worker has failed
+    assert len(ses.sent) < 50
+
+
+def test_failing_jobs_iterator_drains_started_workers():
+    ses = StubSES(latency=0.02)
+    stage = make_stage(ses, max_workers=4, max_send_rate=1000)
+    results = []
+
+    async def failing_jobs():
+        for job in jobs(3):
+            yield job
+        await asyncio.sleep(0.01)  # the three sends are with SES by now
+        raise RuntimeError("recipient query failed")
+
+    async def run_and_fail():
+        with pytest.raises(RuntimeError, match="recipient query failed"):
+            await stage.run(failing_jobs(), on_result=results.append)
+        reported = len(results)
+        await stage.aclose()
+        return reported
+
+    # The started sends finished and were reported before run() raised
+    assert asyncio.run(run_and_fail()) == len(ses.sent) == 3
+
+
+def test_cancelled_run_reports_every_send_ses_accepted():
+    ses = StubSES(latency=0.05)
+    stage = make_stage(ses, max_workers=4, max_send_rate=1000)
+    results = []
+
+    async def cancel_mid_run():
+        task = asyncio.create_task(stage.run(jobs(20), on_result=results.append))
+        while not ses.in_flight:
+            await asyncio.sleep(0.001)
+        task.cancel()
+        with pytest.raises(asyncio.CancelledError):
+            await task
+        reported = [r.job.recipient_email for r in results if r.ok]
+        await stage.aclose()
+        return reported
+
+    reported = asyncio.run(cancel_mid_run())
+    # Sends already with SES when the run was cancelled were waited for and reported
+    assert 0 < len(ses.sent) < 20
+    assert sorted(reported) == sorted(ses.sent)
+
+
+def test_bulk_mode_packs_fifty_recipients_per_call():
+    ses = StubSES(fail_for="user7@example.com")
+    stage = make_stage(ses, max_workers=2, max_send_rate=1000, mode="bulk", template_name="test-template")
+    results = []
+    jobs = (
+        SendJob(user_id=i, recipient_email=f"user{i}@example.com", first_name=f"U{i}", ticker_section="--- AAPL ---\n")
+        for i in range(120)
+    )
+    stats = asyncio.run(run_stage(stage, jobs, on_result=results.append))
+
+    assert ses.bulk_calls == 3 and stats["api_calls"] == 3
+    assert stats["sent"] == 119 and stats["failed"] == 1
+    assert len(results) == 120
+    assert [r.job.recipient_email for r in results if not r.ok] == ["user7@example.com"]
+    assert ("user3@example.com", "U3", "--- AAPL ---\n") in ses.sent
+    text = ses.templates["test-template"]["TextPart"]
+    # Neither value is HTML-escaped in the plain-text part
+    assert text.startswith("Hello {{{first_name}}},") and "{{{ticker_section}}}" in text
@@ -26,8 +26,11 @@ async def main():
     session = SessionLocal()
     try:
         email_service = EmailService(session=session)
-        sent_count = await email_service.dispatch_daily_updates()
-        print(f"Emails sent: {sent_count}")
+        try:
+            sent_count = await email_service.dispatch_daily_updates()
+            print(f"Emails sent: {sent_count}")
+        finally:
+            await email_service.aclose()
     finally:
         session.close()
 
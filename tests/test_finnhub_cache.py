@@ -0,0 +1,91 @@
+"""
+Tests for the Finnhub response cache.
+
+The tests use an injected clock so TTL expiry is deterministic.
+"""
+
+import asyncio
+import time
+
+from app.core.integrations.finnhub_cache import (
+    CachePolicy,
+    FinnhubCache,
+    MemoryCacheBackend,
+    QUOTE,
+)
+from app.core.integrations.finnhub_client import FinnhubClient
+from app.core.integrations.finnhub_transport import ThreadTransport
+
+
+class FakeClock:
+    def __init__(self, now: float = 1_000.0):
+        self.now = now
+
+    def __call__(self) -> float:
+        return self.now
+
+
+class CountingFinnhub:
+    """Stand-in for finnhub.Client that counts upstream calls."""
+
+    def __init__(self):
+        self.calls = 0
+
+    def quote(self, symbol):
+        self.calls += 1
+        return {"c": 10.0, "h": 11.0, "l": 9.0, "o": 9.5, "pc": 9.8, "t": 1700000000}
+
+    def company_profile2(self, symbol):
+        self.calls += 1
+        return {"country": "US", "currency": "USD", "exchange": "NASDAQ", "name": "Apple Inc", "ticker": symbol}
+
+
+# A second, slower-changing endpoint to check policies are per endpoint
+DAILY = "daily"
+
+
+def make_cache(clock):
+    return FinnhubCache(
+        {
+            QUOTE: CachePolicy(ttl_seconds=60, max_entries=2),
+            DAILY: CachePolicy(ttl_seconds=3600, max_entries=2),
+        },
+        clock=clock,
+    )
+
+
+def test_memory_backend_evicts_least_recently_used():
+    backend = MemoryCacheBackend(max_entries=2, clock=FakeClock())
+    backend.set("a", 1, expires_at=2_000)
+    backend.set("b", 2, expires_at=2_000)
+    assert backend.get("a") == 1  # touch "a" so "b" becomes the LRU entry
+    backend.set("c", 3, expires_at=2_000)
+    assert backend.get("b") is None
+    assert backend.get("a") == 1 and backend.get("c") == 3
+
+
+def test_per_endpoint_ttl_expiry():
+    clock = FakeClock()
+    cache = make_cache(clock)
+    cache.set(QUOTE, "aapl", {"c": 1})
+    cache.set(DAILY, "AAPL", {"c": [1, 2]})
+
+    clock.now += 120  # past the quote TTL, within the daily TTL
+    assert cache.get(QUOTE, "AAPL") is None
+    assert cache.get(DAILY, "aapl") == {"c": [1, 2]}
+    assert cache.stats()[QUOTE]["misses"] == 1
+    assert cache.stats()[DAILY]["hits"] == 1
+
+
+def test_client_caches_quotes_but_not_profiles():
+    upstream = CountingFinnhub()
+    client = FinnhubClient(cache=make_cache(FakeClock(time.time())), transport=ThreadTransport(upstream))
+
+    async def run():
+        for _ in range(3):
+            await client.get_stock_quote("AAPL")
+            await client.get_company_profile("AAPL")
+
+    asyncio.run(run())
+    # One quote call; profiles are stored by the dispatch in `company_profiles`, not here
+    assert upstream.calls == 1 + 3
@@ -0,0 +1,85 @@
+"""
+Tests for the FetchScheduler that rate-limits upstream Finnhub calls.
+
+Rates are kept high (or backoffs tiny) so the tests finish quickly while
+still exercising throttling, the in-flight cap and 429 handling.
+"""
+
+import asyncio
+
+import pytest
+
+from app.core.integrations.finnhub_client import FetchScheduler
+
+
+class RateLimited(Exception):
+    status_code = 429
+
+
+def test_caps_requests_in_flight():
+    scheduler = FetchScheduler(calls_per_second=1000, calls_per_minute=60000, max_in_flight=3)
+    in_flight = 0
+    peak = 0
+
+    async def call():
+        nonlocal in_flight, peak
+        in_flight += 1
+        peak = max(peak, in_flight)
+        await asyncio.sleep(0.01)
+        in_flight -= 1
+        return "ok"
+
+    async def run():
+        return await asyncio.gather(*(scheduler.submit(call) for _ in range(12)))
+
+    assert asyncio.run(run()) == ["ok"] * 12
+    assert peak == 3
+    assert scheduler.stats()["calls"] == 12
+
+
+def test_throttles_once_burst_is_spent():
+    scheduler = FetchScheduler(calls_per_second=50, calls_per_minute=60000, max_in_flight=100)
+
+    async def call():
+        return 1
+
+    async def run():
+        await asyncio.gather(*(scheduler.submit(call) for _ in range(60)))
+
+    asyncio.run(run())
+    stats = scheduler.stats()
+    assert stats["calls"] == 60
+    assert stats["throttled"] >= 10
+
+
+def test_retries_rate_limited_calls():
+    scheduler = FetchScheduler(
+        calls_per_second=1000, calls_per_minute=60000, max_in_flight=5,
+        max_429_retries=3, base_backoff_seconds=0.001,
+    )
+    attempts = 0
+
+    async def flaky():
+        nonlocal attempts
+        attempts += 1
+        if attempts < 3:
+            raise RateLimited()
+        return "quote"
+
+    assert asyncio.run(scheduler.submit(flaky)) == "quote"
+    assert scheduler.stats()["rejected"] == 2
+    assert scheduler.stats()["rate_scale"] < 1.0
+
+
+def test_gives_up_after_max_retries():
+    scheduler = FetchScheduler(
+        calls_per_second=1000, calls_per_minute=60000, max_in_flight=5,
+        max_429_retries=1, base_backoff_seconds=0.001,
+    )
+
+    async def always_limited():
+        raise RateLimited()
+
+    with pytest.raises(RateLimited):
+        asyncio.run(scheduler.submit(always_limited))
+    assert scheduler.stats()["calls"] == 2
@@ -0,0 +1,69 @@
+"""
+Tests for the native async Finnhub transport.
+
+httpx.MockTransport stands in for the Finnhub REST API so no network
+access or API key is needed.
+"""
+
+import asyncio
+
+import httpx
+import pytest
+
+from app.core.integrations.finnhub_cache import FinnhubCache
+from app.core.integrations.finnhub_client import FetchScheduler, FinnhubClient, upstream_status_code
+from app.core.integrations.finnhub_transport import AsyncHttpTransport
+
+QUOTE = {"c": 187.2, "h": 189.0, "l": 185.1, "o": 186.0, "pc": 185.9, "t": 1700000000}
+PROFILE = {"country": "US", "currency": "USD", "exchange": "NASDAQ", "name": "Apple Inc", "ticker": "AAPL"}
+
+
+def make_transport(handler):
+    return AsyncHttpTransport(api_key="test-key", http_transport=httpx.MockTransport(handler))
+
+
+def test_async_transport_keeps_public_contract():
+    seen = []
+
+    def handler(request: httpx.Request) -> httpx.Response:
+        seen.append((request.url.path, request.url.params.get("symbol"), request.headers.get("X-Finnhub-Token")))
+        body = QUOTE if request.url.path.endswith("/quote") else PROFILE
+        return httpx.Response(200, json=body)
+
+    transport = make_transport(handler)
+    # An empty policy map disables caching, so every lookup goes upstream
+    client = FinnhubClient(cache=FinnhubCache({}), transport=transport)
+
+    async def run():
+        try:
+            quote = await client.get_stock_quote("aapl")
+            profile = await client.get_company_profile("aapl")
+            pool = transport._client
+            await client.get_stock_quote("aapl")
+            assert transport._client is pool  # one shared connection pool per run
+            return quote, profile
+        finally:
+            await client.aclose()
+
+    quote, profile = asyncio.run(run())
+    assert quote.current_price == 187.2
+    assert profile.name == "Apple Inc"
+    assert seen[0] == ("/api/v1/quote", "AAPL", "test-key")
+    assert seen[1] == ("/api/v1/stock/profile2", "AAPL", "test-key")
+    assert transport._client is None
+
+
+def test_async_transport_errors_expose_status_for_backoff():
+    transport = make_transport(lambda request: httpx.Response(429, headers={"Retry-After": "0"}, json={"error": "limit"}))
+    scheduler = FetchScheduler(calls_per_second=100, calls_per_minute=6000, max_in_flight=2, max_429_retries=1)
+
+    async def run():
+        try:
+            await scheduler.submit(lambda: transport.quote("AAPL"))
+        finally:
+            await transport.aclose()
+
+    with pytest.raises(httpx.HTTPStatusError) as info:
+        asyncio.run(run())
+    assert upstream_status_code(info.value) == 429
+    assert scheduler.stats()["rejected"] == 1
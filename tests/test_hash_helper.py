@@ -0,0 +1,45 @@
+"""
+Tests for the async bcrypt helpers and their bounded executor.
+"""
+
+import asyncio
+import time
+
+from app.core.security.hashHelper import HashHelper, HashQueueFull, _BoundedHashExecutor
+
+
+def test_async_hash_round_trip():
+    async def run():
+        hashed = await HashHelper.get_password_hash_async("s3cret")
+        return (
+            await HashHelper.verify_password_async("s3cret", hashed),
+            await HashHelper.verify_password_async("wrong", hashed),
+        )
+
+    assert asyncio.run(run()) == (True, False)
+
+
+def test_executor_rejects_beyond_queue_limit():
+    pool = _BoundedHashExecutor(max_workers=1, max_queue=2)
+
+    async def run():
+        return await asyncio.gather(*(pool.run(time.sleep, 0.05) for _ in range(3)), return_exceptions=True)
+
+    results = asyncio.run(run())
+    assert sum(isinstance(r, HashQueueFull) for r in results) == 1
+    assert pool.rejected == 1 and pool.outstanding == 0
+
+
+def test_event_loop_stays_responsive_while_hashing():
+    async def run():
+        task = asyncio.create_task(HashHelper.get_password_hash_async("s3cret"))
+        worst = 0.0
+        while not task.done():
+            started = time.perf_counter()
+            await asyncio.sleep(0.001)
+            worst = max(worst, time.perf_counter() - started)
+        await task
+        return worst
+
+    # A bcrypt hash takes ~200ms+; the loop must keep ticking meanwhile
+    assert asyncio.run(run()) < 0.1
@@ -0,0 +1,63 @@
+"""
+Tests for the vectorized technical indicators and how they reach the email.
+
+Expected values are worked out by hand on short, regular price series.
+"""
+
+import time
+
+import numpy as np
+
+from app.core.integrations.email_client import render_ticker_fragment
+from app.service.email_service import _snapshot_from_json, _snapshot_to_json
+from app.util.indicators import compute_indicators, indicators_by_ticker, pack_closes
+
+
+def test_known_values():
+    closes = np.array([[10.0, 11.0, 10.0, 11.0, 12.0]])
+    values = compute_indicators(closes, sma_window=3, rsi_window=4, volatility_window=2)
+
+    assert values["sma"][0] == 11.0
+    assert round(values["daily_change_pct"][0], 4) == 9.0909
+    # Gains 1 + 1 + 1 vs. one loss of 1 over four deltas -> RS 3 -> RSI 75
+    assert values["rsi"][0] == 75.0
+    returns = np.diff(np.log([10.0, 11.0, 12.0]))
+    assert np.isclose(values["volatility"][0], returns.std(ddof=1) * np.sqrt(252))
+
+
+def test_rising_series_has_rsi_100_and_short_history_is_none():
+    result = indicators_by_ticker({"UP": [1, 2, 3, 4, 5], "ONE": [7.0]}, sma_window=3, rsi_window=4, volatility_window=4)
+
+    assert result["UP"].rsi == 100.0
+    assert result["UP"].sma == 4.0
+    assert result["ONE"].sma is None and result["ONE"].rsi is None
+    assert result["ONE"].daily_change_pct is None
+
+
+def test_pack_closes_right_aligns_and_pads():
+    tickers, packed = pack_closes({"A": [1, 2, 3], "B": [4]}, max_days=2)
+    assert tickers == ["A", "B"]
+    assert packed[0].tolist() == [2.0, 3.0]
+    assert np.isnan(packed[1, 0]) and packed[1, 1] == 4.0
+
+
+def test_thousands_of_tickers_in_one_pass():
+    rng = np.random.default_rng(0)
+    closes = 100 * np.exp(np.cumsum(rng.normal(0, 0.01, size=(5000, 60)), axis=1))
+    started = time.perf_counter()
+    values = compute_indicators(closes)
+    assert time.perf_counter() - started < 0.5
+    assert values["rsi"].shape == (5000,)
+    assert np.all((values["rsi"] >= 0) & (values["rsi"] <= 100))
+
+
+def test_indicators_survive_checkpoint_and_render():
+    indicators = indicators_by_ticker({"AAPL": [float(p) for p in range(100, 130)]})["AAPL"]
+    restored = _snapshot_from_json(_snapshot_to_json({"AAPL": {"quote": None, "profile": None, "indicators": indicators}}))
+    assert restored["AAPL"]["indicators"] == indicators
+
+    fragment = render_ticker_fragment("AAPL", restored["AAPL"])
+    assert "RSI (14d): 100.00" in fragment
+    assert "SMA (20d): 119.50" in fragment
+    assert "Daily Change: 0.78%" in fragment
+    assert "RSI" not in render_ticker_fragment("AAPL", {"quote": None, "profile": None})
@@ -0,0 +1,157 @@
+"""
+Tests for the resident dispatch's JobScheduler, driven by a fake clock so
+hours of schedule run instantly: cadence and jitter, skipping overlapping
+runs, and catching up on missed slots.
+"""
+
+import asyncio
+import random
+from datetime import datetime, time, timedelta, timezone
+
+from app.core.job_scheduler import Job, JobScheduler
+
+START = datetime(2024, 5, 1, 12, 0, tzinfo=timezone.utc).timestamp()
+
+
+class FakeTime:
+    """Wall clock that sleeping advances; stops the scheduler once past `end`."""
+
+    def __init__(self, now: float, end: float):
+        self.now = now
+        self.end = end
+
+    def clock(self) -> float:
+        return self.now
+
+    async def sleep(self, seconds: float) -> None:
+        await asyncio.sleep(0)  # let jobs started at the current time run first
+        self.now += seconds
+        if self.now > self.end:
+            raise asyncio.CancelledError
+
+
+def run_scheduler(jobs, start: float, hours: float, jitter_seed: int = 0) -> JobScheduler:
+    fake = FakeTime(start, start + hours * 3600)
+    scheduler = JobScheduler(jobs, clock=fake.clock, sleep=fake.sleep, rng=random.Random(jitter_seed))
+
+    async def drive():
+        try:
+            await scheduler.run()
+        except asyncio.CancelledError:
+            pass
+        await scheduler.aclose(timeout=0)
+
+    asyncio.run(drive())
+    return scheduler
+
+
+def recorder(slots: list):
+    async def run(slot: datetime) -> None:
+        slots.append(slot)
+    return run
+
+
+def test_interval_job_runs_once_per_slot_with_jitter_and_startup_catch_up():
+    slots, starts = [], []
+    fake_start = START + 90  # 12:01:30, between 5-minute slots
+
+    async def run(slot):
+        slots.append(slot)
+        starts.append(fake.now)
+
+    every = timedelta(minutes=5)
+    fake = FakeTime(fake_start, fake_start + 3600)
+    scheduler = JobScheduler(
+        [Job("refresh", run, every=every, jitter_seconds=30, catch_up=every)],
+        clock=fake.clock, sleep=fake.sleep, rng=random.Random(1),
+    )
+
+    async def drive():
+        try:
+            await scheduler.run()
+        except asyncio.CancelledError:
+            pass
+
+    asyncio.run(drive())
+    # The 12:00 slot is caught up at startup, then one run per 5-minute slot
+    assert slots[0] == datetime(2024, 5, 1, 12, 0, tzinfo=timezone.utc)
+    assert len(slots) == 13 and len(set(slots)) == 13
+    assert all((b - a) == every for a, b in zip(slots, slots[1:]))
+    # Jitter delays starts by up to 30s after their slot, never before it
+    offsets = [start - slot.timestamp() for start, slot in zip(starts[1:], slots[1:])]
+    assert all(0 <= o <= 30 for o in offsets) and len(set(offsets)) > 1
+
+
+def test_daily_job_catches_up_only_within_window():
+    late, too_late = [], []
+    digest_at = time(11, 0)
+    catch_up = timedelta(hours=2)
+    # Started at 12:00, an hour after the 11:00 slot: runs now, for that day
+    run_scheduler([Job("digest", recorder(late), daily_at=digest_at, catch_up=catch_up)], START, hours=1)
+    assert late == [datetime(2024, 5, 1, 11, 0, tzinfo=timezone.utc)]
+    # Started at 14:00: outside the window, so the next run is tomorrow's
+    run_scheduler([Job("digest", recorder(too_late), daily_at=digest_at, catch_up=catch_up)], START + 7200, hours=22)
+    assert too_late == [datetime(2024, 5, 2, 11, 0, tzinfo=timezone.utc)]
+
+
+def test_overlapping_slots_are_skipped():
+    release = None
+    started = []
+
+    async def slow(slot):
+        started.append(slot)
+        await release.wait()  # still running when later slots come up
+
+    async def drive():
+        nonlocal release
+        release = asyncio.Event()
+        fake = FakeTime(START, START + 1800)
+        scheduler = JobScheduler([Job("slow", slow, every=timedelta(minutes=5))], clock=fake.clock, sleep=fake.sleep)
+        try:
+            await scheduler.run()
+        except asyncio.CancelledError:
+            pass
+        stats = scheduler.stats()["slow"]
+        release.set()
+        await scheduler.aclose(timeout=1)
+        return stats
+
+    stats = asyncio.run(drive())
+    assert len(started) == 1
+    assert stats["runs"] == 1 and stats["skipped_overlap"] == 5 and stats["running"]
+
+
+def test_missed_slots_are_coalesced_into_one_catch_up_run():
+    slots = []
+    every = timedelta(minutes=5)
+    fake = FakeTime(START, START + 3600)
+    job = Job("alerts", recorder(slots), every=every, catch_up=timedelta(minutes=15))
+    scheduler = JobScheduler([job], clock=fake.clock, sleep=fake.sleep)
+
+    async def drive():
+        task = asyncio.create_task(scheduler.run())
+        await asyncio.sleep(0)
+        fake.now += 12 * 60  # host suspended for 12 minutes: slots 12:05 and 12:10 missed
+        try:
+            await task
+        except asyncio.CancelledError:
+            pass
+
+    asyncio.run(drive())
+    stats = scheduler.stats()["alerts"]
+    assert stats["missed"] == 0 and stats["failures"] == 0
+    # Woken at 12:13 (sleeps are capped at a minute): 12:05 runs once, 8 minutes
+    # late but within the window, and stands in for 12:10; the grid resumes at 12:15
+    assert slots[:3] == [datetime(2024, 5, 1, 12, m, tzinfo=timezone.utc) for m in (0, 5, 15)]
+
+
+def test_job_failures_are_counted_and_do_not_stop_the_schedule():
+    calls = []
+
+    async def flaky(slot):
+        calls.append(slot)
+        raise RuntimeError("upstream down")
+
+    scheduler = run_scheduler([Job("flaky", flaky, every=timedelta(minutes=10))], START, hours=1)
+    stats = scheduler.stats()["flaky"]
+    assert stats["runs"] == len(calls) == 6 and stats["failures"] == 6
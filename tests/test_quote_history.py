@@ -0,0 +1,83 @@
+"""
+Tests for the columnar quote history store (QuoteHistoryStore).
+
+Each test writes partitions under pytest's tmp_path, so nothing touches
+the configured QUOTE_HISTORY_DIR.
+"""
+
+import asyncio
+from datetime import date
+import time
+
+import numpy as np
+
+from app.core.integrations.finnhub_schema import StockQuoteOutput
+from app.core.quote_history import QuoteHistoryStore
+from app.service.email_service import EmailService
+from tests.helpers import InMemoryProfileRepo, ModelFinnhub
+
+
+def quote(price: float, ts: int = 1700000000) -> dict:
+    return {"quote": StockQuoteOutput.model_validate(
+        {"c": price, "h": price + 1, "l": price - 1, "o": price, "pc": price - 0.5, "t": ts}
+    )}
+
+
+def test_append_and_read_aligns_tickers_and_dates(tmp_path):
+    store = QuoteHistoryStore(str(tmp_path))
+    store.append(date(2024, 1, 2), {"AAPL": quote(10), "MSFT": quote(20)})
+    store.append(date(2024, 1, 3), {"msft": quote(21), "NVDA": quote(30), "NOPE": {"quote": None}})
+
+    history = QuoteHistoryStore(str(tmp_path)).read(["MSFT", "AAPL", "NVDA", "UNKNOWN"])
+    assert history.dates.tolist() == [date(2024, 1, 2), date(2024, 1, 3)]
+    close = history["current_price"]
+    assert close[0].tolist() == [20.0, 21.0]
+    assert close[1, 0] == 10.0 and np.isnan(close[1, 1])
+    assert np.isnan(close[2, 0]) and close[2, 1] == 30.0
+    assert np.isnan(close[3]).all()
+    assert history["timestamp"][0].tolist() == [1700000000, 1700000000]
+    assert history["high_price"][0, 1] == 22.0
+
+
+def test_reappending_a_date_merges_and_refreshes_readers(tmp_path):
+    store = QuoteHistoryStore(str(tmp_path))
+    reader = QuoteHistoryStore(str(tmp_path))
+    day = date(2024, 1, 2)
+    store.append(day, {"AAPL": quote(10), "MSFT": quote(20)})
+    assert reader.read(["AAPL"])["current_price"].tolist() == [[10.0]]
+
+    assert store.append(day, {"AAPL": quote(11), "GOOG": quote(5)}) == 3
+    history = reader.read(["AAPL", "MSFT", "GOOG"], start=day, end=day)
+    assert history["current_price"][:, 0].tolist() == [11.0, 20.0, 5.0]
+    assert reader.read(["AAPL"], start=date(2024, 1, 3))["current_price"].shape == (1, 0)
+
+
+def test_year_of_history_reads_fast(tmp_path):
+    store = QuoteHistoryStore(str(tmp_path))
+    tickers = [f"T{i:04d}" for i in range(2000)]
+    data = {t: quote(1.0) for t in tickers}
+    days = np.arange(np.datetime64("2023-01-01"), np.datetime64("2023-01-01") + 252).tolist()
+    for day in days:
+        store.append(day, data)
+
+    reader = QuoteHistoryStore(str(tmp_path))
+    reader.read(tickers, columns=["current_price"])  # maps the partitions
+    started = time.perf_counter()
+    close = reader.read(tickers, columns=["current_price"])["current_price"]
+    assert time.perf_counter() - started < 0.5
+    assert close.shape == (2000, 252) and not np.isnan(close).any()
+
+
+def test_dispatch_appends_fetched_quotes(tmp_path):
+    service = EmailService(session=None)
+    service._finnhub_client = ModelFinnhub()
+    service._history_store = QuoteHistoryStore(str(tmp_path))
+    service._profile_repo = InMemoryProfileRepo()
+    service._dispatch_repo.load_checkpoint = lambda run_date: None
+    service._dispatch_repo.save_checkpoint = lambda run_date, snapshot: None
+    service._snapshot_repo.bulk_insert = lambda as_of, data: len(data)
+
+    asyncio.run(service._load_or_fetch_stock_data(date(2024, 3, 1), ["AAPL", "MSFT"]))
+    history = QuoteHistoryStore(str(tmp_path)).read(["AAPL", "MSFT"])
+    assert history.dates.tolist() == [date(2024, 3, 1)]
+    assert history["current_price"][:, 0].tolist() == [10.0, 10.0]
@@ -0,0 +1,119 @@
+"""
+Tests for the quote read API: caching, request coalescing and freshness.
+
+A fake Finnhub client counts upstream calls; the API test overrides the
+QuoteService dependency so no network access is needed.
+"""
+
+import asyncio
+
+from fastapi import HTTPException
+from fastapi.testclient import TestClient
+
+from app.core.integrations.finnhub_schema import StockQuoteOutput
+from app.routers.quote import get_quote_service
+from app.service.quote_service import QuoteService
+from app.service.symbol_service import SymbolService
+from main import app
+from tests.test_finnhub_cache import FakeClock
+from tests.test_subscription_flow import auth_headers
+from tests.test_symbols import FIXTURE as SYMBOL_FIXTURE
+
+
+class SlowFinnhub:
+    def __init__(self):
+        self.calls = 0
+
+    async def get_stock_quote(self, ticker):
+        self.calls += 1
+        await asyncio.sleep(0.05)
+        if ticker == "BAD":
+            raise HTTPException(status_code=404, detail=f"Quote for symbol '{ticker}' not found.")
+        return StockQuoteOutput.model_validate({"c": 10, "h": 11, "l": 9, "o": 9.5, "pc": 9.8, "t": 1700000000})
+
+    async def aclose(self):
+        pass
+
+
+def test_concurrent_requests_share_one_upstream_call():
+    clock = FakeClock()
+    upstream = SlowFinnhub()
+    service = QuoteService(finnhub_client=upstream, ttl_seconds=15, clock=clock)
+
+    async def run():
+        first = await asyncio.gather(*(service.get_quote("aapl") for _ in range(10)))
+        clock.now += 5
+        again = await service.get_quote("AAPL")
+        clock.now += 20  # past the TTL
+        refreshed = await service.get_quote("AAPL")
+        return first, again, refreshed
+
+    first, again, refreshed = asyncio.run(run())
+    assert {q.ticker for q in first} == {"AAPL"}
+    assert not any(q.cached for q in first)
+    assert again.cached and again.age_seconds == 5
+    assert not refreshed.cached and refreshed.age_seconds == 0
+    assert upstream.calls == 2
+    assert service.stats()["coalesced"] == 9
+
+
+def test_batch_reports_failures_per_ticker():
+    service = QuoteService(finnhub_client=SlowFinnhub())
+    result = asyncio.run(service.get_quotes(["AAPL", "bad", "aapl"]))
+    assert [q.ticker for q in result.quotes] == ["AAPL"]
+    assert "not found" in result.errors["BAD"]
+
+
+
+def test_unknown_and_not_found_tickers_skip_upstream():
+    clock = FakeClock()
+    upstream = SlowFinnhub()
+    symbols = SymbolService(source_file=SYMBOL_FIXTURE)
+    asyncio.run(symbols.refresh())
+    service = QuoteService(finnhub_client=upstream, clock=clock, not_found_ttl_seconds=60)
+
+    async def lookup(ticker):
+        try:
+            await service.get_quote(ticker)
+        except HTTPException as e:
+            return e.status_code
+
+    # BAD 404s upstream once, then is answered from the negative cache until it expires
+    assert asyncio.run(lookup("BAD")) == 404 and asyncio.run(lookup("bad")) == 404
+    assert upstream.calls == 1
+    clock.now += 61
+    asyncio.run(lookup("BAD"))
+    assert upstream.calls == 2
+
+    # With the symbol universe, symbols that are not listed never go upstream
+    service = QuoteService(finnhub_client=upstream, symbol_service=symbols)
+    assert asyncio.run(lookup("NOTASYMBOL")) == 404
+    assert upstream.calls == 2 and service.stats()["rejected_unknown"] == 1
+
+def test_quote_endpoints():
+    service = QuoteService(finnhub_client=SlowFinnhub())
+    app.dependency_overrides[get_quote_service] = lambda: service
+    try:
+        with TestClient(app) as client:
+            headers = auth_headers(client)
+            r = client.get("/quotes/msft", headers=headers)
+            assert r.status_code == 200, r.text
+            assert r.json()["ticker"] == "MSFT" and r.json()["current_price"] == 10
+
+            r = client.get("/quotes", params={"tickers": "MSFT,BAD"}, headers=headers)
+            body = r.json()
+            assert [q["ticker"] for q in body["quotes"]] == ["MSFT"] and body["quotes"][0]["cached"]
+            assert "BAD" in body["errors"]
+
+            assert client.get("/quotes/BAD", headers=headers).status_code == 404
+            assert client.get("/quotes/MSFT").status_code in (401, 403)
+    finally:
+        app.dependency_overrides.pop(get_quote_service, None)
+
+
+def test_lifespan_shares_one_finnhub_client():
+    with TestClient(app):
+        client = app.state.finnhub_client
+        # One rate-limit scheduler for every upstream caller in the process
+        assert app.state.quote_service._client is client
+        assert app.state.symbol_service._client is client
@@ -1,6 +1,6 @@
 import pytest
 from fastapi.testclient import TestClient
-from tests.test_auth_flow import unique_email
+from tests.helpers import unique_email
 from main import app
 
 
@@ -36,6 +36,10 @@ def test_subscribe_list_and_unsubscribe(client: TestClient):
     assert body["ticker"] == "AAPL"
     sub_id = body["id"]
 
+    # subscribing again (any case) is rejected
+    r = client.post("/subscriptions/", json={"ticker": "aapl"}, headers=headers)
+    assert r.status_code == 400
+
     # list subscriptions
     r = client.get("/subscriptions/", headers=headers)
     assert r.status_code == 200
@@ -50,3 +54,56 @@ def test_subscribe_list_and_unsubscribe(client: TestClient):
     # deleting again should return 404
     r = client.delete(f"/subscriptions/AAPL", headers=headers)
     assert r.status_code == 404
+
+
+def auth_headers(client: TestClient) -> dict:
+    email = unique_email()
+    client.post("/auth/register", json={
+        "first_name": "Batch", "last_name": "Tester", "email": email, "password": "batch-pw",
+    })
+    token = client.post("/auth/login", json={"email": email, "password": "batch-pw"}).json()["token"]
+    return {"Authorization": f"Bearer {token}"}
+
+
+def test_batch_subscribe_and_unsubscribe(client: TestClient):
+    headers = auth_headers(client)
+    assert client.post("/subscriptions/", json={"ticker": "MSFT"}, headers=headers).status_code == 201
+
+    r = client.post("/subscriptions/batch", json={"tickers": ["aapl", "MSFT", "tsla", "AAPL"]}, headers=headers)
+    assert r.status_code == 200, r.text
+    results = r.json()["results"]
+    assert [(x["ticker"], x["status"]) for x in results] == [
+        ("AAPL", "created"), ("MSFT", "exists"), ("TSLA", "created"),
+    ]
+    assert results[0]["id"] and results[1]["id"] is None
+
+    r = client.request("DELETE", "/subscriptions/batch", json={"tickers": ["AAPL", "GOOG"]}, headers=headers)
+    assert r.status_code == 200, r.text
+    assert [(x["ticker"], x["status"]) for x in r.json()["results"]] == [("AAPL", "deleted"), ("GOOG", "not_found")]
+
+    remaining = sorted(s["ticker"] for s in client.get("/subscriptions/", headers=headers).json())
+    assert remaining == ["MSFT", "TSLA"]
+
+    r = client.post("/subscriptions/batch", json={"tickers": []}, headers=headers)
+    assert r.status_code == 422
+
+
+def test_list_pagination_and_conditional_get(client: TestClient):
+    headers = auth_headers(client)
+    client.post("/subscriptions/batch", json={"tickers": ["A", "B", "C"]}, headers=headers)
+
+    r = client.get("/subscriptions/", params={"limit": 2}, headers=headers)
+    assert [s["ticker"] for s in r.json()] == ["A", "B"]
+    cursor = r.headers["X-Next-Cursor"]
+    r = client.get("/subscriptions/", params={"limit": 2, "after": cursor}, headers=headers)
+    assert [s["ticker"] for s in r.json()] == ["C"]
+    assert "X-Next-Cursor" not in r.headers
+
+    r = client.get("/subscriptions/", headers=headers)
+    etag = r.headers["ETag"]
+    r = client.get("/subscriptions/", headers={**headers, "If-None-Match": etag})
+    assert r.status_code == 304 and r.content == b""
+
+    client.delete("/subscriptions/B", headers=headers)
+    r = client.get("/subscriptions/", headers={**headers, "If-None-Match": etag})
+    assert r.status_code == 200 and r.headers["ETag"] != etag
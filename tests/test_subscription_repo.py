@@ -0,0 +1,100 @@
+"""
+Tests for SubscriptionRepository queries used by the email dispatch.
+
+Run against the DB configured in settings; users are created with unique
+emails so existing rows never interfere.
+"""
+
+import asyncio
+
+import pytest
+from sqlalchemy import text
+
+from app.core.database import AsyncSessionLocal, Base, SessionLocal, async_engine, engine
+from app.db.models import subscription, user  # noqa: F401  (register tables)
+from app.db.repository.subscription_repo import (
+    AsyncSubscriptionRepository,
+    DispatchRecipient,
+    SubscriptionRepository,
+)
+from app.scripts.dedupe_subscriptions import dedupe_subscriptions
+from app.util.init_db import ensure_subscription_unique_index
+from tests.helpers import make_user
+
+
+@pytest.fixture
+def session():
+    Base.metadata.create_all(bind=engine)
+    with engine.begin() as conn:
+        ensure_subscription_unique_index(conn)
+    db = SessionLocal()
+    try:
+        yield db
+    finally:
+        db.close()
+
+
+def test_dispatch_recipients_stream_one_row_per_subscribed_user(session):
+    ids = [make_user(session, f"plan{i}", t) for i, t in enumerate((["MSFT", "AAPL"], [], ["AAPL"], ["TSLA"]))]
+    session.expire_all()
+    repo = SubscriptionRepository(session)
+
+    recipients = repo.iter_dispatch_recipients(chunk_size=2)
+    assert not isinstance(recipients, list)  # a generator, paged by keyset
+    streamed = list(recipients)
+    streamed_ids = [r.user_id for r in streamed]
+    by_id = {r.user_id: r for r in streamed}
+
+    assert streamed_ids == sorted(set(streamed_ids))
+    assert ids[1] not in by_id  # users without subscriptions are skipped
+    assert {ids[0], ids[2], ids[3]} <= set(by_id)
+    assert isinstance(by_id[ids[0]], DispatchRecipient)
+    assert by_id[ids[0]].tickers == ("AAPL", "MSFT")
+    assert by_id[ids[0]].first_name == "Stream"
+    assert len(session.identity_map) == 0  # no ORM objects were loaded
+
+    tickers = repo.get_all_unique_tickers()
+    assert {"AAPL", "MSFT", "TSLA"} <= set(tickers) and tickers == sorted(set(tickers))
+
+    # Scoped to some users, both queries only see those users' rows
+    scoped = [r.user_id for r in repo.iter_dispatch_recipients(chunk_size=1, user_ids=ids[:3])]
+    assert scoped == [ids[0], ids[2]]
+    assert repo.get_all_unique_tickers(user_ids=ids[2:]) == ["AAPL", "TSLA"]
+
+
+def test_concurrent_inserts_create_one_subscription(session):
+    user_id = make_user(session, "race", [])
+
+    async def run():
+        async def attempt():
+            async with AsyncSessionLocal() as db:
+                return await AsyncSubscriptionRepository(db).insert_if_absent(ticker="nvda", user_id=user_id)
+
+        try:
+            return await asyncio.gather(*(attempt() for _ in range(5)))
+        finally:
+            await async_engine.dispose()
+
+    results = asyncio.run(run())
+    created = [sub for sub in results if sub is not None]
+    assert len(created) == 1 and created[0].ticker == "NVDA"
+    assert len(SubscriptionRepository(session).list_by_user(user_id)) == 1
+
+
+def test_duplicates_block_the_unique_index_until_the_cleanup_runs(session):
+    user_id = make_user(session, "dupes", ["AAPL"])
+    # All inside one rolled-back transaction, so the shared index is untouched
+    with engine.connect() as conn:
+        trans = conn.begin()
+        try:
+            conn.execute(text("DROP INDEX uq_subscriptions_user_ticker"))
+            conn.execute(text("INSERT INTO subscriptions (user_id, ticker) VALUES (:u, 'AAPL')"), {"u": user_id})
+
+            with pytest.raises(RuntimeError, match="dedupe_subscriptions"):
+                ensure_subscription_unique_index(conn)
+            assert conn.execute(text("SELECT count(*) FROM subscriptions WHERE user_id = :u"), {"u": user_id}).scalar() == 2
+
+            assert dedupe_subscriptions(conn) == 1
+            ensure_subscription_unique_index(conn)
+        finally:
+            trans.rollback()
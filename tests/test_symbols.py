@@ -0,0 +1,79 @@
+"""
+Tests for the symbol universe: the in-memory SymbolIndex, SymbolService
+loading from the fixture file, and subscribe-time validation plus
+`/symbols/search` through the API (with a preloaded service injected).
+"""
+
+import asyncio
+import time
+
+from fastapi.testclient import TestClient
+
+from app.routers.symbol import get_symbol_service
+from app.service.symbol_service import SymbolService
+from app.util.symbol_index import SymbolIndex
+from main import app
+from tests.test_subscription_flow import auth_headers
+
+FIXTURE = "tests/fixtures/us_symbols.json"
+
+
+def loaded_service() -> SymbolService:
+    service = SymbolService(source_file=FIXTURE)
+    asyncio.run(service.refresh())
+    return service
+
+
+def test_index_membership_and_prefix_search():
+    index = SymbolIndex([("aapl", "APPLE INC"), ("AA", "ALCOA CORP"), ("APP", "APPLOVIN CORP"), ("MSFT", "MICROSOFT CORP")])
+
+    assert "AAPL" in index and "aapl" in index and "AAPLX" not in index
+    assert [s for s, _ in index.search("aa")] == ["AA", "AAPL"]
+    # Symbol prefixes first, then description words ("APPLE", "APPLOVIN")
+    assert [s for s, _ in index.search("app")] == ["APP", "AAPL"]
+    assert [s for s, _ in index.search("corp", limit=1)] == ["AA"]
+    assert index.search("  ") == []
+
+
+def test_membership_check_is_microseconds():
+    index = SymbolIndex((f"S{i}", f"COMPANY {i}") for i in range(50_000))
+    started = time.perf_counter()
+    for _ in range(10_000):
+        "S49999" in index
+    assert (time.perf_counter() - started) / 10_000 < 20e-6
+
+
+def test_service_fails_open_until_loaded():
+    service = SymbolService(source_file=FIXTURE)
+    assert service.is_known("NOPE") is None and service.unknown(["NOPE"]) == []
+
+    asyncio.run(service.refresh())
+    assert service.is_known("AAPL") and service.is_known("NOPE") is False
+    assert service.unknown(["AAPL", "NOPE"]) == ["NOPE"]
+
+
+def test_subscribe_validation_and_search_endpoint():
+    service = loaded_service()
+    app.dependency_overrides[get_symbol_service] = lambda: service
+    try:
+        with TestClient(app) as client:
+            headers = auth_headers(client)
+            r = client.post("/subscriptions/", json={"ticker": "ZZZZZ"}, headers=headers)
+            assert r.status_code == 400 and "Unknown ticker" in r.json()["detail"]
+            assert client.post("/subscriptions/", json={"ticker": "nvda"}, headers=headers).status_code == 201
+
+            r = client.post("/subscriptions/batch", json={"tickers": ["NVDA", "ZZZZZ", "AMD"]}, headers=headers)
+            assert [(x["ticker"], x["status"]) for x in r.json()["results"]] == [
+                ("NVDA", "exists"), ("ZZZZZ", "unknown"), ("AMD", "created"),
+            ]
+
+            r = client.get("/symbols/search", params={"q": "goog"}, headers=headers)
+            assert r.status_code == 200
+            body = r.json()
+            assert [x["symbol"] for x in body["results"]] == ["GOOG", "GOOGL"]
+            assert body["universe_size"] == 40
+            r = client.get("/symbols/search", params={"q": "alphabet", "limit": 1}, headers=headers)
+            assert [x["symbol"] for x in r.json()["results"]] == ["GOOG"]
+            assert client.get("/symbols/search", params={"q": "a"}).status_code in (401, 403)
+    finally:
+        app.dependency_overrides.pop(get_symbol_service, None)